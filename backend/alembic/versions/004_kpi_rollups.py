@@ -0,0 +1,43 @@
+"""004 – KPI daily rollups + time-to-approve digest buckets.
+
+Populate existing history after upgrading with:
+    python -m app.services.kpi_rollup
+
+Revision ID: 004
+Revises: 003
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "004"
+down_revision = "003"
+
+
+def upgrade():
+    op.create_table(
+        "kpi_daily_rollups",
+        sa.Column("tenant_id", UUID(as_uuid=True), sa.ForeignKey("tenants.id"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("intakes", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("matters", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("approvals_requested", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("approvals_approved", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("approvals_rejected", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("leads", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("events", sa.Integer, nullable=False, server_default="0"),
+    )
+
+    op.create_table(
+        "kpi_tta_buckets",
+        sa.Column("tenant_id", UUID(as_uuid=True), sa.ForeignKey("tenants.id"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("bucket", sa.Integer, primary_key=True),
+        sa.Column("count", sa.Integer, nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_table("kpi_tta_buckets")
+    op.drop_table("kpi_daily_rollups")
@@ -0,0 +1,32 @@
+"""005 – job_runs: background scheduler execution log.
+
+Revision ID: 005
+Revises: 004
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "005"
+down_revision = "004"
+
+
+def upgrade():
+    op.create_table(
+        "job_runs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", UUID(as_uuid=True), sa.ForeignKey("tenants.id"), nullable=True),
+        sa.Column("job_name", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("items", sa.Integer, server_default="0"),
+        sa.Column("duration_ms", sa.Integer, nullable=False),
+        sa.Column("error", sa.Text),
+        sa.Column("started_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_job_runs_tenant_started", "job_runs", ["tenant_id", "started_at"])
+
+
+def downgrade():
+    op.drop_index("ix_job_runs_tenant_started", table_name="job_runs")
+    op.drop_table("job_runs")
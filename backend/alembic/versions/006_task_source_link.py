@@ -0,0 +1,45 @@
+"""006 – tasks.source_type/source_id: structured link for SLA nudge tasks.
+
+Backfills existing "[SLA Nudge] Approval <id8>..." tasks to the approval
+whose id prefix matches, then adds the unique index used for dedup.
+
+Revision ID: 006
+Revises: 005
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "006"
+down_revision = "005"
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("source_type", sa.String(50), nullable=True))
+    op.add_column("tasks", sa.Column("source_id", UUID(as_uuid=True), nullable=True))
+
+    op.execute(
+        """
+        UPDATE tasks AS t
+        SET source_type = 'approval_sla_nudge', source_id = m.approval_id
+        FROM (
+            SELECT DISTINCT ON (a.id) a.id AS approval_id, t2.id AS task_id
+            FROM approvals a
+            JOIN tasks t2
+              ON t2.tenant_id = a.tenant_id
+             AND t2.matter_id = a.matter_id
+             AND t2.title LIKE '[SLA Nudge] Approval ' || left(a.id::text, 8) || '%'
+            ORDER BY a.id, t2.created_at
+        ) AS m
+        WHERE t.id = m.task_id
+        """
+    )
+
+    op.create_index("uq_tasks_source", "tasks", ["source_type", "source_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_tasks_source", table_name="tasks")
+    op.drop_column("tasks", "source_id")
+    op.drop_column("tasks", "source_type")
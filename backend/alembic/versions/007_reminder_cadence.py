@@ -0,0 +1,52 @@
+"""007 – reminder_cadences: per-matter cadence state for doc chase / WhatsApp.
+
+Backfills from existing reminder drafts ("[DOC REMINDER]" email drafts and
+"[RECORDATORIO #n]" WhatsApp drafts) so running cadences keep their step.
+
+Revision ID: 007
+Revises: 006
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "007"
+down_revision = "006"
+
+
+def upgrade():
+    op.create_table(
+        "reminder_cadences",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", UUID(as_uuid=True), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("matter_id", UUID(as_uuid=True), sa.ForeignKey("matters.id"), nullable=False),
+        sa.Column("channel", sa.String(50), nullable=False),
+        sa.Column("reminder_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("last_sent_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "uq_reminder_cadences_matter_channel", "reminder_cadences",
+        ["matter_id", "channel"], unique=True,
+    )
+
+    for channel, prefix in (("email", "[DOC REMINDER]%"), ("whatsapp", "[RECORDATORIO%")):
+        op.execute(
+            sa.text(
+                """
+                INSERT INTO reminder_cadences (id, tenant_id, matter_id, channel, reminder_count, last_sent_at)
+                SELECT gen_random_uuid(), md.tenant_id, md.matter_id, :channel, count(*), max(md.created_at)
+                FROM message_drafts md
+                WHERE md.matter_id IS NOT NULL
+                  AND md.channel = :channel
+                  AND md.content LIKE :prefix
+                GROUP BY md.tenant_id, md.matter_id
+                """
+            ).bindparams(channel=channel, prefix=prefix)
+        )
+
+
+def downgrade():
+    op.drop_index("uq_reminder_cadences_matter_channel", table_name="reminder_cadences")
+    op.drop_table("reminder_cadences")
@@ -0,0 +1,52 @@
+"""008 – tenant-scoped composite indexes for the hot list / pipeline / service queries.
+
+Each index leads with the equality columns the routers and services filter
+on (tenant_id, then status / pipeline_stage / type, or matter_id) and ends
+with the range / sort column (created_at, due_at). matters.intake_id backs
+the intake -> matter joins in analytics and the pipeline. Built
+CONCURRENTLY so the migration does not block writes on a live database.
+
+tests/test_query_plans.py asserts these keep the hot queries off seq scans.
+
+Revision ID: 008
+Revises: 007
+"""
+
+from alembic import op
+
+revision = "008"
+down_revision = "007"
+
+INDEXES = [
+    ("ix_intakes_tenant_created", "intakes", ["tenant_id", "created_at"]),
+    ("ix_intakes_tenant_status_created", "intakes", ["tenant_id", "status", "created_at"]),
+    ("ix_matters_tenant_created", "matters", ["tenant_id", "created_at"]),
+    ("ix_matters_tenant_stage_created", "matters", ["tenant_id", "pipeline_stage", "created_at"]),
+    ("ix_matters_tenant_type_created", "matters", ["tenant_id", "type", "created_at"]),
+    ("ix_matters_intake", "matters", ["intake_id"]),
+    ("ix_documents_matter_status_kind", "documents", ["matter_id", "status", "kind"]),
+    ("ix_tasks_tenant_status_due", "tasks", ["tenant_id", "status", "due_at"]),
+    ("ix_tasks_tenant_matter", "tasks", ["tenant_id", "matter_id"]),
+    ("ix_agent_runs_matter_created", "agent_runs", ["matter_id", "created_at"]),
+    ("ix_approvals_tenant_status_created", "approvals", ["tenant_id", "status", "created_at"]),
+    ("ix_approvals_matter_created", "approvals", ["matter_id", "created_at"]),
+    ("ix_message_drafts_matter_created", "message_drafts", ["matter_id", "created_at"]),
+    ("ix_interpreter_requests_tenant_created", "interpreter_requests", ["tenant_id", "created_at"]),
+    ("ix_events_tenant_name_created", "events", ["tenant_id", "name", "created_at"]),
+    ("ix_leads_tenant_status_created", "leads", ["tenant_id", "status", "created_at"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""009 – indexes for keyset pagination of unfiltered task / lead lists.
+
+The other paginated lists (intakes, matters, approvals, drafts, interpreter
+requests) are already served in (created_at, id) order by the 008 indexes.
+
+Revision ID: 009
+Revises: 008
+"""
+
+from alembic import op
+
+revision = "009"
+down_revision = "008"
+
+INDEXES = [
+    ("ix_tasks_tenant_created_id", "tasks", ["tenant_id", "created_at", "id"]),
+    ("ix_leads_tenant_created_id", "leads", ["tenant_id", "created_at", "id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,21 @@
+"""010 – documents.size_bytes/sha256, computed while the upload is streamed.
+
+Revision ID: 010
+Revises: 009
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010"
+down_revision = "009"
+
+
+def upgrade():
+    op.add_column("documents", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("documents", sa.Column("sha256", sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column("documents", "sha256")
+    op.drop_column("documents", "size_bytes")
@@ -0,0 +1,29 @@
+"""011 – document_blobs: reference-counted content-addressed upload storage.
+
+Existing local://uploads/<uuid>_<name> files are moved into the blob store
+by ``python -m app.services.document_store migrate`` (not in this migration:
+it touches the upload volume, not just the database).
+
+Revision ID: 011
+Revises: 010
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "011"
+down_revision = "010"
+
+
+def upgrade():
+    op.create_table(
+        "document_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("document_blobs")
@@ -0,0 +1,45 @@
+"""012 – document_metadata: results of background document processing.
+
+Existing documents have no row; the pipeline picks them up on its startup
+sweep.
+
+Revision ID: 012
+Revises: 011
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "012"
+down_revision = "011"
+
+
+def upgrade():
+    op.create_table(
+        "document_metadata",
+        sa.Column("document_id", UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("tenant_id", UUID(as_uuid=True), sa.ForeignKey("tenants.id"), nullable=False),
+        sa.Column("sha256", sa.String(64), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("mime_type", sa.String(100), nullable=True),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("text_chars", sa.Integer(), nullable=True),
+        sa.Column("truncated", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("suggested_kind", sa.String(100), nullable=True),
+        sa.Column("kind_confidence", sa.Float(), nullable=True),
+        sa.Column("thumbnail_uri", sa.String(1000), nullable=True),
+        sa.Column("timings_json", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_document_metadata_status", "document_metadata", ["status"])
+
+
+def downgrade():
+    op.drop_index("ix_document_metadata_status", table_name="document_metadata")
+    op.drop_table("document_metadata")
@@ -0,0 +1,172 @@
+"""
+Retry, circuit-breaker and metrics helpers for the LLM provider.
+
+Only upstream trouble is retried and counts towards the breaker: HTTP 429,
+5xx, timeouts and connection errors. Other API errors (400, 401, ...) are
+bugs or misconfiguration, so they propagate on the first attempt. Retries
+use full-jitter exponential backoff, honouring ``Retry-After`` up to the
+backoff cap.
+
+The breaker opens after ``LLM_BREAKER_FAILURE_THRESHOLD`` consecutive
+upstream failures; while open, calls fail fast with ``LLMUnavailable`` and
+callers switch to the mock/template path. After ``LLM_BREAKER_RESET_SECONDS``
+one probe call is let through (half-open): success closes the circuit, a
+failure re-opens it.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable
+
+import openai
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class LLMUnavailable(Exception):
+    """The upstream is degraded (circuit open or retries exhausted)."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int | None = None,
+        base_seconds: float | None = None,
+        max_seconds: float | None = None,
+    ):
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_seconds = settings.LLM_RETRY_BASE_SECONDS if base_seconds is None else base_seconds
+        self.max_seconds = settings.LLM_RETRY_MAX_SECONDS if max_seconds is None else max_seconds
+
+    def delay(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``."""
+        delay = random.uniform(0, min(self.max_seconds, self.base_seconds * 2 ** attempt))
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_seconds))
+            except ValueError:
+                pass
+        return delay
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int | None = None,
+        reset_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURE_THRESHOLD
+        self.reset_seconds = settings.LLM_BREAKER_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0  # times the circuit has opened
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (claims the probe when half-open)."""
+        with self._lock:
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self._opened_at = self._clock()
+                self.opened += 1
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a claimed probe whose call ended without an upstream verdict."""
+        with self._lock:
+            self._probing = False
+
+    def _transition(self, state: str) -> None:
+        logger.warning("LLM circuit breaker %s -> %s (consecutive failures: %d)", self.state, state, self.failures)
+        self.state = state
+
+
+class LLMMetrics:
+    """Per-process counters for GET /agents/llm/stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.retries = 0
+            self.rejected = 0  # short-circuited while the breaker was open
+            self.fallbacks = 0  # PrepKits answered from the template
+            self.latency_sum = 0.0
+            self.latency_max = 0.0
+            self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if ok else 1
+            self.latency_sum += seconds
+            self.latency_max = max(self.latency_max, seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    break
+            else:
+                i = len(LATENCY_BUCKETS)
+            self.latency_buckets[i] += 1
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> dict:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(LATENCY_BUCKETS, self.latency_buckets)}
+        buckets["le_inf"] = self.latency_buckets[-1]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "fallbacks": self.fallbacks,
+            "latency_avg_seconds": round(self.latency_sum / self.calls, 4) if self.calls else 0.0,
+            "latency_max_seconds": round(self.latency_max, 4),
+            "latency_buckets": buckets,
+        }
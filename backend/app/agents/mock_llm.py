@@ -5,22 +5,43 @@ Returns deterministic responses per agent type.
 Drop-in interface for replacing with Anthropic/OpenAI later.
 """
 
-from typing import Any
+import asyncio
+import re
+from typing import Any, AsyncIterator, Iterator
 
 
 class MockLLMProvider:
     """
     Interface:
         provider.generate(agent_name, prompt, context) -> str
+        provider.generate_stream(agent_name, prompt, context) -> Iterator[str]
+        await provider.agenerate(...), async for ... in provider.agenerate_stream(...)
 
     Replace this class with AnthropicProvider or OpenAIProvider
     to connect to real models.
     """
 
+    # Identifies this provider's output in the agent response cache key
+    model_params = {"model": "mock"}
+
     def generate(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> str:
         handler = MOCK_RESPONSES.get(agent_name, _default_response)
         return handler(prompt, context or {})
 
+    def generate_stream(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> Iterator[str]:
+        """The same response, one word (with its trailing whitespace) per chunk."""
+        yield from re.findall(r"\S+\s*|\s+", self.generate(agent_name, prompt, context))
+
+    async def agenerate(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> str:
+        return self.generate(agent_name, prompt, context)
+
+    async def agenerate_stream(
+        self, agent_name: str, prompt: str, context: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        for chunk in self.generate_stream(agent_name, prompt, context):
+            yield chunk
+            await asyncio.sleep(0)  # let other runs interleave, like a network stream
+
 
 # ---------------------------------------------------------------------------
 # Per-agent mock response generators
@@ -3,32 +3,244 @@ OpenAI LLM provider.
 
 Drop-in replacement for MockLLMProvider.
 Falls back to mock if OPENAI_API_KEY is not set.
+
+The ``a*`` methods are the async path used by the async route handlers: an
+in-flight completion awaits on the event loop instead of holding a
+threadpool worker. At most ``LLM_MAX_CONCURRENCY`` async completions run at
+once per provider (and event loop); further calls wait for a slot.
+
+Both clients share one explicitly sized keep-alive connection pool per
+process (``LLM_HTTP_*``) and per-request timeouts. The SDK's own retries are
+disabled: every call goes through the provider's jittered retries and
+circuit breaker (see app.agents.llm_resilience), and is counted in
+``stats()``. When the upstream is degraded, calls raise ``LLMUnavailable``;
+agent runs then use the mock output and PrepKit its template. A stream that
+breaks after it started cannot be retried: it counts as a failed call and
+raises ``LLMUnavailable`` too.
 """
 
+import asyncio
 import json
-from typing import Any
+import logging
+import time
+from typing import Any, AsyncIterator, Iterator
 
+import httpx
+import openai
+
+from app.agents.llm_resilience import CircuitBreaker, LLMMetrics, LLMUnavailable, RetryPolicy, is_retryable
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Raised while reading an open stream: dropped connections, read timeouts, SSE error events
+STREAM_ERRORS = (httpx.TransportError, openai.APIError)
+
+
+def _build_clients() -> tuple["openai.OpenAI", "openai.AsyncOpenAI"]:
+    from openai._constants import DEFAULT_CONNECTION_LIMITS
+
+    # Limits from the httpx flavour the installed SDK is built on
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+    )
+    timeout = openai.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS)
+    options = {
+        "api_key": settings.OPENAI_API_KEY,
+        "base_url": settings.OPENAI_BASE_URL or None,
+        "timeout": timeout,
+        "max_retries": 0,
+    }
+    return (
+        openai.OpenAI(**options, http_client=openai.DefaultHttpxClient(limits=limits, timeout=timeout)),
+        openai.AsyncOpenAI(**options, http_client=openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout)),
+    )
+
 
 class OpenAIProvider:
     """
     Interface:
         provider.generate(agent_name, prompt, context) -> str
+        provider.generate_stream(agent_name, prompt, context) -> Iterator[str]
         provider.generate_prepkit(case_type, description, language) -> dict
+        provider.template_prepkit(case_type, language) -> dict  (no LLM call)
+        await provider.agenerate / agenerate_prepkit, async for ... in provider.agenerate_stream
+        provider.stats() -> dict
     """
 
-    def __init__(self):
+    AGENT_MODEL_PARAMS = {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 1500}
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         self._client = None
+        self._async_client = None
         if settings.OPENAI_API_KEY:
-            from openai import OpenAI
-            self._client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client, self._async_client = _build_clients()
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+        self.breaker = breaker or CircuitBreaker()
+        self.retry = retry or RetryPolicy()
+        self.metrics = LLMMetrics()
+
+    @property
+    def model_params(self) -> dict[str, Any]:
+        """What produced agent outputs (part of the agent response cache key)."""
+        if not (self._client or self._async_client):
+            from app.agents.mock_llm import MockLLMProvider
+            return MockLLMProvider.model_params
+        return self.AGENT_MODEL_PARAMS
+
+    def stats(self) -> dict:
+        return {
+            "backend": "openai" if (self._client or self._async_client) else "mock",
+            "breaker": {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.failures,
+                "opened": self.breaker.opened,
+            },
+            **self.metrics.stats(),
+        }
+
+    def _llm_slots(self) -> asyncio.Semaphore:
+        # One semaphore per event loop (a semaphore cannot be shared across loops)
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots, self._slots_loop = asyncio.Semaphore(self.max_concurrency), loop
+        return self._slots
+
+    # -- resilient calls ------------------------------------------------------
+
+    def _create(self, **request):
+        """``chat.completions.create`` with retries, circuit breaker and metrics."""
+        attempt = 0
+        while True:
+            self._admit()
+            start = time.perf_counter()
+            try:
+                response = self._client.chat.completions.create(**request)
+            except Exception as exc:
+                if not self._should_retry(exc, attempt, start):
+                    raise
+                time.sleep(self.retry.delay(attempt, exc))
+                attempt += 1
+                continue
+            self._succeeded(start)
+            return response
+
+    async def _acreate(self, **request):
+        attempt = 0
+        while True:
+            self._admit()
+            start = time.perf_counter()
+            try:
+                response = await self._async_client.chat.completions.create(**request)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as exc:
+                if not self._should_retry(exc, attempt, start):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt, exc))
+                attempt += 1
+                continue
+            self._succeeded(start)
+            return response
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self.metrics.count("rejected")
+            raise LLMUnavailable(f"LLM circuit breaker is {self.breaker.state}")
+
+    def _succeeded(self, start: float) -> None:
+        self.metrics.observe(time.perf_counter() - start, ok=True)
+        self.breaker.record_success()
+
+    def _stream_failed(self, exc: Exception) -> LLMUnavailable:
+        """Record a stream that broke after it opened (already counted as a call)."""
+        self.metrics.count("errors")
+        self.breaker.record_failure()
+        return LLMUnavailable(f"LLM stream failed mid-response: {exc}")
+
+    def _should_retry(self, exc: Exception, attempt: int, start: float) -> bool:
+        """Record a failed attempt; raises ``LLMUnavailable`` once upstream retries are spent."""
+        self.metrics.observe(time.perf_counter() - start, ok=False)
+        if not is_retryable(exc):
+            self.breaker.release()
+            return False
+        self.breaker.record_failure()
+        if attempt >= self.retry.max_retries or not self.breaker.allow():
+            raise LLMUnavailable(f"LLM upstream failed after {attempt + 1} attempt(s): {exc}") from exc
+        self.metrics.count("retries")
+        return True
+
+    # -- agent runs -----------------------------------------------------------
 
     def generate(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> str:
         if not self._client:
             from app.agents.mock_llm import MockLLMProvider
             return MockLLMProvider().generate(agent_name, prompt, context)
 
+        response = self._create(**self._agent_request(prompt, context))
+        return response.choices[0].message.content or ""
+
+    async def agenerate(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> str:
+        if not self._async_client:
+            from app.agents.mock_llm import MockLLMProvider
+            return await MockLLMProvider().agenerate(agent_name, prompt, context)
+
+        async with self._llm_slots():
+            response = await self._acreate(**self._agent_request(prompt, context))
+        return response.choices[0].message.content or ""
+
+    def generate_stream(self, agent_name: str, prompt: str, context: dict[str, Any] | None = None) -> Iterator[str]:
+        """Yield the completion as it is generated.
+
+        Closing the iterator early (e.g. when the policy engine blocks the
+        output) closes the HTTP stream, so the remaining tokens are never
+        generated.
+        """
+        if not self._client:
+            from app.agents.mock_llm import MockLLMProvider
+            yield from MockLLMProvider().generate_stream(agent_name, prompt, context)
+            return
+
+        stream = self._create(**self._agent_request(prompt, context), stream=True)
+        try:
+            for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+        except STREAM_ERRORS as exc:
+            raise self._stream_failed(exc) from exc
+        finally:
+            stream.close()
+
+    async def agenerate_stream(
+        self, agent_name: str, prompt: str, context: dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        if not self._async_client:
+            from app.agents.mock_llm import MockLLMProvider
+            async for chunk in MockLLMProvider().agenerate_stream(agent_name, prompt, context):
+                yield chunk
+            return
+
+        async with self._llm_slots():
+            stream = await self._acreate(**self._agent_request(prompt, context), stream=True)
+            try:
+                async for event in stream:
+                    if event.choices and event.choices[0].delta.content:
+                        yield event.choices[0].delta.content
+            except STREAM_ERRORS as exc:
+                raise self._stream_failed(exc) from exc
+            finally:
+                await stream.close()
+
+    def _agent_request(self, prompt: str, context: dict[str, Any] | None) -> dict[str, Any]:
         language = (context or {}).get("language", "es")
         lang_instruction = (
             "Responde en español." if language == "es"
@@ -42,17 +254,15 @@ class OpenAIProvider:
             "review by a licensed professional (abogado con cédula). "
             f"{lang_instruction}"
         )
-
-        response = self._client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        return {
+            **self.AGENT_MODEL_PARAMS,
+            "messages": [
                 {"role": "system", "content": system_msg},
                 {"role": "user", "content": prompt},
             ],
-            temperature=0.3,
-            max_tokens=1500,
-        )
-        return response.choices[0].message.content or ""
+        }
+
+    # -- PrepKit --------------------------------------------------------------
 
     def generate_prepkit(self, case_type: str, description: str, language: str = "es") -> dict:
         """Generate a structured PrepKit with explicit JSON schema.
@@ -63,8 +273,26 @@ class OpenAIProvider:
         """
         if not self._client:
             # Fallback: return template-based defaults
-            return self._mock_prepkit(case_type, language)
+            return self.template_prepkit(case_type, language)
+
+        try:
+            response = self._create(**self._prepkit_request(case_type, description, language))
+            return self._parse_prepkit(response, language)
+        except (LLMUnavailable, openai.OpenAIError, ValueError):
+            return self._prepkit_fallback(case_type, language)
+
+    async def agenerate_prepkit(self, case_type: str, description: str, language: str = "es") -> dict:
+        if not self._async_client:
+            return self.template_prepkit(case_type, language)
 
+        try:
+            async with self._llm_slots():
+                response = await self._acreate(**self._prepkit_request(case_type, description, language))
+            return self._parse_prepkit(response, language)
+        except (LLMUnavailable, openai.OpenAIError, ValueError):
+            return self._prepkit_fallback(case_type, language)
+
+    def _prepkit_request(self, case_type: str, description: str, language: str) -> dict[str, Any]:
         lang_instruction = (
             "Responde COMPLETAMENTE en español." if language == "es"
             else "Respond ENTIRELY in English."
@@ -102,32 +330,36 @@ class OpenAIProvider:
             "Generate a structured PrepKit for this person."
         )
 
-        try:
-            response = self._client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg},
-                ],
-                temperature=0.3,
-                max_tokens=1500,
-                response_format={"type": "json_object"},
-            )
-            raw = response.choices[0].message.content or "{}"
-            parsed = json.loads(raw)
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg},
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1500,
+            "response_format": {"type": "json_object"},
+        }
 
-            # Validate expected keys exist
-            return {
-                "checklist_docs": parsed.get("checklist_docs", []),
-                "questions_for_lawyer": parsed.get("questions_for_lawyer", []),
-                "next_steps_informational": parsed.get("next_steps_informational", []),
-                "disclaimer": parsed.get("disclaimer", self._default_disclaimer(language)),
-            }
-        except Exception:
-            return self._mock_prepkit(case_type, language)
+    def _parse_prepkit(self, response, language: str) -> dict:
+        raw = response.choices[0].message.content or "{}"
+        parsed = json.loads(raw)
+
+        # Validate expected keys exist
+        return {
+            "checklist_docs": parsed.get("checklist_docs", []),
+            "questions_for_lawyer": parsed.get("questions_for_lawyer", []),
+            "next_steps_informational": parsed.get("next_steps_informational", []),
+            "disclaimer": parsed.get("disclaimer", self._default_disclaimer(language)),
+        }
+
+    def _prepkit_fallback(self, case_type: str, language: str) -> dict:
+        logger.warning("PrepKit LLM call failed; using the template", exc_info=True)
+        self.metrics.count("fallbacks")
+        return self.template_prepkit(case_type, language)
 
-    def _mock_prepkit(self, case_type: str, language: str) -> dict:
-        """Template-based fallback when OpenAI is unavailable."""
+    def template_prepkit(self, case_type: str, language: str) -> dict:
+        """Template-based PrepKit, for when OpenAI is unavailable or did not answer in time."""
         if language == "es":
             return {
                 "checklist_docs": [
@@ -1,38 +1,42 @@
 """
-Agent Orchestrator – loads YAML definitions, runs workflows through mock LLM,
-and enforces policy checks on all outputs.
+Agent Orchestrator – runs agent workflows (definitions from the shared
+app.agents.registry) through the LLM and enforces policy checks on all outputs.
+Routers share one instance via ``get_orchestrator()``.
+
+Complete LLM outputs are cached by content (see app.agents.response_cache);
+pass ``use_cache=False`` to force a fresh generation.
 """
 
-import os
-import yaml
-from typing import Any
-from pathlib import Path
+import functools
+import logging
+from typing import Any, AsyncIterator, Iterator
 
+from app.agents.llm_resilience import LLMUnavailable
+from app.agents.mock_llm import MockLLMProvider
 from app.agents.openai_llm import OpenAIProvider
 from app.agents.policy_engine import PolicyEngine
+from app.agents.registry import AgentDefinition, DefinitionRegistry, definition_registry
+from app.agents.response_cache import response_cache, response_key
 
-DEFINITIONS_DIR = Path(__file__).parent / "definitions"
+logger = logging.getLogger(__name__)
 
 
 class AgentOrchestrator:
-    def __init__(self):
-        self.llm = OpenAIProvider()
+    def __init__(self, cache=None, registry: DefinitionRegistry | None = None, llm=None):
+        self.llm = llm if llm is not None else OpenAIProvider()
         self.policy = PolicyEngine()
-        self._definitions: dict[str, dict] = {}
-        self._load_definitions()
+        self.cache = cache if cache is not None else response_cache
+        self.registry = registry if registry is not None else definition_registry
 
-    def _load_definitions(self):
-        """Load all YAML agent definitions from the definitions directory."""
-        if not DEFINITIONS_DIR.exists():
-            return
-        for yaml_file in DEFINITIONS_DIR.glob("*.yaml"):
-            with open(yaml_file, "r", encoding="utf-8") as f:
-                defn = yaml.safe_load(f)
-                if defn and "name" in defn:
-                    self._definitions[defn["name"]] = defn
+    @property
+    def template_diagnostics(self) -> dict[str, list[str]]:
+        """Agent name -> template variables not declared in required_input_fields."""
+        return {
+            d.name: list(d.undeclared_variables) for d in self.registry.definitions() if d.undeclared_variables
+        }
 
     def available_agents(self) -> list[str]:
-        return list(self._definitions.keys())
+        return self.registry.names()
 
     def list_definitions(self) -> list[dict]:
         """Return summary of each agent (for the API)."""
@@ -43,29 +47,83 @@ class AgentOrchestrator:
                 "boundaries": d.get("boundaries", []),
                 "workflow_steps": [s.get("name", s.get("step", "")) for s in d.get("workflow_steps", [])],
             }
-            for d in self._definitions.values()
+            for d in (definition.spec for definition in self.registry.definitions())
         ]
 
     def get_definition(self, agent_name: str) -> dict | None:
-        return self._definitions.get(agent_name)
+        definition = self.registry.get(agent_name)
+        return definition.spec if definition else None
+
+    def run(
+        self, agent_name: str, input_data: dict[str, Any], policy: PolicyEngine | None = None,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Execute an agent workflow and return structured output.
 
-    def run(self, agent_name: str, input_data: dict[str, Any]) -> dict[str, Any]:
-        """Execute an agent workflow and return structured output."""
-        defn = self._definitions.get(agent_name)
-        if not defn:
+        ``policy`` is the tenant's engine (see app.agents.policy_packs);
+        defaults to the global patterns.
+        """
+        if self.registry.get(agent_name) is None:
             return {"error": f"Agent '{agent_name}' not found"}
 
-        # Build prompt from definition templates
-        prompt = self._build_prompt(defn, input_data)
+        run = self.stream(agent_name, input_data, policy, use_cache)
+        for _ in run:
+            pass
+        return run.output
+
+    async def arun(
+        self, agent_name: str, input_data: dict[str, Any], policy: PolicyEngine | None = None,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Async ``run``: awaits the LLM on the event loop instead of a worker thread."""
+        if self.registry.get(agent_name) is None:
+            return {"error": f"Agent '{agent_name}' not found"}
+
+        run = self.stream(agent_name, input_data, policy, use_cache)
+        async for _ in run:
+            pass
+        return run.output
+
+    def stream(
+        self, agent_name: str, input_data: dict[str, Any], policy: PolicyEngine | None = None,
+        use_cache: bool = True,
+    ) -> "AgentRunStream":
+        """Execute an agent workflow, yielding LLM output chunks as they arrive.
 
-        # Run through mock LLM
-        raw_output = self.llm.generate(agent_name, prompt, input_data)
+        Generation stops as soon as the policy engine confirms a UPL match;
+        the structured output is available as ``.output`` once iterated.
+        Iterate with ``for`` (sync provider) or ``async for`` (async provider).
+        """
+        definition = self.registry.get(agent_name)
+        if definition is None:
+            raise KeyError(agent_name)
+        return AgentRunStream(self, definition, input_data, policy or self.policy, use_cache)
 
+    def fallback(
+        self, agent_name: str, input_data: dict[str, Any], policy: PolicyEngine | None = None,
+        reason: str = "timeout",
+    ) -> dict[str, Any]:
+        """Template output (mock LLM response) for a run whose LLM call did not complete."""
+        definition = self.registry.get(agent_name)
+        if definition is None:
+            raise KeyError(agent_name)
+        prompt = definition.prompt.render(input_data)
+        raw_output = MockLLMProvider().generate(agent_name, prompt, input_data)
+        output = self._finish(agent_name, definition.spec, raw_output, input_data, policy or self.policy, aborted=False)
+        output["fallback"] = reason
+        return output
+
+    def _finish(
+        self, agent_name: str, defn: dict, raw_output: str, input_data: dict[str, Any],
+        policy: PolicyEngine, aborted: bool,
+    ) -> dict[str, Any]:
         # Structure the output
         output = self._structure_output(agent_name, defn, raw_output, input_data)
+        if aborted:
+            output["generation_aborted"] = True
 
         # Policy engine check (UPL guard)
-        output = self.policy.check_and_annotate(output)
+        output = policy.check_and_annotate(output)
 
         # Always flag that human approval is required
         output["requires_approval"] = True
@@ -73,23 +131,6 @@ class AgentOrchestrator:
 
         return output
 
-    def _build_prompt(self, defn: dict, input_data: dict) -> str:
-        """Combine definition templates with input data into a prompt."""
-        parts = [f"Agent: {defn['name']}", f"Purpose: {defn.get('purpose', '')}"]
-
-        boundaries = defn.get("boundaries", [])
-        if boundaries:
-            parts.append("Boundaries: " + "; ".join(boundaries))
-
-        for step in defn.get("workflow_steps", []):
-            template = step.get("prompt_template", "")
-            # Simple variable substitution
-            for key, value in input_data.items():
-                template = template.replace(f"{{{{{key}}}}}", str(value))
-            parts.append(f"Step [{step.get('name', '?')}]: {template}")
-
-        return "\n".join(parts)
-
     def _structure_output(self, agent_name: str, defn: dict, raw: str, input_data: dict) -> dict:
         """Build the structured output expected by consumers."""
         # Extract questions to ask (mock: based on "Missing" in output)
@@ -130,3 +171,122 @@ class AgentOrchestrator:
             flags.append("REMOVAL_PROCEEDINGS")
 
         return flags
+
+
+class AgentRunStream:
+    """One streamed agent run: iterate (sync or async) for the LLM chunks, then read ``output``."""
+
+    def __init__(
+        self, orchestrator: AgentOrchestrator, definition: AgentDefinition,
+        input_data: dict[str, Any], policy: PolicyEngine, use_cache: bool = True,
+    ):
+        self._orchestrator = orchestrator
+        self.agent_name = definition.name
+        self._definition = definition
+        self._defn = definition.spec
+        self._input_data = input_data
+        self._policy = policy
+        self._use_cache = use_cache
+        self.aborted = False
+        self.cached = False
+        self.fallback: str | None = None
+        self.output: dict[str, Any] | None = None
+        self.cache_key = response_key(
+            self.agent_name, definition.content_hash, orchestrator.llm.model_params, input_data,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        cached = self._lookup()
+        if cached is not None:
+            yield cached
+            self._finish([cached])
+            return
+
+        orch = self._orchestrator
+        scan = self._policy.stream_scan()
+        chunks: list[str] = []
+
+        stream = orch.llm.generate_stream(self.agent_name, self._prompt(), self._input_data)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                scan.feed(chunk)
+                yield chunk
+                if scan.blocked:
+                    # Stop paying for tokens the reviewer will never approve
+                    self.aborted = True
+                    break
+        except LLMUnavailable:
+            if chunks:
+                raise
+            chunks.append(self._degraded())
+            yield chunks[0]
+        finally:
+            stream.close()
+
+        self._finish(chunks)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        cached = self._lookup()
+        if cached is not None:
+            yield cached
+            self._finish([cached])
+            return
+
+        orch = self._orchestrator
+        scan = self._policy.stream_scan()
+        chunks: list[str] = []
+
+        stream = orch.llm.agenerate_stream(self.agent_name, self._prompt(), self._input_data)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                scan.feed(chunk)
+                yield chunk
+                if scan.blocked:
+                    self.aborted = True
+                    break
+        except LLMUnavailable:
+            if chunks:
+                raise
+            chunks.append(self._degraded())
+            yield chunks[0]
+        finally:
+            await stream.aclose()
+
+        self._finish(chunks)
+
+    def _prompt(self) -> str:
+        return self._definition.prompt.render(self._input_data)
+
+    def _degraded(self) -> str:
+        """Mock output for a run the LLM upstream could not serve (never cached)."""
+        logger.warning("LLM unavailable for %s; using the mock output", self.agent_name, exc_info=True)
+        self.fallback = "llm_unavailable"
+        return MockLLMProvider().generate(self.agent_name, self._prompt(), self._input_data)
+
+    def _lookup(self) -> str | None:
+        if not self._use_cache:
+            return None
+        cached = self._orchestrator.cache.get(self.cache_key)
+        self.cached = cached is not None
+        return cached
+
+    def _finish(self, chunks: list[str]) -> None:
+        raw_output = "".join(chunks)
+        if not (self.cached or self.aborted or self.fallback):
+            # Bypassed runs still refresh the entry
+            self._orchestrator.cache.set(self.cache_key, raw_output)
+        self.output = self._orchestrator._finish(
+            self.agent_name, self._defn, raw_output, self._input_data, self._policy, self.aborted,
+        )
+        if self.cached:
+            self.output["response_cached"] = True
+        if self.fallback:
+            self.output["fallback"] = self.fallback
+
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> AgentOrchestrator:
+    """The process-wide orchestrator (one LLM client and connection pool per process)."""
+    return AgentOrchestrator()
@@ -3,6 +3,16 @@ Policy Engine – Unauthorized Practice of Law (UPL) guard.
 
 Scans text output for patterns that could constitute legal advice.
 If detected, flags the output as BLOCKED and requires human review.
+
+Rules are compiled once per engine. Most rules start with a literal word
+(``\\byou should file``); those literals are joined into one anchor
+alternation, so a text is scanned once and a rule's full regex only runs,
+anchored, where its leading word occurs. Rules without a literal lead fall
+back to their own compiled search. Every matching rule is reported, exactly
+as if each pattern had been searched separately.
+
+``stream_scan()`` runs the same rules over text arriving in chunks (streamed
+LLM output) so generation can stop as soon as a rule fires.
 """
 
 import re
@@ -46,6 +56,52 @@ LEGAL_ADVICE_PATTERNS_ES = [
 
 ALL_PATTERNS = LEGAL_ADVICE_PATTERNS_EN + LEGAL_ADVICE_PATTERNS_ES
 
+_QUANTIFIERS = "?*{"
+
+# Tokens that let a match depend on text after its end ("$", lookarounds)
+_LOOKAHEAD_TOKENS = ("$", "\\Z", "(?=", "(?!", "(?<=", "(?<!")
+
+# How far (in characters) a streamed match may span before it is left to the
+# final check on the complete text
+STREAM_HORIZON_CHARS = 1000
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth, in_class, escaped = 0, False, False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+def _leading_literal(pattern: str) -> str | None:
+    """The literal word every match of ``pattern`` starts with, if it has one.
+
+    Only ``\\b<word chars>`` leads qualify: the anchor scan matches at word
+    starts, so a rule that can match mid-word must be searched on its own.
+    """
+    if not pattern.startswith("\\b") or _has_top_level_alternation(pattern):
+        return None
+    body = pattern[2:]
+    end = 0
+    while end < len(body) and (body[end].isalnum() or body[end] == "_"):
+        end += 1
+    if end < len(body) and body[end] in _QUANTIFIERS:
+        end -= 1  # the quantifier makes the last character optional
+    return body[:end] or None
+
 
 class PolicyEngine:
     """Checks agent output for unauthorized practice of law indicators."""
@@ -54,17 +110,62 @@ class PolicyEngine:
         self.patterns = ALL_PATTERNS.copy()
         if extra_patterns:
             self.patterns.extend(extra_patterns)
+        self._compile()
+
+    def _compile(self) -> None:
+        self._rules = [re.compile(pattern) for pattern, _ in self.patterns]
+        self._streamable = {
+            index for index, (pattern, _) in enumerate(self.patterns)
+            if not any(token in pattern for token in _LOOKAHEAD_TOKENS)
+        }
+        self._unanchored: list[int] = []
+        rules_by_literal: dict[str, list[int]] = {}
+        for index, (pattern, _) in enumerate(self.patterns):
+            literal = _leading_literal(pattern)
+            if literal is None:
+                self._unanchored.append(index)
+            else:
+                rules_by_literal.setdefault(literal, []).append(index)
+
+        # Longest literal first: at a given position the scan reports the
+        # longest literal found there, and every shorter literal matching at
+        # that position is one of its prefixes.
+        literals = sorted(rules_by_literal, key=len, reverse=True)
+        self._candidates = {
+            literal: sorted(
+                index
+                for other in literals if literal.startswith(other)
+                for index in rules_by_literal[other]
+            )
+            for literal in literals
+        }
+        self._scanner = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, literals)) + ")") if literals else None
+        )
+
+    def matched_rules(self, text_lower: str) -> list[int]:
+        """Indexes into ``self.patterns`` of every rule matching ``text_lower``."""
+        matched = {index for index in self._unanchored if self._rules[index].search(text_lower)}
+        if self._scanner is not None:
+            for hit in self._scanner.finditer(text_lower):
+                start = hit.start()
+                for index in self._candidates[hit.group()]:
+                    if index not in matched and self._rules[index].match(text_lower, start):
+                        matched.add(index)
+        return sorted(matched)
+
+    def stream_scan(self, horizon: int = STREAM_HORIZON_CHARS) -> "PolicyStreamScan":
+        return PolicyStreamScan(self, horizon)
 
     def check(self, text: str) -> PolicyCheckResult:
         """Scan text for UPL patterns. Returns blocked=True if any match."""
         result = PolicyCheckResult()
-        text_lower = text.lower()
 
-        for pattern, description in self.patterns:
-            if re.search(pattern, text_lower):
-                result.is_blocked = True
-                result.flags.append("UPL_DETECTED")
-                result.details.append(f"Pattern matched: {description}")
+        for index in self.matched_rules(text.lower()):
+            _, description = self.patterns[index]
+            result.is_blocked = True
+            result.flags.append("UPL_DETECTED")
+            result.details.append(f"Pattern matched: {description}")
 
         # Dedup flags
         result.flags = list(set(result.flags))
@@ -98,3 +199,68 @@ class PolicyEngine:
             output["_policy_status"] = "BLOCKED – requires human review"
 
         return output
+
+
+class PolicyStreamScan:
+    """Incremental PolicyEngine scan over text that arrives in chunks.
+
+    Keeps the text seen so far, the anchor scan position and the anchor hits
+    whose rules have not matched yet, so each chunk only scans new text and
+    re-tries open hits. A rule counts as matched only once the text extends
+    past the end of its match: a later chunk cannot undo it ("vas a ganar"
+    followed by "ía"). Rules whose match depends on what follows ("$",
+    lookarounds) and matches spanning more than ``horizon`` characters are
+    left to the final ``check`` on the complete text, which stays
+    authoritative.
+    """
+
+    def __init__(self, engine: PolicyEngine, horizon: int = STREAM_HORIZON_CHARS):
+        self.engine = engine
+        self.horizon = horizon
+        self.text = ""  # lowercased
+        self.matched: set[int] = set()
+        self._scan_pos = 0
+        self._open_hits: list[tuple[int, list[int]]] = []
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self.matched)
+
+    def feed(self, chunk: str) -> list[int]:
+        """Add a chunk; returns the indexes of rules it newly confirmed."""
+        engine = self.engine
+        searched_to = len(self.text)
+        self.text += chunk.lower()
+        text, end = self.text, len(self.text)
+        new: list[int] = []
+
+        def confirm(index: int, match: re.Match | None) -> bool:
+            if match is None or match.end() >= end:
+                return False
+            self.matched.add(index)
+            new.append(index)
+            return True
+
+        if engine._scanner is not None:
+            for hit in engine._scanner.finditer(text, self._scan_pos):
+                if hit.end() == end:
+                    break  # the word may continue in the next chunk
+                self._open_hits.append((hit.start(), engine._candidates[hit.group()]))
+                self._scan_pos = hit.end()
+
+        open_hits = []
+        for start, candidates in self._open_hits:
+            still_open = [
+                index for index in candidates
+                if index not in self.matched and index in engine._streamable
+                and not confirm(index, engine._rules[index].match(text, start))
+            ]
+            if still_open and end - start <= self.horizon:
+                open_hits.append((start, still_open))
+        self._open_hits = open_hits
+
+        for index in engine._unanchored:
+            if index not in self.matched and index in engine._streamable:
+                confirm(index, engine._rules[index].search(text, max(0, searched_to - self.horizon)))
+
+        return sorted(new)
@@ -0,0 +1,128 @@
+"""
+Tenant UPL rule packs – per-tenant extensions of the PolicyEngine patterns.
+
+A tenant adds its own forbidden phrasing in ``Tenant.settings_json``::
+
+    {"policy": {"version": 2,
+                "rules": [{"pattern": "\\\\bte aseguro\\\\b", "description": "Garantizando resultado"}]}}
+
+Rules extend (never replace) the global EN/ES patterns, and are lowercased on
+load because text is matched in lowercase. Compiled engines are held in a
+bounded LRU keyed by (tenant_id, rule-pack version). The version is a digest
+of the whole pack, so editing the rules always yields a new key even if
+``version`` is not bumped; the tenant's old engines are evicted when the
+Tenant row is updated or deleted through the ORM. Tenants without a pack
+share the default engine.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.agents.policy_engine import PolicyEngine
+from app.config import settings
+from app.models import Tenant
+
+logger = logging.getLogger(__name__)
+
+
+def rule_pack(settings_json: dict | None) -> dict | None:
+    pack = (settings_json or {}).get("policy")
+    if not isinstance(pack, dict) or not pack.get("rules"):
+        return None
+    return pack
+
+
+def rule_pack_version(pack: dict) -> str:
+    raw = json.dumps(pack, sort_keys=True, ensure_ascii=False, default=str).encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _lower_pattern(pattern: str) -> str:
+    """Lowercase a pattern for matching against lowercased text, keeping escapes (``\\S``, ``\\W``) intact."""
+    out, escaped = [], False
+    for ch in pattern:
+        out.append(ch if escaped else ch.lower())
+        escaped = not escaped and ch == "\\"
+    return "".join(out)
+
+
+def rule_pack_patterns(pack: dict) -> list[tuple[str, str]]:
+    """The pack's valid (pattern, description) pairs; invalid rules are logged and skipped."""
+    patterns = []
+    for rule in pack.get("rules", []):
+        pattern = rule.get("pattern") if isinstance(rule, dict) else None
+        if not isinstance(pattern, str) or not pattern:
+            logger.warning("Skipping malformed policy rule: %r", rule)
+            continue
+        pattern = _lower_pattern(pattern)
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            logger.warning("Skipping invalid policy rule %r: %s", pattern, exc)
+            continue
+        patterns.append((pattern, rule.get("description") or "Tenant policy rule"))
+    return patterns
+
+
+class TenantPolicyEngines:
+    """Bounded LRU of compiled PolicyEngines keyed by (tenant_id, rule-pack version)."""
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or settings.POLICY_ENGINE_CACHE_MAX_ENTRIES
+        self.default = PolicyEngine()
+        self._engines: OrderedDict[tuple[uuid.UUID, str], PolicyEngine] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def for_settings(self, tenant_id: uuid.UUID, settings_json: dict | None) -> PolicyEngine:
+        pack = rule_pack(settings_json)
+        if pack is None:
+            return self.default
+        key = (tenant_id, rule_pack_version(pack))
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                return engine
+
+        # Compile outside the lock; a concurrent miss just compiles twice
+        engine = PolicyEngine(extra_patterns=rule_pack_patterns(pack))
+        with self._lock:
+            self._engines[key] = engine
+            self._engines.move_to_end(key)
+            while len(self._engines) > self.max_entries:
+                self._engines.popitem(last=False)
+        return engine
+
+    def for_tenant(self, db: Session, tenant_id: uuid.UUID) -> PolicyEngine:
+        settings_json = db.query(Tenant.settings_json).filter(Tenant.id == tenant_id).scalar()
+        return self.for_settings(tenant_id, settings_json)
+
+    def invalidate(self, tenant_id: uuid.UUID) -> None:
+        with self._lock:
+            for key in [k for k in self._engines if k[0] == tenant_id]:
+                del self._engines[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engines.clear()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+
+# Process-wide cache used by the agent and PrepKit routes
+tenant_policies = TenantPolicyEngines()
+
+
+@event.listens_for(Tenant, "after_update")
+@event.listens_for(Tenant, "after_delete")
+def _invalidate_tenant(mapper, connection, target: Tenant) -> None:
+    tenant_policies.invalidate(target.id)
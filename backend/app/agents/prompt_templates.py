@@ -0,0 +1,72 @@
+"""
+Precompiled agent prompts.
+
+Each definition's prompt (agent header + every workflow step's
+``prompt_template``) is parsed once, when definitions load, into alternating
+literal segments and ``{{variable}}`` slots. Rendering is a single pass and
+one ``join``; placeholders without a value in ``input_data`` are left as-is.
+Values are substituted exactly once, so text inside a value is never itself
+treated as a placeholder.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+PLACEHOLDER = re.compile(r"\{\{([^{}]+)\}\}")
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    literals: tuple[str, ...]  # len(variables) + 1 segments around the slots
+    variables: tuple[str, ...]
+
+    def render(self, values: dict[str, Any]) -> str:
+        parts = [self.literals[0]]
+        for name, literal in zip(self.variables, self.literals[1:]):
+            parts.append(str(values[name]) if name in values else "{{" + name + "}}")
+            parts.append(literal)
+        return "".join(parts)
+
+
+class _Builder:
+    def __init__(self):
+        self.literals = [""]
+        self.variables: list[str] = []
+
+    def text(self, value: str) -> None:
+        self.literals[-1] += value
+
+    def template(self, value: str) -> None:
+        pos = 0
+        for match in PLACEHOLDER.finditer(value):
+            self.text(value[pos:match.start()])
+            self.variables.append(match.group(1))
+            self.literals.append("")
+            pos = match.end()
+        self.text(value[pos:])
+
+    def build(self) -> CompiledPrompt:
+        return CompiledPrompt(tuple(self.literals), tuple(self.variables))
+
+
+def compile_prompt(defn: dict) -> CompiledPrompt:
+    """Compile a definition into the prompt AgentOrchestrator sends to the LLM."""
+    builder = _Builder()
+    builder.text(f"Agent: {defn['name']}\nPurpose: {defn.get('purpose', '')}")
+
+    boundaries = defn.get("boundaries", [])
+    if boundaries:
+        builder.text("\nBoundaries: " + "; ".join(boundaries))
+
+    for step in defn.get("workflow_steps", []):
+        builder.text(f"\nStep [{step.get('name', '?')}]: ")
+        builder.template(step.get("prompt_template", ""))
+
+    return builder.build()
+
+
+def undeclared_variables(defn: dict, prompt: CompiledPrompt) -> list[str]:
+    """Template variables the definition does not list in ``required_input_fields``."""
+    declared = set(defn.get("required_input_fields", []))
+    return sorted({name for name in prompt.variables if name not in declared})
@@ -0,0 +1,169 @@
+"""
+Agent definition registry – one process-wide, lazily loaded, hot-reloadable
+view of ``app/agents/definitions/*.yaml``.
+
+Nothing is read at import time; the first lookup loads the directory. Each
+file is cached by (mtime, size) and, if those change, by content hash, so a
+re-check only stats the files and re-parses what actually changed. Lookups
+re-check the directory at most every ``AGENT_DEFINITIONS_RELOAD_SECONDS``
+(0 disables the automatic check); ``reload()`` forces one. An edited file
+that no longer parses keeps its last good definition.
+
+Parsing also compiles the prompt and reports template variables missing
+from ``required_input_fields`` (see app.agents.prompt_templates).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+from app.agents.prompt_templates import CompiledPrompt, compile_prompt, undeclared_variables
+from app.agents.response_cache import content_hash
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFINITIONS_DIR = Path(__file__).parent / "definitions"
+
+
+@dataclass(frozen=True)
+class AgentDefinition:
+    name: str
+    spec: dict  # the parsed YAML
+    content_hash: str
+    prompt: CompiledPrompt
+    undeclared_variables: tuple[str, ...]
+    source: Path
+
+
+@dataclass
+class _CachedFile:
+    signature: tuple[int, int]  # (mtime_ns, size)
+    digest: str
+    definition: AgentDefinition | None
+
+
+class DefinitionRegistry:
+    def __init__(
+        self,
+        directory: Path | None = None,
+        reload_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.directory = Path(directory or DEFINITIONS_DIR)
+        self.reload_seconds = (
+            settings.AGENT_DEFINITIONS_RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        )
+        self._clock = clock
+        self._files: dict[Path, _CachedFile] = {}
+        self._by_name: dict[str, AgentDefinition] = {}
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+    # -- lookups ------------------------------------------------------------
+
+    def get(self, name: str) -> AgentDefinition | None:
+        self._maybe_refresh()
+        return self._by_name.get(name)
+
+    def names(self) -> list[str]:
+        self._maybe_refresh()
+        return list(self._by_name)
+
+    def definitions(self) -> list[AgentDefinition]:
+        self._maybe_refresh()
+        return list(self._by_name.values())
+
+    # -- loading ------------------------------------------------------------
+
+    def reload(self) -> list[str]:
+        """Re-check the directory now; returns the names of changed definitions."""
+        with self._lock:
+            return self._refresh()
+
+    def _maybe_refresh(self) -> None:
+        checked_at = self._checked_at
+        if checked_at is not None and (
+            self.reload_seconds <= 0 or self._clock() - checked_at < self.reload_seconds
+        ):
+            return
+        with self._lock:
+            if self._checked_at is checked_at:  # another thread may have just refreshed
+                self._refresh()
+
+    def _refresh(self) -> list[str]:
+        initial = self._checked_at is None
+        self._checked_at = self._clock()
+        paths = sorted(self.directory.glob("*.yaml")) if self.directory.exists() else []
+        changed: list[str] = []
+        files: dict[Path, _CachedFile] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(path)
+            if cached is not None and cached.signature == signature:
+                files[path] = cached
+                continue
+
+            raw = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if cached is not None and cached.digest == digest:
+                files[path] = _CachedFile(signature, digest, cached.definition)
+                continue
+
+            definition = self._parse(path, raw)
+            if definition is None and cached is not None:
+                definition = cached.definition  # keep the last good version
+            else:
+                changed.append(definition.name if definition else path.stem)
+            files[path] = _CachedFile(signature, digest, definition)
+
+        removed = [c.definition.name for p, c in self._files.items() if p not in files and c.definition]
+        by_name: dict[str, AgentDefinition] = {}
+        for path, cached in files.items():
+            definition = cached.definition
+            if definition is None:
+                continue
+            if definition.name in by_name:
+                logger.warning("Agent %s defined in both %s and %s; using the latter",
+                               definition.name, by_name[definition.name].source.name, path.name)
+            by_name[definition.name] = definition
+
+        self._files, self._by_name = files, by_name
+        if not initial and (changed or removed):
+            logger.info("Agent definitions loaded: changed=%s removed=%s", changed, removed)
+        return changed + removed
+
+    def _parse(self, path: Path, raw: bytes) -> AgentDefinition | None:
+        try:
+            spec = yaml.safe_load(raw.decode("utf-8"))
+        except (yaml.YAMLError, UnicodeDecodeError):
+            logger.exception("Invalid agent definition %s", path.name)
+            return None
+        if not isinstance(spec, dict) or "name" not in spec:
+            return None
+
+        prompt = compile_prompt(spec)
+        undeclared = undeclared_variables(spec, prompt)
+        if undeclared:
+            logger.warning(
+                "Agent %s (%s): prompt variables %s are not in required_input_fields",
+                spec["name"], path.name, ", ".join(undeclared),
+            )
+        return AgentDefinition(
+            name=spec["name"], spec=spec, content_hash=content_hash(spec), prompt=prompt,
+            undeclared_variables=tuple(undeclared), source=path,
+        )
+
+
+# Process-wide registry shared by every AgentOrchestrator
+definition_registry = DefinitionRegistry()
@@ -0,0 +1,175 @@
+"""
+Agent response cache – reuse the LLM output of an identical agent run.
+
+Raw output is keyed by a hash of the agent, its definition, the model
+parameters and the input, so an edited definition or model never serves a
+stale answer. ``AGENT_RESPONSE_CACHE`` selects ``memory`` (per-process LRU,
+the default), ``redis`` or ``none``; the policy check still runs on every output.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize input values so equivalent submissions hash alike."""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def response_key(agent_name: str, definition_hash: str, model_params: dict, input_data: dict) -> str:
+    return content_hash({
+        "agent": agent_name,
+        "definition": definition_hash,
+        "model": model_params,
+        "input": _canonical(input_data),
+    })
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, value: str | None) -> str | None:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class MemoryResponseCache(_Counters):
+    backend = "memory"
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds or settings.AGENT_RESPONSE_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.AGENT_RESPONSE_CACHE_MAX_ENTRIES
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return self._count(entry[1] if entry else None)
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {**super().stats(), "entries": len(self._entries)}
+
+
+class RedisResponseCache(_Counters):
+    backend = "redis"
+    KEY_PREFIX = "agent_response:"
+
+    def __init__(self, client=None, ttl_seconds: float | None = None):
+        super().__init__()
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(
+                settings.REDIS_URL, socket_timeout=0.25, socket_connect_timeout=0.25,
+            )
+        self._client = client
+        self.ttl_seconds = ttl_seconds or settings.AGENT_RESPONSE_CACHE_TTL_SECONDS
+
+    def get(self, key: str) -> str | None:
+        try:
+            raw = self._client.get(self.KEY_PREFIX + key)
+        except Exception:
+            logger.warning("Agent response cache read failed; calling the LLM", exc_info=True)
+            raw = None
+        return self._count(raw.decode() if isinstance(raw, bytes) else raw)
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self._client.setex(self.KEY_PREFIX + key, int(self.ttl_seconds), value)
+        except Exception:
+            logger.warning("Agent response cache write failed", exc_info=True)
+
+    def clear(self) -> None:
+        self.hits = self.misses = 0
+        try:
+            keys = list(self._client.scan_iter(f"{self.KEY_PREFIX}*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception:
+            logger.warning("Agent response cache clear failed", exc_info=True)
+
+
+class NullResponseCache(_Counters):
+    backend = "none"
+
+    def get(self, key: str) -> str | None:
+        return self._count(None)
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        self.hits = self.misses = 0
+
+
+def build_response_cache(backend: str | None = None):
+    backend = (backend or settings.AGENT_RESPONSE_CACHE).lower()
+    if backend == "redis":
+        return RedisResponseCache()
+    if backend == "none":
+        return NullResponseCache()
+    return MemoryResponseCache()
+
+
+# Process-wide cache used by AgentOrchestrator
+response_cache = build_response_cache()
@@ -11,6 +11,104 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     FRONTEND_URL: str = "http://localhost:3000"
 
+    # Document uploads (app.uploads): streamed to disk in chunks, capped mid-stream
+    UPLOAD_MAX_BYTES: int = 100 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    # POST /documents/upload/bulk: files per request, and how many stream to storage at once
+    DOCUMENT_BULK_MAX_FILES: int = 20
+    DOCUMENT_BULK_CONCURRENCY: int = 4
+    # Content-addressed blobs (app.services.document_store): GC skips files touched this recently
+    DOCUMENT_BLOB_GC_GRACE_SECONDS: float = 3600.0
+    # Storage backend (app.storage): "local" (UPLOAD_DIR) or "s3" (any S3-compatible endpoint)
+    STORAGE_BACKEND: str = "local"
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""  # empty: AWS regional endpoint; set for MinIO and friends
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    STORAGE_TIMEOUT_SECONDS: float = 30.0
+    STORAGE_HTTP_MAX_CONNECTIONS: int = 50
+    # Document processing pipeline (app.services.document_pipeline): page count, text, kind
+    DOCUMENT_PIPELINE_ENABLED: bool = True
+    DOCUMENT_PIPELINE_WORKERS: int = 4
+    DOCUMENT_PIPELINE_QUEUE_SIZE: int = 1000
+    DOCUMENT_PIPELINE_MAX_ATTEMPTS: int = 3
+    DOCUMENT_PIPELINE_RETRY_BASE_SECONDS: float = 5.0
+    DOCUMENT_PIPELINE_SWEEP_SECONDS: float = 60.0
+    DOCUMENT_PIPELINE_CLAIM_SECONDS: float = 600.0  # a claim older than this is taken over (crashed process)
+    DOCUMENT_PIPELINE_MAX_BYTES: int = 50 * 1024 * 1024  # larger files get type detection only
+    DOCUMENT_PIPELINE_MAX_TEXT_CHARS: int = 100_000
+    DOCUMENT_PIPELINE_MIN_KIND_CONFIDENCE: float = 0.6
+    DOCUMENT_THUMBNAIL_PX: int = 256
+
+    # Event ingestion (write-behind buffer for /events/track/batch)
+    EVENT_BATCH_MAX_SIZE: int = 500
+    EVENT_BUFFER_MAX_PENDING: int = 20000
+    EVENT_BUFFER_FLUSH_SIZE: int = 500
+    EVENT_BUFFER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    EVENT_BUFFER_SUBMIT_TIMEOUT_SECONDS: float = 0.5
+
+    # Background scheduler (SLA nudges, doc chase, WhatsApp cadence).
+    # Per-tenant overrides live in Tenant.settings_json["scheduler"][job_name].
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SECONDS: float = 30.0
+    SCHEDULER_ADVISORY_LOCK_ID: int = 2  # 1 = migrations (entrypoint.sh)
+    SCHEDULER_SLA_NUDGE_INTERVAL_MINUTES: int = 15
+    SCHEDULER_DOC_CHASE_INTERVAL_MINUTES: int = 60
+    SCHEDULER_WHATSAPP_CADENCE_INTERVAL_MINUTES: int = 60
+
+    # Authenticated principal cache (app.principal_cache): memory | redis | none
+    AUTH_PRINCIPAL_CACHE: str = "memory"
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Async LLM path: max in-flight completions per provider / event loop
+    LLM_MAX_CONCURRENCY: int = 200
+
+    # OpenAI HTTP client (app.agents.openai_llm): pooled keep-alive connections
+    OPENAI_BASE_URL: str = ""  # empty = api.openai.com; set for a proxy or local stub
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_TIMEOUT_SECONDS: float = 60.0
+
+    # Retries on 429 / 5xx / connection errors (full-jitter exponential backoff);
+    # after LLM_BREAKER_FAILURE_THRESHOLD consecutive upstream failures the
+    # circuit opens and runs use the template path for LLM_BREAKER_RESET_SECONDS
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # /public/prepkit runs both LLM calls concurrently under one deadline;
+    # a call that misses its timeout falls back to the template defaults
+    PREPKIT_DEADLINE_SECONDS: float = 20.0
+    PREPKIT_LLM_TIMEOUT_SECONDS: float = 15.0
+    PREPKIT_AGENT_TIMEOUT_SECONDS: float = 15.0
+
+    # Agent definitions (app.agents.registry): changed YAML files are picked up
+    # at most this often; 0 = only via POST /agents/definitions/reload
+    AGENT_DEFINITIONS_RELOAD_SECONDS: float = 5.0
+
+    # Batch agent runs (POST /agents/run/batch, app.services.agent_batch)
+    AGENT_BATCH_MAX_MATTERS: int = 5000
+    AGENT_BATCH_WORKERS: int = 8
+    AGENT_BATCH_FLUSH_SIZE: int = 100  # AgentRun/Approval rows per INSERT + COMMIT
+
+    # Agent LLM response cache (app.agents.response_cache): memory | redis | none
+    AGENT_RESPONSE_CACHE: str = "memory"
+    AGENT_RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+    AGENT_RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+
+    # Compiled per-tenant UPL rule packs (app.agents.policy_packs)
+    POLICY_ENGINE_CACHE_MAX_ENTRIES: int = 256
+
+    # Keyset pagination for list endpoints (app.pagination)
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    PIPELINE_STAGE_LIMIT: int = 25  # cards per Kanban column before "load more"
+
     model_config = {"env_file": ".env", "extra": "allow"}
 
 
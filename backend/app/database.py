@@ -21,3 +21,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_session_factory() -> sessionmaker:
+    """For work that outlives the request (a streamed body runs after get_db's
+    session is closed): open a session from this and close it yourself."""
+    return SessionLocal
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
 from app.models import User
+from app.principal_cache import Principal, principal_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer()
@@ -32,20 +33,44 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
+def access_token_for(user: User) -> str:
+    """Login token: user id plus tenant and role (the Principal comes from the cache or users table)."""
+    return create_access_token({
+        "sub": str(user.id),
+        "tenant_id": str(user.tenant_id),
+        "role": user.role,
+    })
+
+
 def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
+    """Resolve the bearer token to a Principal; the users table is only read on a cache miss."""
     token = creds.credentials
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
+        user_id = uuid.UUID(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == uuid.UUID(user_id)).first()
+    principal = principal_cache.get(user_id)
+    claimed_tenant = payload.get("tenant_id")
+    if principal is not None and claimed_tenant in (None, str(principal.tenant_id)):
+        return principal
+
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(principal)
+    return principal
+
+
+def require_role(*roles: str):
+    """Dependency: the current user, who must have one of ``roles`` (else 403)."""
+    def _check(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if current_user.role not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+        return current_user
+    return _check
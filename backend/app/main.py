@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -5,6 +7,10 @@ from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
 from app.rate_limit import limiter
+from app.services.document_pipeline import document_pipeline
+from app.services.event_buffer import event_buffer
+from app.services import kpi_rollup  # noqa: F401 – registers the rollup flush hook
+from app.services.scheduler import scheduler
 from app.routers import (
     auth, tenants, intakes, matters, documents, agents,
     approvals, tasks, messages, interpreters,
@@ -12,6 +18,22 @@ from app.routers import (
     pipeline, templates, feedback,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- Background workers ---
+    event_buffer.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    if settings.DOCUMENT_PIPELINE_ENABLED:
+        await document_pipeline.start()
+    yield
+    await document_pipeline.stop()
+    scheduler.stop()
+    # Drain buffered analytics events before the process exits
+    event_buffer.stop()
+
+
 app = FastAPI(
     title="LegalOps Agent Platform",
     description=(
@@ -20,6 +42,7 @@ app = FastAPI(
         "outputs require Human Approval Gate before delivery."
     ),
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Explicit origins: FRONTEND_URL + localhost dev servers
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
-    Column, String, DateTime, ForeignKey, JSON, Integer, Text, func
+    BigInteger, Boolean, Column, String, Date, DateTime, Float, ForeignKey, Index, JSON, Integer, Text, func
 )
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -50,6 +50,11 @@ class Intake(Base):
     pipeline_stage = Column(String(50), default="new_intake")  # new_intake, qualified, converted
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_intakes_tenant_created", "tenant_id", "created_at"),
+        Index("ix_intakes_tenant_status_created", "tenant_id", "status", "created_at"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Matter
@@ -67,6 +72,13 @@ class Matter(Base):
     pipeline_stage = Column(String(50), default="matter_created")  # matter_created, docs_pending, case_packet_pending, approved, closed
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_matters_tenant_created", "tenant_id", "created_at"),
+        Index("ix_matters_tenant_stage_created", "tenant_id", "pipeline_stage", "created_at"),
+        Index("ix_matters_tenant_type_created", "tenant_id", "type", "created_at"),
+        Index("ix_matters_intake", "intake_id"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Person  (client / spouse / dependent linked to a matter)
@@ -97,9 +109,52 @@ class Document(Base):
     kind = Column(String(100))  # id_document, tax_notice, court_notice, marriage_cert, etc.
     filename = Column(String(500))
     storage_uri = Column(String(1000))
+    size_bytes = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)  # hex digest of the stored bytes
     status = Column(String(50), default="uploaded")  # uploaded, verified, rejected
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_documents_matter_status_kind", "matter_id", "status", "kind"),
+    )
+
+
+class DocumentBlob(Base):
+    """One stored copy of some document bytes, shared by every Document with that content."""
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    ref_count = Column(Integer, nullable=False, default=0)  # Documents whose storage_uri is this blob
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class DocumentMetadata(Base):
+    """What background processing found in a document (app.services.document_pipeline)."""
+    __tablename__ = "document_metadata"
+
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    sha256 = Column(String(64), nullable=True)  # content the results were computed from
+    status = Column(String(20), nullable=False, default="pending")  # pending, processing, done, failed
+    claimed_at = Column(DateTime)  # when a worker set status to "processing"
+    attempts = Column(Integer, nullable=False, default=0)
+    mime_type = Column(String(100))
+    page_count = Column(Integer)
+    text = Column(Text)  # truncated to DOCUMENT_PIPELINE_MAX_TEXT_CHARS
+    text_chars = Column(Integer)  # length before truncation
+    truncated = Column(Boolean, nullable=False, default=False)  # PDF parsing stopped at the inflate budget
+    suggested_kind = Column(String(100))  # best VERTICAL_TEMPLATES document key
+    kind_confidence = Column(Float)
+    thumbnail_uri = Column(String(1000))
+    timings_json = Column(JSON, default=dict)  # stage -> milliseconds
+    error = Column(Text)
+    processed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_document_metadata_status", "status"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Task
@@ -115,8 +170,18 @@ class Task(Base):
     status = Column(String(50), default="pending")  # pending, in_progress, completed, cancelled
     assigned_to_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     due_at = Column(DateTime, nullable=True)
+    # Structured link to the record that generated the task (e.g. SLA nudges)
+    source_type = Column(String(50), nullable=True)  # approval_sla_nudge
+    source_id = Column(UUID(as_uuid=True), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("uq_tasks_source", "source_type", "source_id", unique=True),
+        Index("ix_tasks_tenant_status_due", "tenant_id", "status", "due_at"),
+        Index("ix_tasks_tenant_matter", "tenant_id", "matter_id"),
+        Index("ix_tasks_tenant_created_id", "tenant_id", "created_at", "id"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # AgentRun
@@ -133,6 +198,10 @@ class AgentRun(Base):
     status = Column(String(50), default="pending")  # pending, running, completed, blocked, failed
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_agent_runs_matter_created", "matter_id", "created_at"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Approval  (Human Approval Gate)
@@ -152,6 +221,11 @@ class Approval(Base):
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_approvals_tenant_status_created", "tenant_id", "status", "created_at"),
+        Index("ix_approvals_matter_created", "matter_id", "created_at"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # MessageDraft
@@ -167,6 +241,29 @@ class MessageDraft(Base):
     status = Column(String(50), default="draft")  # draft, needs_approval, approved, sent
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_message_drafts_matter_created", "matter_id", "created_at"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# ReminderCadence  (per-matter reminder state for doc chase / WhatsApp)
+# ---------------------------------------------------------------------------
+class ReminderCadence(Base):
+    __tablename__ = "reminder_cadences"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    matter_id = Column(UUID(as_uuid=True), ForeignKey("matters.id"), nullable=False)
+    channel = Column(String(50), nullable=False)  # email (doc chase), whatsapp
+    reminder_count = Column(Integer, nullable=False, default=0)
+    last_sent_at = Column(DateTime, nullable=True)  # when the last reminder draft was created
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("uq_reminder_cadences_matter_channel", "matter_id", "channel", unique=True),
+    )
+
 
 # ---------------------------------------------------------------------------
 # InterpreterRequest
@@ -184,6 +281,10 @@ class InterpreterRequest(Base):
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_interpreter_requests_tenant_created", "tenant_id", "created_at"),
+    )
+
 
 # ===========================================================================
 # GROWTH / INSTRUMENTATION MODELS
@@ -202,6 +303,10 @@ class Event(Base):
     properties_json = Column(JSON, default=dict)
     created_at = Column(DateTime, server_default=func.now(), index=True)
 
+    __table_args__ = (
+        Index("ix_events_tenant_name_created", "tenant_id", "name", "created_at"),
+    )
+
 
 class Lead(Base):
     """B2C lead or B2B prospect captured before becoming a tenant/matter."""
@@ -215,6 +320,11 @@ class Lead(Base):
     contact_json = Column(JSON, default=dict)  # {name, email, phone, notes, utm_*}
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_leads_tenant_status_created", "tenant_id", "status", "created_at"),
+        Index("ix_leads_tenant_created_id", "tenant_id", "created_at", "id"),
+    )
+
 
 class Experiment(Base):
     """A/B experiment definition."""
@@ -256,3 +366,50 @@ class Feedback(Base):
     text = Column(Text)
     context_json = Column(JSON, default=dict)
     created_at = Column(DateTime, server_default=func.now())
+
+
+class JobRun(Base):
+    """One execution of a background job (app.services.scheduler) for a tenant."""
+    __tablename__ = "job_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True)
+    job_name = Column(String(100), nullable=False)  # sla_nudge, doc_chase, whatsapp_cadence
+    status = Column(String(50), nullable=False)  # completed, failed
+    items = Column(Integer, default=0)  # nudges / drafts created
+    duration_ms = Column(Integer, nullable=False)
+    error = Column(Text)
+    started_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_job_runs_tenant_started", "tenant_id", "started_at"),
+    )
+
+
+# ===========================================================================
+# KPI ROLLUPS (maintained by app.services.kpi_rollup)
+# ===========================================================================
+
+class KpiDailyRollup(Base):
+    """Per-tenant, per-day KPI counters backing /app/analytics/overview."""
+    __tablename__ = "kpi_daily_rollups"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    intakes = Column(Integer, nullable=False, default=0)
+    matters = Column(Integer, nullable=False, default=0)
+    approvals_requested = Column(Integer, nullable=False, default=0)  # by created day
+    approvals_approved = Column(Integer, nullable=False, default=0)  # by decided day
+    approvals_rejected = Column(Integer, nullable=False, default=0)  # by decided day
+    leads = Column(Integer, nullable=False, default=0)
+    events = Column(Integer, nullable=False, default=0)
+
+
+class KpiTtaBucket(Base):
+    """Time-to-approve digest: log-spaced bucket counts per tenant/day (mergeable by sum)."""
+    __tablename__ = "kpi_tta_buckets"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,78 @@
+"""Keyset (cursor) pagination on (created_at, id) for list endpoints.
+
+Pages are ordered newest first. The cursor is an opaque token holding the
+(created_at, id) of the last row served; the next page seeks past it with a
+row-value comparison, so every page costs one index range read regardless
+of how deep the client has paged.
+"""
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.config import settings
+
+
+@dataclass
+class PageParams:
+    cursor: str | None
+    limit: int
+
+
+def page_params(
+    cursor: str | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_keyset(values: list) -> str:
+    """Cursor for a custom keyset (JSON-serialisable sort-key values)."""
+    raw = json.dumps(values, default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_keyset(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        values = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def paginate(query: OrmQuery, model, page: PageParams) -> dict:
+    """Apply keyset ordering/seek to ``query`` (over ``model``) and fetch one page."""
+    created_at, row_id = model.created_at, model.id
+    if page.cursor:
+        after_created, after_id = decode_cursor(page.cursor)
+        query = query.filter(tuple_(created_at, row_id) < tuple_(after_created, after_id))
+
+    rows = query.order_by(created_at.desc(), row_id.desc()).limit(page.limit + 1).all()
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
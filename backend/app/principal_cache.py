@@ -0,0 +1,198 @@
+"""Authenticated principal cache (skips the per-request users lookup).
+
+``get_current_user`` resolves the JWT ``sub`` to a lightweight ``Principal``
+(id, tenant, role, email, name). Principals are cached by user id for
+``AUTH_PRINCIPAL_CACHE_TTL_SECONDS``; only a miss reads the users table.
+
+Backends (``AUTH_PRINCIPAL_CACHE``):
+    memory – per-process bounded LRU (default)
+    redis  – shared across API processes via ``REDIS_URL``
+    none   – always read the users table
+
+Entries are invalidated when a transaction that updated or deleted a User
+row through the ORM commits, or explicitly with
+``principal_cache.invalidate(user_id)``. Redis
+errors degrade to a DB lookup, never to an auth failure.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by routers (no ORM session attached)."""
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    role: str
+    email: str | None = None
+    full_name: str | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id, tenant_id=user.tenant_id, role=user.role,
+            email=user.email, full_name=user.full_name,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["id"], data["tenant_id"] = str(self.id), str(self.tenant_id)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "Principal":
+        data = json.loads(raw)
+        data["id"], data["tenant_id"] = uuid.UUID(data["id"]), uuid.UUID(data["tenant_id"])
+        return cls(**data)
+
+
+class MemoryPrincipalCache:
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds or settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES
+        self._clock = clock
+        self._entries: OrderedDict[uuid.UUID, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= self._clock():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (self._clock() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisPrincipalCache:
+    KEY_PREFIX = "principal:"
+
+    def __init__(self, client=None, ttl_seconds: float | None = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(
+                settings.REDIS_URL, socket_timeout=0.25, socket_connect_timeout=0.25,
+            )
+        self._client = client
+        self.ttl_seconds = ttl_seconds or settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+
+    def get(self, user_id: uuid.UUID) -> Principal | None:
+        try:
+            raw = self._client.get(self._key(user_id))
+        except Exception:
+            logger.warning("Principal cache read failed; falling back to DB", exc_info=True)
+            return None
+        return Principal.from_json(raw) if raw else None
+
+    def set(self, principal: Principal) -> None:
+        try:
+            self._client.setex(self._key(principal.id), int(self.ttl_seconds), principal.to_json())
+        except Exception:
+            logger.warning("Principal cache write failed", exc_info=True)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        try:
+            self._client.delete(self._key(user_id))
+        except Exception:
+            # A stale entry survives at most ttl_seconds
+            logger.warning("Principal cache invalidation failed for %s", user_id, exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(f"{self.KEY_PREFIX}*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception:
+            logger.warning("Principal cache clear failed", exc_info=True)
+
+
+class NullPrincipalCache:
+    def get(self, user_id: uuid.UUID) -> Principal | None:
+        return None
+
+    def set(self, principal: Principal) -> None:
+        pass
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+def build_principal_cache(backend: str | None = None):
+    backend = (backend or settings.AUTH_PRINCIPAL_CACHE).lower()
+    if backend == "redis":
+        return RedisPrincipalCache()
+    if backend == "none":
+        return NullPrincipalCache()
+    return MemoryPrincipalCache()
+
+
+# Process-wide cache used by app.dependencies.get_current_user
+principal_cache = build_principal_cache()
+
+
+# Invalidate on commit, not at flush: a request resolving the user between
+# the flush and the commit would otherwise re-cache the old row.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate(target.id)
+    else:
+        session.info.setdefault("principal_cache_invalidate", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop("principal_cache_invalidate", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop("principal_cache_invalidate", None)
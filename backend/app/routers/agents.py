@@ -1,25 +1,30 @@
 """Run an agent workflow (mock LLM) and enforce policy engine."""
 
+import json
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import AgentRun, Approval, Matter, User
-from app.schemas import AgentRunRequest, AgentRunOut
-from app.agents.orchestrator import AgentOrchestrator
+from app.database import get_db, get_session_factory
+from app.dependencies import Principal, get_current_user, require_role
+from app.models import AgentRun, Approval, Matter
+from app.config import settings
+from app.schemas import AgentBatchRunRequest, AgentRunRequest, AgentRunOut
+from app.agents.orchestrator import get_orchestrator
+from app.agents.policy_engine import PolicyEngine
+from app.agents.policy_packs import tenant_policies
+from app.services.agent_batch import AgentBatch, BatchJob, agent_run_status, batch_jobs, matter_input
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
-orchestrator = AgentOrchestrator()
+orchestrator = get_orchestrator()
 
 
-@router.post("/run", response_model=AgentRunOut, status_code=201)
-def run_agent(
-    body: AgentRunRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+def _prepare_run(db: Session, current_user: Principal, body: AgentRunRequest) -> PolicyEngine:
+    """Validate the request and resolve the tenant's policy engine."""
     matter = db.query(Matter).filter(Matter.id == body.matter_id, Matter.tenant_id == current_user.tenant_id).first()
     if not matter:
         raise HTTPException(status_code=404, detail="Matter not found")
@@ -27,13 +32,15 @@ def run_agent(
     if body.agent_name not in orchestrator.available_agents():
         raise HTTPException(status_code=400, detail=f"Unknown agent: {body.agent_name}. Available: {orchestrator.available_agents()}")
 
-    # Execute agent (mock LLM)
-    result = orchestrator.run(body.agent_name, body.input_data)
+    policy = tenant_policies.for_tenant(db, current_user.tenant_id)
+    # End the read transaction so no pooled connection is held across the LLM call
+    db.commit()
+    return policy
 
-    # Determine status based on policy check
-    status = "completed"
-    if result.get("compliance_flags"):
-        status = "blocked"
+
+def _record_run(db: Session, current_user: Principal, body: AgentRunRequest, result: dict) -> AgentRun:
+    # blocked (policy check) / needs_approval get an Approval
+    status = agent_run_status(result)
 
     agent_run = AgentRun(
         tenant_id=current_user.tenant_id,
@@ -46,8 +53,7 @@ def run_agent(
     db.add(agent_run)
     db.flush()
 
-    # If blocked or has output for client, create approval
-    if status == "blocked" or result.get("requires_approval", True):
+    if status != "completed":
         approval = Approval(
             tenant_id=current_user.tenant_id,
             matter_id=body.matter_id,
@@ -57,15 +63,157 @@ def run_agent(
             requested_by=current_user.id,
         )
         db.add(approval)
-        if status != "blocked":
-            agent_run.status = "needs_approval"
 
     db.commit()
     db.refresh(agent_run)
     return agent_run
 
 
+def _batch_matters(db: Session, current_user: Principal, body: AgentBatchRunRequest) -> list[Matter]:
+    query = db.query(Matter).filter(Matter.tenant_id == current_user.tenant_id)
+    if body.matter_ids is not None:
+        query = query.filter(Matter.id.in_(body.matter_ids))
+    else:
+        f = body.filter
+        if f.type:
+            query = query.filter(Matter.type == f.type)
+        if f.pipeline_stage:
+            query = query.filter(Matter.pipeline_stage == f.pipeline_stage)
+        if f.status:
+            query = query.filter(Matter.status == f.status)
+        if f.jurisdiction:
+            query = query.filter(Matter.jurisdiction == f.jurisdiction)
+        if f.created_after:
+            query = query.filter(Matter.created_at >= f.created_after)
+        if f.created_before:
+            query = query.filter(Matter.created_at < f.created_before)
+
+    matters = query.order_by(Matter.created_at, Matter.id).limit(settings.AGENT_BATCH_MAX_MATTERS + 1).all()
+    if len(matters) > settings.AGENT_BATCH_MAX_MATTERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch selects more than {settings.AGENT_BATCH_MAX_MATTERS} matters; narrow the filter",
+        )
+    return matters
+
+
+@router.post("/run", response_model=AgentRunOut, status_code=201)
+async def run_agent(
+    body: AgentRunRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    # DB work runs in the threadpool; the LLM call is awaited on the event loop
+    policy = await run_in_threadpool(_prepare_run, db, current_user, body)
+
+    # Execute agent (mock LLM)
+    result = await orchestrator.arun(
+        body.agent_name, body.input_data, policy=policy, use_cache=not body.bypass_cache,
+    )
+    return await run_in_threadpool(_record_run, db, current_user, body, result)
+
+
+@router.post("/run/stream", status_code=201)
+async def run_agent_stream(
+    body: AgentRunRequest,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Same as /run, streamed as NDJSON.
+
+    Emits ``{"type": "chunk", "text": ...}`` per LLM chunk, then
+    ``{"type": "run", "run": AgentRunOut}`` once the run is stored. Output
+    that trips the UPL guard stops generating at that point.
+    """
+    policy = await run_in_threadpool(_prepare_run, db, current_user, body)
+    run = orchestrator.stream(body.agent_name, body.input_data, policy=policy, use_cache=not body.bypass_cache)
+
+    async def _events():
+        async for chunk in run:
+            yield json.dumps({"type": "chunk", "text": chunk}) + "\n"
+        # The request session is closed by now: record on one this generator owns
+        session = session_factory()
+        try:
+            agent_run = await run_in_threadpool(_record_run, session, current_user, body, run.output)
+            out = AgentRunOut.model_validate(agent_run).model_dump(mode="json")
+        finally:
+            session.close()
+        yield json.dumps({"type": "run", "run": out}) + "\n"
+
+    return StreamingResponse(_events(), status_code=201, media_type="application/x-ndjson")
+
+
+@router.post("/run/batch", status_code=201)
+def run_agent_batch(
+    body: AgentBatchRunRequest,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Run one agent over many matters (explicit ``matter_ids`` or a ``filter``), streamed as NDJSON.
+
+    Emits ``{"type": "progress", "batch_id", "total", "done", <count per
+    status>}`` after each batch of rows is committed, then ``{"type":
+    "summary", ..., "not_found": [...], "runs": [{matter_id, agent_run_id,
+    status}]}``. The batch runs in the background on its own session: it
+    finishes even if the client disconnects, and
+    ``GET /agents/run/batch/{batch_id}`` reports where it is.
+    """
+    if (body.matter_ids is None) == (body.filter is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of matter_ids or filter")
+    if body.agent_name not in orchestrator.available_agents():
+        raise HTTPException(status_code=400, detail=f"Unknown agent: {body.agent_name}. Available: {orchestrator.available_agents()}")
+
+    matters = _batch_matters(db, current_user, body)
+    policy = tenant_policies.for_tenant(db, current_user.tenant_id)
+    db.commit()
+
+    found = {m.id for m in matters}
+    not_found = [str(i) for i in dict.fromkeys(body.matter_ids or []) if i not in found]
+    items = [(m.id, matter_input(m, body.input_data)) for m in matters]
+    batch = AgentBatch(
+        orchestrator, current_user.tenant_id, current_user.id, body.agent_name,
+        policy=policy, use_cache=not body.bypass_cache,
+    )
+    job = batch_jobs.start(BatchJob(batch, session_factory, items, not_found))
+
+    def _events():
+        for event in job.events():
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(_events(), status_code=201, media_type="application/x-ndjson")
+
+
+@router.get("/run/batch/{batch_id}")
+def agent_batch_progress(batch_id: uuid.UUID, current_user: Principal = Depends(get_current_user)):
+    """Progress (or the summary, once finished) of a batch started on this process."""
+    job = batch_jobs.get(batch_id, current_user.tenant_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return job.snapshot()
+
+
 @router.get("/definitions")
 def list_agent_definitions():
     """Return all registered agent definitions."""
     return orchestrator.list_definitions()
+
+
+@router.get("/cache/stats")
+def agent_cache_stats(current_user: Principal = Depends(require_role("admin"))):
+    """Hit/miss counters of the agent response cache (this process)."""
+    return orchestrator.cache.stats()
+
+
+@router.get("/llm/stats")
+def agent_llm_stats(current_user: Principal = Depends(require_role("admin"))):
+    """LLM call latency, retries and circuit-breaker state (this process)."""
+    return orchestrator.llm.stats()
+
+
+@router.post("/definitions/reload")
+def reload_agent_definitions(current_user: Principal = Depends(require_role("admin"))):
+    """Re-read changed agent definition files without restarting the process."""
+    changed = orchestrator.registry.reload()
+    return {"changed": changed, "agents": orchestrator.available_agents()}
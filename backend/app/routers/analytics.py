@@ -8,13 +8,14 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
 from app.models import (
-    Intake, Matter, Approval, Event, Lead, AgentRun, MessageDraft, User, Document, Task,
+    Intake, Matter, Approval, Event, AgentRun, MessageDraft,
+    KpiDailyRollup, KpiTtaBucket, JobRun,
 )
-from app.schemas import AnalyticsOverview, FunnelStep, FunnelResponse, PilotKPIs
-from app.services.sla_nudge import check_sla_breaches
-from app.services.doc_chase import check_doc_reminders
+from app.schemas import AnalyticsOverview, FunnelStep, FunnelResponse, PilotKPIs, JobRunOut
+from app.services.kpi_rollup import tta_median
+from app.services.completeness import missing_documents, uploaded_kinds_by_matter
 
 router = APIRouter(prefix="/app/analytics", tags=["analytics"])
 
@@ -23,68 +24,51 @@ router = APIRouter(prefix="/app/analytics", tags=["analytics"])
 def get_overview(
     days: int = Query(default=7, ge=1, le=90),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """KPI overview for the current tenant over the last N days."""
-    tid = current_user.tenant_id
-    since = datetime.now(timezone.utc) - timedelta(days=days)
+    """KPI overview for the current tenant over the last N days.
 
-    intakes_total = (
-        db.query(func.count(Intake.id))
-        .filter(Intake.tenant_id == tid, Intake.created_at >= since)
-        .scalar() or 0
-    )
-    matters_total = (
-        db.query(func.count(Matter.id))
-        .filter(Matter.tenant_id == tid, Matter.created_at >= since)
-        .scalar() or 0
+    Served from the daily rollups (app.services.kpi_rollup), so the cost is
+    O(days) rather than O(tenant history). Windows are whole UTC days.
+    """
+    tid = current_user.tenant_id
+    since_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+
+    totals = (
+        db.query(
+            func.coalesce(func.sum(KpiDailyRollup.intakes), 0),
+            func.coalesce(func.sum(KpiDailyRollup.matters), 0),
+            func.coalesce(func.sum(KpiDailyRollup.approvals_approved), 0),
+            func.coalesce(func.sum(KpiDailyRollup.approvals_rejected), 0),
+            func.coalesce(func.sum(KpiDailyRollup.leads), 0),
+            func.coalesce(func.sum(KpiDailyRollup.events), 0),
+        )
+        .filter(KpiDailyRollup.tenant_id == tid, KpiDailyRollup.day >= since_day)
+        .one()
     )
+    intakes_total, matters_total, approvals_approved, approvals_rejected, leads_total, events_total = totals
+
+    # Pending is all-time: requested minus decided, across every day
     approvals_pending = (
-        db.query(func.count(Approval.id))
-        .filter(Approval.tenant_id == tid, Approval.status == "pending")
-        .scalar() or 0
-    )
-    approvals_approved = (
-        db.query(func.count(Approval.id))
-        .filter(Approval.tenant_id == tid, Approval.status == "approved", Approval.decided_at >= since)
-        .scalar() or 0
-    )
-    approvals_rejected = (
-        db.query(func.count(Approval.id))
-        .filter(Approval.tenant_id == tid, Approval.status == "rejected", Approval.decided_at >= since)
-        .scalar() or 0
-    )
-    leads_total = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.tenant_id == tid, Lead.created_at >= since)
-        .scalar() or 0
-    )
-    events_total = (
-        db.query(func.count(Event.id))
-        .filter(Event.tenant_id == tid, Event.created_at >= since)
+        db.query(func.coalesce(func.sum(
+            KpiDailyRollup.approvals_requested
+            - KpiDailyRollup.approvals_approved
+            - KpiDailyRollup.approvals_rejected
+        ), 0))
+        .filter(KpiDailyRollup.tenant_id == tid)
         .scalar() or 0
     )
 
-    # Median time to approve (in Python for DB compatibility)
-    approved_rows = (
-        db.query(Approval.created_at, Approval.decided_at)
-        .filter(
-            Approval.tenant_id == tid,
-            Approval.status == "approved",
-            Approval.decided_at.isnot(None),
-            Approval.decided_at >= since,
-        )
+    # Median time to approve from the merged per-day digests
+    tta_buckets = (
+        db.query(KpiTtaBucket.bucket, func.sum(KpiTtaBucket.count))
+        .filter(KpiTtaBucket.tenant_id == tid, KpiTtaBucket.day >= since_day)
+        .group_by(KpiTtaBucket.bucket)
         .all()
     )
-    tta_hours = None
-    if approved_rows:
-        deltas = [
-            (r.decided_at - r.created_at).total_seconds() / 3600
-            for r in approved_rows
-            if r.decided_at and r.created_at
-        ]
-        if deltas:
-            tta_hours = round(median(deltas), 1)
+    tta_hours = tta_median(tta_buckets)
+    if tta_hours is not None:
+        tta_hours = round(tta_hours, 1)
 
     return AnalyticsOverview(
         period=f"{days}d",
@@ -104,7 +88,7 @@ def get_funnel(
     vertical: str = Query(default="immigration"),
     days: int = Query(default=30, ge=1, le=90),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Funnel by vertical: intake → matter → agent_run → approval → sent."""
     tid = current_user.tenant_id
@@ -188,7 +172,7 @@ def get_pilot_kpis(
     days: int = Query(default=7, ge=1, le=90),
     sla_hours: int = Query(default=4, ge=1, le=72),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Pilot-specific KPIs: time_to_first_response, approval SLA, doc completeness, pipeline distribution."""
     tid = current_user.tenant_id
@@ -235,33 +219,20 @@ def get_pilot_kpis(
 
     # --- Doc completeness at 72h ---
     threshold_72h = datetime.now(timezone.utc) - timedelta(hours=72)
-    matters_older_72h = (
-        db.query(Matter)
-        .filter(Matter.tenant_id == tid, Matter.created_at <= threshold_72h, Matter.created_at >= since)
-        .all()
+    matter_kinds = uploaded_kinds_by_matter(
+        db,
+        Matter.tenant_id == tid,
+        Matter.created_at <= threshold_72h,
+        Matter.created_at >= since,
+    )
+    doc_complete_count = sum(
+        1 for matter_type, kinds in matter_kinds.values()
+        if not missing_documents(matter_type, kinds)
     )
-    doc_complete_count = 0
-    for matter in matters_older_72h:
-        from app.routers.templates import VERTICAL_TEMPLATES
-        template = VERTICAL_TEMPLATES.get(matter.type)
-        if not template:
-            doc_complete_count += 1
-            continue
-        required = [d for d in template.required_documents if d.required]
-        if not required:
-            doc_complete_count += 1
-            continue
-        docs = db.query(Document).filter(
-            Document.matter_id == matter.id,
-            Document.status.in_(["uploaded", "verified"]),
-        ).all()
-        uploaded_kinds = {d.kind for d in docs}
-        if all(d.key in uploaded_kinds for d in required):
-            doc_complete_count += 1
 
     doc_72h_pct = None
-    if matters_older_72h:
-        doc_72h_pct = round(doc_complete_count / len(matters_older_72h) * 100, 1)
+    if matter_kinds:
+        doc_72h_pct = round(doc_complete_count / len(matter_kinds) * 100, 1)
 
     # --- consult_scheduled stub event count ---
     consult_count = (
@@ -290,11 +261,17 @@ def get_pilot_kpis(
     for stage, count in matter_stages:
         stage_dist[stage or "matter_created"] = stage_dist.get(stage or "matter_created", 0) + count
 
-    # --- SLA breaches (also runs nudge creation) ---
-    breaches = check_sla_breaches(db, tid, sla_hours)
-
-    # --- Also run doc chase check ---
-    check_doc_reminders(db, tid, reminder_hours=48)
+    # --- SLA breaches (read-only; nudges are created by app.services.scheduler) ---
+    sla_threshold = datetime.now(timezone.utc) - timedelta(hours=sla_hours)
+    sla_breaches = (
+        db.query(func.count(Approval.id))
+        .filter(
+            Approval.tenant_id == tid,
+            Approval.status == "pending",
+            Approval.created_at < sla_threshold,
+        )
+        .scalar() or 0
+    )
 
     return PilotKPIs(
         period=f"{days}d",
@@ -303,5 +280,19 @@ def get_pilot_kpis(
         doc_completeness_72h_pct=doc_72h_pct,
         consult_scheduled_count=consult_count,
         pipeline_stage_distribution=stage_dist,
-        sla_breaches=len(breaches),
+        sla_breaches=sla_breaches,
     )
+
+
+@router.get("/job-runs", response_model=list[JobRunOut])
+def list_job_runs(
+    job_name: str | None = None,
+    limit: int = Query(default=50, le=200),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Recent background job executions (SLA nudges, reminders) with timings."""
+    q = db.query(JobRun).filter(JobRun.tenant_id == current_user.tenant_id)
+    if job_name:
+        q = q.filter(JobRun.job_name == job_name)
+    return q.order_by(JobRun.started_at.desc()).limit(limit).all()
@@ -1,28 +1,34 @@
 """Human Approval Gate – approve or reject agent outputs / message drafts."""
 
+import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Approval, AgentRun, MessageDraft, User
-from app.schemas import ApprovalDecision, ApprovalOut
+from app.dependencies import Principal, get_current_user
+from app.models import Approval, AgentRun, MessageDraft
+from app.pagination import PageParams, page_params, paginate
+from app.schemas import ApprovalDecision, ApprovalOut, Page
 
 router = APIRouter(prefix="/approvals", tags=["approvals"])
 
 
-@router.get("/", response_model=list[ApprovalOut])
+@router.get("/", response_model=Page[ApprovalOut])
 def list_approvals(
     status: str | None = "pending",
+    matter_id: uuid.UUID | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     q = db.query(Approval).filter(Approval.tenant_id == current_user.tenant_id)
     if status:
         q = q.filter(Approval.status == status)
-    return q.order_by(Approval.created_at.desc()).all()
+    if matter_id:
+        q = q.filter(Approval.matter_id == matter_id)
+    return paginate(q, Approval, page)
 
 
 @router.post("/{approval_id}/approve", response_model=ApprovalOut)
@@ -30,7 +36,7 @@ def approve(
     approval_id: str,
     body: ApprovalDecision,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     approval = _get_approval(approval_id, current_user, db)
     approval.status = "approved"
@@ -51,7 +57,7 @@ def reject(
     approval_id: str,
     body: ApprovalDecision,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     approval = _get_approval(approval_id, current_user, db)
     approval.status = "rejected"
@@ -68,7 +74,7 @@ def reject(
 
 # ---- helpers ---------------------------------------------------------------
 
-def _get_approval(approval_id: str, current_user: User, db: Session) -> Approval:
+def _get_approval(approval_id: str, current_user: Principal, db: Session) -> Approval:
     approval = (
         db.query(Approval)
         .filter(Approval.id == approval_id, Approval.tenant_id == current_user.tenant_id)
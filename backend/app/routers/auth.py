@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas import LoginRequest, TokenResponse
-from app.dependencies import verify_password, create_access_token
+from app.dependencies import access_token_for, verify_password
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -15,5 +15,5 @@ def login(body: LoginRequest, db: Session = Depends(get_db)):
     if not user or not verify_password(body.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials")
 
-    token = create_access_token({"sub": str(user.id), "tenant_id": str(user.tenant_id), "role": user.role})
+    token = access_token_for(user)
     return TokenResponse(access_token=token)
@@ -1,61 +1,260 @@
+import asyncio
+import mimetypes
+import re
 import uuid
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, Header, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Document, Matter, User
+from app.dependencies import Principal, get_current_user, require_role
+from app.models import Document, DocumentMetadata, Matter
+from app.routers.templates import matter_completeness
+from app.services.document_pipeline import document_pipeline
+from app.services.document_store import StoredBlob, store_blob
+from app.storage import storage_for_uri
+from app.uploads import UploadTooLarge
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 
-@router.post("/upload", status_code=201)
-def upload_document(
-    matter_id: str = Form(...),
-    kind: str = Form("other"),
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Stub upload: saves metadata + file to local disk (no S3)."""
+def _tenant_matter(db: Session, current_user: Principal, matter_id: uuid.UUID) -> Matter:
     matter = db.query(Matter).filter(Matter.id == matter_id, Matter.tenant_id == current_user.tenant_id).first()
     if not matter:
         raise HTTPException(status_code=404, detail="Matter not found")
+    return matter
 
-    file_id = uuid.uuid4()
-    storage_uri = f"local://uploads/{file_id}_{file.filename}"
-
-    # Write to local filesystem (stub)
-    import os
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    dest_path = os.path.join(settings.UPLOAD_DIR, f"{file_id}_{file.filename}")
-    with open(dest_path, "wb") as f:
-        f.write(file.file.read())
 
-    doc = Document(
+def _new_document(current_user: Principal, matter: Matter, kind: str, filename: str, stored: StoredBlob) -> Document:
+    return Document(
+        id=uuid.uuid4(),
         tenant_id=current_user.tenant_id,
         matter_id=matter.id,
         kind=kind,
-        filename=file.filename,
-        storage_uri=storage_uri,
+        filename=filename,
+        storage_uri=stored.uri,
+        size_bytes=stored.size,
+        sha256=stored.sha256,
         status="uploaded",
     )
-    db.add(doc)
-    db.commit()
-    db.refresh(doc)
+
+
+def _document_out(doc: Document, stored: StoredBlob) -> dict:
     return {
         "id": str(doc.id),
         "filename": doc.filename,
         "kind": doc.kind,
         "storage_uri": doc.storage_uri,
+        "size_bytes": doc.size_bytes,
+        "sha256": doc.sha256,
+        "deduplicated": not stored.created,
         "status": doc.status,
     }
 
 
+def _create_document(
+    db: Session, current_user: Principal, matter: Matter, kind: str, filename: str, stored: StoredBlob,
+) -> dict:
+    doc = _new_document(current_user, matter, kind, filename, stored)
+    db.add(doc)
+    db.commit()
+    db.refresh(doc)
+    return _document_out(doc, stored)
+
+
+@router.post("/upload", status_code=201)
+async def upload_document(
+    matter_id: uuid.UUID = Form(...),
+    kind: str = Form("other"),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Upload a file to the configured storage backend, stored once per content hash."""
+    matter = await run_in_threadpool(_tenant_matter, db, current_user, matter_id)
+    try:
+        stored = await store_blob(file.file)
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    result = await run_in_threadpool(_create_document, db, current_user, matter, kind, file.filename, stored)
+    # Page count, text and kind are filled in by the background pipeline
+    document_pipeline.submit(uuid.UUID(result["id"]))
+    return result
+
+
+def _create_documents(db: Session, current_user: Principal, matter: Matter, results: list[dict]) -> dict:
+    """Insert every stored file's Document in one transaction, then compute completeness once."""
+    docs = []
+    for result in results:
+        stored = result.pop("stored", None)
+        if stored:
+            doc = _new_document(current_user, matter, result["kind"], result["filename"], stored)
+            result.update(_document_out(doc, stored))
+            docs.append(doc)
+    db.add_all(docs)
+    db.commit()
+    return {
+        "matter_id": str(matter.id),
+        "uploaded": len(docs),
+        "rejected": len(results) - len(docs),
+        "documents": results,
+        "completeness": matter_completeness(db, matter).model_dump(mode="json"),
+    }
+
+
+@router.post("/upload/bulk", status_code=201)
+async def upload_documents(
+    matter_id: uuid.UUID = Form(...),
+    files: list[UploadFile] = File(...),
+    kinds: list[str] = Form([]),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Upload several files to one matter at once (e.g. a WhatsApp batch).
+
+    Files stream to storage concurrently, ``DOCUMENT_BULK_CONCURRENCY`` at a
+    time; the Documents are inserted in one commit and completeness is
+    computed once. Results are per file, in request order: a file over the
+    size limit is ``rejected`` without failing the others. ``kinds``, when
+    given, pairs a kind with each file by position.
+    """
+    if len(files) > settings.DOCUMENT_BULK_MAX_FILES:
+        raise HTTPException(status_code=422, detail=f"At most {settings.DOCUMENT_BULK_MAX_FILES} files per upload")
+    if kinds and len(kinds) != len(files):
+        raise HTTPException(status_code=422, detail="kinds must have one entry per file")
+    matter = await run_in_threadpool(_tenant_matter, db, current_user, matter_id)
+    limit = asyncio.Semaphore(settings.DOCUMENT_BULK_CONCURRENCY)
+
+    async def _store(file: UploadFile, kind: str) -> dict:
+        result = {"filename": file.filename, "kind": kind}
+        async with limit:
+            try:
+                result["stored"] = await store_blob(file.file)
+            except UploadTooLarge as exc:
+                result.update(status="rejected", error=str(exc))
+        return result
+
+    results = await asyncio.gather(*(_store(f, kinds[i] if kinds else "other") for i, f in enumerate(files)))
+    body = await run_in_threadpool(_create_documents, db, current_user, matter, list(results))
+    for result in body["documents"]:
+        if "id" in result:
+            document_pipeline.submit(uuid.UUID(result["id"]))
+    return body
+
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Inclusive (start, end) of a single-range ``Range`` header; None serves the whole file.
+
+    Multiple or malformed ranges are ignored (a 200 is always allowed);
+    an unsatisfiable range raises 416.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _get_document(db: Session, current_user: Principal, document_id: uuid.UUID) -> Document:
+    doc = db.query(Document).filter(Document.id == document_id, Document.tenant_id == current_user.tenant_id).first()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return doc
+
+
+@router.get("/{document_id}/download")
+async def download_document(
+    document_id: uuid.UUID,
+    range_header: str | None = Header(None, alias="range"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Stream a document from storage in chunks, honouring single ``Range`` requests (206)."""
+    doc = await run_in_threadpool(_get_document, db, current_user, document_id)
+    try:
+        storage, key = storage_for_uri(doc.storage_uri)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Document file not found")
+    info = await storage.stat(key)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Document file not found")
+
+    filename = doc.filename or key.rsplit("/", 1)[-1]
+    quoted = quote(filename)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": (f'attachment; filename="{filename}"' if quoted == filename
+                                else f"attachment; filename*=utf-8''{quoted}"),
+    }
+    if doc.sha256:
+        headers["ETag"] = f'"{doc.sha256}"'
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    byte_range = _byte_range(range_header, info.size)
+    if info.size == 0:
+        return Response(b"", media_type=media_type, headers=headers)
+    start, end = byte_range or (0, info.size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    return StreamingResponse(
+        storage.stream(key, start, end), status_code=206 if byte_range else 200,
+        media_type=media_type, headers=headers,
+    )
+
+
+@router.get("/processing/stats")
+def processing_stats(current_user: Principal = Depends(require_role("admin"))):
+    """Background document pipeline: queue depth, outcomes and per-stage timings."""
+    return document_pipeline.stats()
+
+
+@router.get("/{document_id}/metadata")
+def document_metadata(
+    document_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """What background processing found: type, page count, text and the suggested kind."""
+    doc = _get_document(db, current_user, document_id)
+    meta = db.get(DocumentMetadata, doc.id)
+    if meta is None:
+        return {"document_id": str(doc.id), "kind": doc.kind, "status": "pending"}
+    return {
+        "document_id": str(doc.id),
+        "kind": doc.kind,
+        "status": meta.status,
+        "attempts": meta.attempts,
+        "mime_type": meta.mime_type,
+        "page_count": meta.page_count,
+        "text": meta.text,
+        "text_chars": meta.text_chars,
+        "truncated": meta.truncated,
+        "suggested_kind": meta.suggested_kind,
+        "kind_confidence": meta.kind_confidence,
+        "thumbnail_uri": meta.thumbnail_uri,
+        "timings_ms": meta.timings_json or {},
+        "error": meta.error,
+        "processed_at": meta.processed_at.isoformat() if meta.processed_at else None,
+    }
+
+
 @router.get("/", response_model=list[dict])
-def list_documents(matter_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_documents(matter_id: str, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     docs = db.query(Document).filter(Document.matter_id == matter_id, Document.tenant_id == current_user.tenant_id).all()
     return [
         {
@@ -1,14 +1,24 @@
-"""Public event tracking endpoint with in-memory rate limiting."""
+"""Public event tracking endpoints with in-memory rate limiting.
+
+``/events/track`` writes a single event synchronously. ``/events/track/batch``
+accepts an array of events and hands them to the write-behind buffer
+(multi-row INSERTs); when the buffer is not running it inserts the whole
+batch in one statement on the request session. Unknown tenant/user ids are
+stored as NULL rather than failing the (shared) flush.
+"""
 
 import time
+import uuid
 from collections import defaultdict
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
-from app.models import Event
-from app.schemas import EventCreate, EventOut
+from app.models import Event, Tenant, User
+from app.schemas import EventBatchAccepted, EventCreate, EventOut
+from app.services.event_buffer import EventBufferFull, event_buffer, insert_events
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -30,6 +40,13 @@ def _check_rate_limit(request: Request):
     _rate_store[ip].append(now)
 
 
+def _existing_ids(db: Session, model, ids: set[uuid.UUID | None]) -> set[uuid.UUID]:
+    ids.discard(None)
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -55,3 +72,54 @@ def track_event(
     db.commit()
     db.refresh(event)
     return event
+
+
+@router.post("/track/batch", response_model=EventBatchAccepted, status_code=202)
+def track_events_batch(
+    body: list[EventCreate],
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """Public endpoint: track many analytics events in one request.
+
+    Counts as a single request against the IP rate limit.
+    Returns 503 with Retry-After when the ingestion buffer is saturated.
+    """
+    _check_rate_limit(request)
+
+    if len(body) > settings.EVENT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.EVENT_BATCH_MAX_SIZE} events)",
+        )
+    if not body:
+        return EventBatchAccepted(accepted=0, buffered=False)
+
+    tenants = _existing_ids(db, Tenant, {ev.tenant_id for ev in body})
+    users = _existing_ids(db, User, {ev.user_id for ev in body})
+    rows = [
+        {
+            "tenant_id": ev.tenant_id if ev.tenant_id in tenants else None,
+            "anonymous_id": ev.anonymous_id,
+            "user_id": ev.user_id if ev.user_id in users else None,
+            "session_id": ev.session_id,
+            "name": ev.name,
+            "properties_json": ev.properties,
+        }
+        for ev in body
+    ]
+
+    if event_buffer.running:
+        try:
+            event_buffer.submit(rows)
+        except EventBufferFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Event ingestion is saturated. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+        return EventBatchAccepted(accepted=len(rows), buffered=True)
+
+    insert_events(db, rows)
+    db.commit()
+    return EventBatchAccepted(accepted=len(rows), buffered=False)
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import Feedback, Event, User
+from app.models import Feedback, Event
 from app.schemas import FeedbackCreate, FeedbackOut
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
@@ -47,7 +47,7 @@ def list_feedback(
     page: str | None = None,
     limit: int = Query(default=50, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Authenticated: list feedback for this tenant."""
     q = db.query(Feedback)
@@ -1,11 +1,14 @@
 """Public intake endpoint – no auth required."""
 
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Intake, Tenant
-from app.schemas import IntakeCreate, IntakeOut
+from app.pagination import PageParams, page_params, paginate
+from app.schemas import IntakeCreate, IntakeOut, Page
 from app.rate_limit import limiter
 
 router = APIRouter(tags=["intakes"])
@@ -31,15 +34,19 @@ def create_public_intake(request: Request, body: IntakeCreate, db: Session = Dep
     return intake
 
 
-@router.get("/intakes/", response_model=list[IntakeOut])
+@router.get("/intakes/", response_model=Page[IntakeOut])
 def list_intakes(
-    tenant_id: str | None = None,
+    tenant_id: uuid.UUID | None = None,
+    status: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     q = db.query(Intake)
     if tenant_id:
         q = q.filter(Intake.tenant_id == tenant_id)
-    return q.order_by(Intake.created_at.desc()).all()
+    if status:
+        q = q.filter(Intake.status == status)
+    return paginate(q, Intake, page)
 
 
 @router.get("/intakes/{intake_id}", response_model=IntakeOut)
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import InterpreterRequest, Matter, User
-from app.schemas import InterpreterRequestCreate, InterpreterRequestOut
+from app.dependencies import Principal, get_current_user
+from app.models import InterpreterRequest, Matter
+from app.pagination import PageParams, page_params, paginate
+from app.schemas import InterpreterRequestCreate, InterpreterRequestOut, Page
 
 router = APIRouter(prefix="/interpreters", tags=["interpreters"])
 
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/interpreters", tags=["interpreters"])
 def create_request(
     body: InterpreterRequestCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     matter = db.query(Matter).filter(Matter.id == body.matter_id, Matter.tenant_id == current_user.tenant_id).first()
     if not matter:
@@ -34,23 +35,24 @@ def create_request(
     return req
 
 
-@router.get("/", response_model=list[InterpreterRequestOut])
+@router.get("/", response_model=Page[InterpreterRequestOut])
 def list_requests(
     matter_id: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     q = db.query(InterpreterRequest).filter(InterpreterRequest.tenant_id == current_user.tenant_id)
     if matter_id:
         q = q.filter(InterpreterRequest.matter_id == matter_id)
-    return q.order_by(InterpreterRequest.created_at.desc()).all()
+    return paginate(q, InterpreterRequest, page)
 
 
 @router.patch("/{request_id}/confirm", response_model=InterpreterRequestOut)
 def confirm_request(
     request_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     req = (
         db.query(InterpreterRequest)
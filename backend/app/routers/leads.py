@@ -1,28 +1,37 @@
 """Public lead capture + B2B onboarding + B2C Prep Kit + lead management."""
 
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user, hash_password
+from app.dependencies import Principal, get_current_user, hash_password
 from app.models import Lead, Tenant, User, Intake, Matter, Approval, AgentRun
+from app.pagination import PageParams, page_params, paginate
 from app.schemas import (
-    LeadCreate, LeadOut, PrepKitRequest, PrepKitResponse,
+    LeadCreate, LeadOut, Page, PrepKitRequest, PrepKitResponse,
     OnboardTenantRequest, OnboardTenantResponse,
 )
-from app.agents.orchestrator import AgentOrchestrator
-from app.agents.openai_llm import OpenAIProvider
+from app.agents.llm_resilience import LLMUnavailable
+from app.agents.orchestrator import get_orchestrator
 from app.agents.policy_engine import PolicyEngine
+from app.agents.policy_packs import tenant_policies
 from app.config import settings
 from app.services.lead_routing import route_lead
 from app.routers.templates import VERTICAL_TEMPLATES
 from app.rate_limit import limiter
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["leads"])
 
-orchestrator = AgentOrchestrator()
-_prepkit_llm = OpenAIProvider()
-_prepkit_policy = PolicyEngine()
+T = TypeVar("T")
+
+orchestrator = get_orchestrator()
 
 
 def _check_honeypot(body) -> None:
@@ -82,18 +91,33 @@ def create_lead(request: Request, body: LeadCreate, db: Session = Depends(get_db
     return lead
 
 
-@router.post("/public/prepkit", response_model=PrepKitResponse, status_code=201)
-@limiter.limit("5/minute")
-def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depends(get_db)):
-    """B2C Prep Kit: generate safe document checklist + questions.
-    Case packet ALWAYS goes to needs_approval.
-    Lead is auto-routed to partner tenant if routing rules exist."""
-    _check_honeypot(body)
+async def _within(call: Awaitable[T], timeout: float, fallback: Callable[[str], T], label: str) -> T:
+    """Await ``call`` for at most ``timeout`` seconds, else cancel it and use ``fallback(reason)``.
+
+    The upstream failing part-way (``LLMUnavailable`` after some chunks) also falls back.
+    """
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        logger.warning("PrepKit %s call timed out after %.1fs; using template defaults", label, timeout)
+        return fallback("timeout")
+    except LLMUnavailable:
+        logger.warning("PrepKit %s call failed upstream; using template defaults", label, exc_info=True)
+        return fallback("llm_unavailable")
+
 
-    tenant = db.query(Tenant).filter(Tenant.id == body.tenant_id).first()
+def _tenant_policy(db: Session, tenant_id) -> PolicyEngine:
+    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
+    policy = tenant_policies.for_settings(tenant.id, tenant.settings_json)
+    # End the read transaction so no pooled connection is held across the LLM calls
+    db.commit()
+    return policy
+
 
+def _store_prepkit(db: Session, body: PrepKitRequest, agent_result: dict) -> Intake:
+    """Persist intake, matter, agent run, approval and lead for a PrepKit."""
     # 1. Create intake
     intake = Intake(
         tenant_id=body.tenant_id,
@@ -129,25 +153,7 @@ def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depen
     db.add(matter)
     db.flush()
 
-    # 3. Generate structured PrepKit via GPT (or fallback)
-    prepkit_data = _prepkit_llm.generate_prepkit(
-        case_type=body.case_type,
-        description=body.description,
-        language=body.language,
-    )
-
-    # 4. Pass PrepKit output through PolicyEngine (UPL guard)
-    prepkit_data = _prepkit_policy.check_and_annotate(prepkit_data)
-
-    # 5. Run agent for internal case packet (goes to approval queue)
-    agent_result = orchestrator.run("intake_specialist", {
-        "case_type": body.case_type,
-        "description": body.description,
-        "full_name": body.full_name,
-        "language": body.language,
-    })
-
-    # 6. Store agent run as needs_approval (ALWAYS)
+    # 3. Store agent run as needs_approval (ALWAYS)
     agent_run = AgentRun(
         tenant_id=body.tenant_id,
         matter_id=matter.id,
@@ -159,7 +165,7 @@ def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depen
     db.add(agent_run)
     db.flush()
 
-    # 7. Create mandatory approval
+    # 4. Create mandatory approval
     approval = Approval(
         tenant_id=body.tenant_id,
         matter_id=matter.id,
@@ -169,7 +175,7 @@ def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depen
     )
     db.add(approval)
 
-    # 8. Create lead + route to partner
+    # 5. Create lead + route to partner
     lead = Lead(
         tenant_id=body.tenant_id,
         source_type="b2c_prepkit",
@@ -191,6 +197,54 @@ def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depen
 
     db.commit()
     db.refresh(intake)
+    return intake
+
+
+@router.post("/public/prepkit", response_model=PrepKitResponse, status_code=201)
+@limiter.limit("5/minute")
+async def generate_prepkit(request: Request, body: PrepKitRequest, db: Session = Depends(get_db)):
+    """B2C Prep Kit: generate safe document checklist + questions.
+    Case packet ALWAYS goes to needs_approval.
+    Lead is auto-routed to partner tenant if routing rules exist.
+    LLM calls are awaited on the event loop; DB work runs in the threadpool."""
+    _check_honeypot(body)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.PREPKIT_DEADLINE_SECONDS
+
+    policy = await run_in_threadpool(_tenant_policy, db, body.tenant_id)
+    remaining = max(0.0, deadline - loop.time())
+    agent_input = {
+        "case_type": body.case_type,
+        "description": body.description,
+        "full_name": body.full_name,
+        "language": body.language,
+    }
+
+    # The structured PrepKit (client-facing) and the internal case packet
+    # (goes to approval queue) are independent LLM calls: run them together
+    prepkit_data, agent_result = await asyncio.gather(
+        _within(
+            orchestrator.llm.agenerate_prepkit(
+                case_type=body.case_type,
+                description=body.description,
+                language=body.language,
+            ),
+            min(settings.PREPKIT_LLM_TIMEOUT_SECONDS, remaining),
+            lambda reason: orchestrator.llm.template_prepkit(body.case_type, body.language),
+            "prepkit",
+        ),
+        _within(
+            orchestrator.arun("intake_specialist", agent_input, policy=policy),
+            min(settings.PREPKIT_AGENT_TIMEOUT_SECONDS, remaining),
+            lambda reason: orchestrator.fallback("intake_specialist", agent_input, policy, reason),
+            "intake_specialist",
+        ),
+    )
+
+    # Pass PrepKit output through the tenant's PolicyEngine (UPL guard)
+    prepkit_data = policy.check_and_annotate(prepkit_data)
+
+    intake = await run_in_threadpool(_store_prepkit, db, body, agent_result)
 
     # Use GPT-generated checklist/questions, fall back to templates if blocked
     policy_blocked = "_policy_status" in prepkit_data
@@ -272,14 +326,15 @@ def onboard_tenant(request: Request, body: OnboardTenantRequest, db: Session = D
 # ---------------------------------------------------------------------------
 # Authenticated: lead management for tenant staff
 # ---------------------------------------------------------------------------
-@router.get("/app/leads", response_model=list[LeadOut])
+@router.get("/app/leads", response_model=Page[LeadOut])
 def list_leads(
     status: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """List leads routed to or owned by the current tenant."""
     query = db.query(Lead).filter(Lead.tenant_id == current_user.tenant_id)
     if status:
         query = query.filter(Lead.status == status)
-    return query.order_by(Lead.created_at.desc()).all()
+    return paginate(query, Lead, page)
@@ -1,26 +1,52 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Matter, Intake, User
-from app.schemas import MatterCreate, MatterOut
+from app.dependencies import Principal, get_current_user
+from app.models import Matter, Intake
+from app.pagination import PageParams, decode_keyset, encode_keyset, page_params, paginate
+from app.schemas import MatterCreate, MatterOut, Page
 
 router = APIRouter(prefix="/matters", tags=["matters"])
 
 
-@router.get("/", response_model=list[MatterOut])
-def list_matters(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return (
-        db.query(Matter)
-        .filter(Matter.tenant_id == current_user.tenant_id)
-        .order_by(Matter.urgency_score.desc(), Matter.created_at.desc())
-        .all()
-    )
+@router.get("/", response_model=Page[MatterOut])
+def list_matters(
+    sort: Literal["created", "urgency"] = "created",
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Newest first, or with ``sort=urgency`` most urgent first (oldest first within a score)."""
+    q = db.query(Matter).filter(Matter.tenant_id == current_user.tenant_id)
+    if sort == "created":
+        return paginate(q, Matter, page)
+
+    sort_key = (-func.coalesce(Matter.urgency_score, 0), Matter.created_at, Matter.id)
+    if page.cursor:
+        sort_urgency, created_at, row_id = decode_keyset(page.cursor, 3)
+        try:
+            after = (int(sort_urgency), datetime.fromisoformat(created_at), uuid.UUID(row_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.filter(tuple_(*sort_key) > tuple_(*after))
+    rows = q.order_by(*sort_key).limit(page.limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        next_cursor = encode_keyset([-(last.urgency_score or 0), last.created_at.isoformat(), str(last.id)])
+    return {"items": rows, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=MatterOut, status_code=201)
-def create_matter(body: MatterCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_matter(body: MatterCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     # If created from an intake, mark intake as converted
     if body.intake_id:
         intake = db.query(Intake).filter(Intake.id == body.intake_id).first()
@@ -43,7 +69,7 @@ def create_matter(body: MatterCreate, db: Session = Depends(get_db), current_use
 
 
 @router.get("/{matter_id}", response_model=MatterOut)
-def get_matter(matter_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_matter(matter_id: str, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     matter = db.query(Matter).filter(Matter.id == matter_id, Matter.tenant_id == current_user.tenant_id).first()
     if not matter:
         raise HTTPException(status_code=404, detail="Matter not found")
@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import MessageDraft, Approval, Matter, User
-from app.schemas import MessageDraftCreate, MessageDraftOut
+from app.dependencies import Principal, get_current_user
+from app.models import MessageDraft, Approval, Matter
+from app.pagination import PageParams, page_params, paginate
+from app.schemas import MessageDraftCreate, MessageDraftOut, Page
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/messages", tags=["messages"])
 def create_draft(
     body: MessageDraftCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Create a message draft. Always requires approval before sending."""
     matter = db.query(Matter).filter(Matter.id == body.matter_id, Matter.tenant_id == current_user.tenant_id).first()
@@ -47,25 +48,24 @@ def create_draft(
     return draft
 
 
-@router.get("/", response_model=list[MessageDraftOut])
+@router.get("/", response_model=Page[MessageDraftOut])
 def list_drafts(
     matter_id: str,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return (
-        db.query(MessageDraft)
-        .filter(MessageDraft.matter_id == matter_id, MessageDraft.tenant_id == current_user.tenant_id)
-        .order_by(MessageDraft.created_at.desc())
-        .all()
+    q = db.query(MessageDraft).filter(
+        MessageDraft.matter_id == matter_id, MessageDraft.tenant_id == current_user.tenant_id,
     )
+    return paginate(q, MessageDraft, page)
 
 
 @router.post("/{draft_id}/send")
 def send_message(
     draft_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Simulate sending. Only allowed if status == approved."""
     draft = (
@@ -3,15 +3,19 @@
 Supports both MX (9-stage) and US (7-stage) pipeline flows.
 """
 
+import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, func, literal, null, or_, select, true, tuple_, union_all
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Intake, Matter, Event, Document, Approval, AgentRun, User
-from app.schemas import PipelineView, PipelineItem, PipelineStageChange
+from app.dependencies import Principal, get_current_user
+from app.models import Intake, Matter, Event
+from app.pagination import PageParams, decode_keyset, encode_keyset, page_params
+from app.schemas import Page, PipelineView, PipelineItem, PipelineStageChange
 
 router = APIRouter(prefix="/app/pipeline", tags=["pipeline"])
 
@@ -63,77 +67,161 @@ def _next_action_for_stage(stage: str) -> str:
     }.get(stage, "")
 
 
+def _client_name(payload):
+    """COALESCE(payload->>'nombre_completo', payload->>'full_name')."""
+    return func.coalesce(payload["nombre_completo"].as_string(), payload["full_name"].as_string())
+
+
+def _board(tid, stage: str | None = None):
+    """Union of open intakes and matters projected to PipelineItem columns.
+
+    Stages outside the board fall back to new_lead (intakes) / docs_pending
+    (matters). With ``stage`` each branch filters on its own pipeline_stage
+    column so the (tenant_id, pipeline_stage, created_at) index applies.
+    The board order within a column is the ``kind, sort_urgency, created_at,
+    id`` keyset: intakes oldest first, then matters most urgent first.
+    """
+    board_stages = MX_PIPELINE_STAGES
+
+    def stage_of(column, fallback):
+        return case((column.in_(board_stages), column), else_=literal(fallback))
+
+    def stage_filter(column, fallback):
+        if stage is None:
+            return true()
+        if stage == fallback:
+            return or_(column.is_(None), column == stage, column.notin_(board_stages))
+        return column == stage
+
+    # Matters first: the union takes its column types (UUIDs) from this branch
+    matters = (
+        select(
+            literal("matter").label("entity_type"),
+            literal(1).label("kind"),
+            Matter.id.label("id"),
+            stage_of(Matter.pipeline_stage, "docs_pending").label("stage"),
+            Matter.type.label("type"),
+            _client_name(Intake.raw_payload_json).label("client_name"),
+            func.coalesce(Matter.urgency_score, 0).label("urgency_score"),
+            (-func.coalesce(Matter.urgency_score, 0)).label("sort_urgency"),
+            Matter.created_at.label("created_at"),
+            Matter.intake_id.label("intake_id"),
+            Matter.id.label("matter_id"),
+        )
+        .select_from(Matter)
+        .outerjoin(Intake, Intake.id == Matter.intake_id)
+        .where(Matter.tenant_id == tid, stage_filter(Matter.pipeline_stage, "docs_pending"))
+    )
+    intakes = select(
+        literal("intake"),
+        literal(0),
+        Intake.id,
+        stage_of(Intake.pipeline_stage, "new_lead"),
+        Intake.raw_payload_json["case_type"].as_string(),
+        _client_name(Intake.raw_payload_json),
+        literal(0),
+        literal(0),
+        Intake.created_at,
+        Intake.id,
+        null(),
+    ).where(
+        Intake.tenant_id == tid,
+        Intake.status.in_(["new", "processing"]),
+        stage_filter(Intake.pipeline_stage, "new_lead"),
+    )
+    return union_all(matters, intakes).subquery("board")
+
+
+def _sort_key(board):
+    return board.c.kind, board.c.sort_urgency, board.c.created_at, board.c.id
+
+
+def _cursor_for(row) -> str:
+    return encode_keyset([row.kind, row.sort_urgency, row.created_at.isoformat(), str(row.id)])
+
+
+def _item(row, now: datetime) -> PipelineItem:
+    return PipelineItem(
+        id=row.id,
+        entity_type=row.entity_type,
+        pipeline_stage=row.stage,
+        type=row.type,
+        client_name=row.client_name,
+        urgency_score=row.urgency_score,
+        created_at=row.created_at,
+        intake_id=row.intake_id,
+        matter_id=row.matter_id,
+        days_in_stage=(now - row.created_at).days if row.created_at else 0,
+        next_action=_next_action_for_stage(row.stage),
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # DB datetimes are naive UTC
+
+
 @router.get("/", response_model=PipelineView)
 def get_pipeline(
+    limit: int = Query(settings.PIPELINE_STAGE_LIMIT, ge=1, le=settings.PAGE_SIZE_MAX),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """Get unified Kanban pipeline view for tenant. Uses MX stages by default."""
-    tid = current_user.tenant_id
-    now = datetime.now(timezone.utc)
+    """Get unified Kanban pipeline view for tenant. Uses MX stages by default.
 
-    active_stages = MX_PIPELINE_STAGES
-    stages: dict[str, list[PipelineItem]] = {s: [] for s in active_stages}
+    One query: the first ``limit`` cards of every stage plus per-stage totals
+    (window functions over the intake/matter union). Further cards of a stage
+    come from ``GET /app/pipeline/stages/{stage}?cursor=<next_cursors[stage]>``.
+    """
+    board = _board(current_user.tenant_id)
+    ranked = select(
+        board,
+        func.row_number().over(partition_by=board.c.stage, order_by=_sort_key(board)).label("rank"),
+        func.count().over(partition_by=board.c.stage).label("stage_total"),
+    ).subquery("ranked")
+    rows = db.execute(
+        select(ranked).where(ranked.c.rank <= limit).order_by(ranked.c.stage, ranked.c.rank)
+    ).all()
 
-    # Intakes not yet converted
-    intakes = (
-        db.query(Intake)
-        .filter(Intake.tenant_id == tid, Intake.status.in_(["new", "processing"]))
-        .order_by(Intake.created_at.asc())
-        .all()
-    )
-    for intake in intakes:
-        stage = intake.pipeline_stage or "new_lead"
-        if stage not in stages:
-            stage = "new_lead"
-        payload = intake.raw_payload_json or {}
-        days = (now - intake.created_at).days if intake.created_at else 0
-        stages[stage].append(PipelineItem(
-            id=intake.id,
-            entity_type="intake",
-            pipeline_stage=stage,
-            type=payload.get("case_type"),
-            client_name=payload.get("nombre_completo") or payload.get("full_name"),
-            urgency_score=0,
-            created_at=intake.created_at,
-            intake_id=intake.id,
-            days_in_stage=days,
-            next_action=_next_action_for_stage(stage),
-        ))
-
-    # Matters
-    matters = (
-        db.query(Matter)
-        .filter(Matter.tenant_id == tid)
-        .order_by(Matter.urgency_score.desc(), Matter.created_at.asc())
-        .all()
-    )
-    for matter in matters:
-        stage = matter.pipeline_stage or "docs_pending"
-        if stage not in stages:
-            stage = "docs_pending"
-        days = (now - matter.created_at).days if matter.created_at else 0
-        client_name = None
-        if matter.intake_id:
-            intake = db.query(Intake).filter(Intake.id == matter.intake_id).first()
-            if intake and intake.raw_payload_json:
-                client_name = intake.raw_payload_json.get("nombre_completo") or intake.raw_payload_json.get("full_name")
-        stages[stage].append(PipelineItem(
-            id=matter.id,
-            entity_type="matter",
-            pipeline_stage=stage,
-            type=matter.type,
-            client_name=client_name,
-            urgency_score=matter.urgency_score,
-            created_at=matter.created_at,
-            intake_id=matter.intake_id,
-            matter_id=matter.id,
-            days_in_stage=days,
-            next_action=_next_action_for_stage(stage),
-        ))
-
-    stage_counts = {s: len(items) for s, items in stages.items()}
-    return PipelineView(stages=stages, stage_counts=stage_counts)
+    now = _utcnow()
+    stages: dict[str, list[PipelineItem]] = {s: [] for s in MX_PIPELINE_STAGES}
+    stage_counts = {s: 0 for s in MX_PIPELINE_STAGES}
+    next_cursors: dict[str, str | None] = {s: None for s in MX_PIPELINE_STAGES}
+    for row in rows:
+        stages[row.stage].append(_item(row, now))
+        stage_counts[row.stage] = row.stage_total
+        if row.rank == limit and row.stage_total > limit:
+            next_cursors[row.stage] = _cursor_for(row)
+    return PipelineView(stages=stages, stage_counts=stage_counts, next_cursors=next_cursors)
+
+
+@router.get("/stages/{stage}", response_model=Page[PipelineItem])
+def get_pipeline_stage(
+    stage: str,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Next cards of one Kanban column ("load more"), in board order."""
+    if stage not in MX_PIPELINE_STAGES:
+        raise HTTPException(status_code=400, detail=f"Invalid stage: {stage}")
+
+    board = _board(current_user.tenant_id, stage)
+    q = select(board)
+    if page.cursor:
+        kind, sort_urgency, created_at, row_id = decode_keyset(page.cursor, 4)
+        try:
+            after = (int(kind), int(sort_urgency), datetime.fromisoformat(created_at), uuid.UUID(row_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.where(tuple_(*_sort_key(board)) > tuple_(*after))
+    rows = db.execute(q.order_by(*_sort_key(board)).limit(page.limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = _cursor_for(rows[-1])
+    now = _utcnow()
+    return {"items": [_item(row, now) for row in rows], "next_cursor": next_cursor}
 
 
 @router.patch("/intake/{intake_id}/stage", response_model=PipelineItem)
@@ -141,7 +229,7 @@ def change_intake_stage(
     intake_id: str,
     body: PipelineStageChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Move an intake to a new pipeline stage."""
     if body.stage not in ALL_VALID_STAGES:
@@ -175,7 +263,7 @@ def change_intake_stage(
     db.refresh(intake)
 
     payload = intake.raw_payload_json or {}
-    now = datetime.now(timezone.utc)
+    now = _utcnow()
     return PipelineItem(
         id=intake.id,
         entity_type="intake",
@@ -194,7 +282,7 @@ def change_matter_stage(
     matter_id: str,
     body: PipelineStageChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Move a matter to a new pipeline stage."""
     if body.stage not in ALL_VALID_STAGES:
@@ -233,7 +321,7 @@ def change_matter_stage(
         if intake and intake.raw_payload_json:
             client_name = intake.raw_payload_json.get("nombre_completo") or intake.raw_payload_json.get("full_name")
 
-    now = datetime.now(timezone.utc)
+    now = _utcnow()
     return PipelineItem(
         id=matter.id,
         entity_type="matter",
@@ -2,30 +2,32 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Task, User
-from app.schemas import TaskCreate, TaskOut
+from app.dependencies import Principal, get_current_user
+from app.models import Task
+from app.pagination import PageParams, page_params, paginate
+from app.schemas import Page, TaskCreate, TaskOut
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.get("/", response_model=list[TaskOut])
+@router.get("/", response_model=Page[TaskOut])
 def list_tasks(
     matter_id: str | None = None,
     status: str | None = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     q = db.query(Task).filter(Task.tenant_id == current_user.tenant_id)
     if matter_id:
         q = q.filter(Task.matter_id == matter_id)
     if status:
         q = q.filter(Task.status == status)
-    return q.order_by(Task.due_at.asc().nullslast(), Task.created_at.desc()).all()
+    return paginate(q, Task, page)
 
 
 @router.post("/", response_model=TaskOut, status_code=201)
-def create_task(body: TaskCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_task(body: TaskCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     task = Task(
         tenant_id=current_user.tenant_id,
         matter_id=body.matter_id,
@@ -45,7 +47,7 @@ def update_task_status(
     task_id: str,
     new_status: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     task = db.query(Task).filter(Task.id == task_id, Task.tenant_id == current_user.tenant_id).first()
     if not task:
@@ -10,8 +10,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Matter, Document, Intake, Person, User
+from app.dependencies import Principal, get_current_user
+from app.models import Matter, Document, Intake, Person
 from app.schemas import VerticalTemplate, TemplateDoc, TemplateField, CompletenessResult
 
 router = APIRouter(tags=["templates"])
@@ -261,7 +261,7 @@ def list_templates():
 def get_completeness(
     matter_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Calculate document and field completeness for a matter against its vertical template."""
     matter = (
@@ -271,7 +271,11 @@ def get_completeness(
     )
     if not matter:
         raise HTTPException(status_code=404, detail="Matter not found")
+    return matter_completeness(db, matter)
 
+
+def matter_completeness(db: Session, matter: Matter) -> CompletenessResult:
+    """Document and field completeness of one matter (also returned by bulk uploads)."""
     template = VERTICAL_TEMPLATES.get(matter.type)
     if not template:
         return CompletenessResult(
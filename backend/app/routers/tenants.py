@@ -2,20 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Tenant, User
+from app.dependencies import Principal, get_current_user
+from app.models import Tenant
 from app.schemas import TenantCreate, TenantOut
 
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 
 
 @router.get("/", response_model=list[TenantOut])
-def list_tenants(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_tenants(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     return db.query(Tenant).all()
 
 
 @router.post("/", response_model=TenantOut, status_code=201)
-def create_tenant(body: TenantCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_tenant(body: TenantCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     tenant = Tenant(name=body.name, settings_json=body.settings_json)
     db.add(tenant)
     db.commit()
@@ -24,7 +24,7 @@ def create_tenant(body: TenantCreate, db: Session = Depends(get_db), current_use
 
 
 @router.get("/{tenant_id}", response_model=TenantOut)
-def get_tenant(tenant_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_tenant(tenant_id: str, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
@@ -2,11 +2,23 @@
 
 import uuid
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Generic, Optional, TypeVar
 
 from pydantic import BaseModel, EmailStr, Field
 
 
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One keyset page; pass ``next_cursor`` back as ``?cursor=`` (None = last page)."""
+    items: list[T]
+    next_cursor: str | None = None
+
+
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
@@ -183,6 +195,25 @@ class AgentRunRequest(BaseModel):
     matter_id: uuid.UUID
     agent_name: str
     input_data: dict[str, Any] = {}
+    bypass_cache: bool = False  # force a fresh LLM generation
+
+
+class AgentBatchFilter(BaseModel):
+    """Select the tenant's matters to re-process (all given conditions must hold)."""
+    type: str | None = None
+    pipeline_stage: str | None = None
+    status: str | None = None
+    jurisdiction: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+
+class AgentBatchRunRequest(BaseModel):
+    agent_name: str
+    matter_ids: list[uuid.UUID] | None = None  # either explicit ids ...
+    filter: AgentBatchFilter | None = None  # ... or a filter
+    input_data: dict[str, Any] = {}  # merged over each matter's case_type / jurisdiction
+    bypass_cache: bool = False
 
 
 class AgentRunOut(BaseModel):
@@ -289,6 +320,11 @@ class EventOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class EventBatchAccepted(BaseModel):
+    accepted: int
+    buffered: bool
+
+
 class LeadCreate(BaseModel):
     source_type: str = "b2c_prepkit"
     vertical: str | None = None
@@ -410,6 +446,8 @@ class PipelineItem(BaseModel):
 class PipelineView(BaseModel):
     stages: dict[str, list[PipelineItem]]
     stage_counts: dict[str, int]
+    # Per-stage "load more" cursor for GET /app/pipeline/stages/{stage}
+    next_cursors: dict[str, str | None] = {}
 
 
 # --- Feedback ---
@@ -480,6 +518,18 @@ class PilotKPIs(BaseModel):
     sla_breaches: int
 
 
+class JobRunOut(BaseModel):
+    id: uuid.UUID
+    job_name: str
+    status: str
+    items: int
+    duration_ms: int
+    error: str | None
+    started_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 # --- Lead Routing ---
 class LeadRoutingRule(BaseModel):
     vertical: str
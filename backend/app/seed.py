@@ -13,6 +13,7 @@ from app.database import SessionLocal, engine
 from app.models import Tenant, User, Intake, Matter, Person, Event, Lead, Experiment, Approval, AgentRun, Document, Feedback
 from app.dependencies import hash_password
 from app.services.lead_routing import add_routing_rule
+from app.services import kpi_rollup  # noqa: F401 – seeded rows feed the KPI rollups
 
 
 SEED_TENANT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
@@ -0,0 +1,261 @@
+"""Batch agent runs over many matters (POST /agents/run/batch).
+
+Each matter's run goes through ``AgentOrchestrator.run`` on a bounded
+worker pool (``AGENT_BATCH_WORKERS``), with at most two runs queued per
+worker. Results are collected on the calling thread, which owns the DB
+session. The ``AgentRun`` / ``Approval`` rows are written with multi-row
+INSERTs and one COMMIT per ``AGENT_BATCH_FLUSH_SIZE`` runs; the approvals are
+counted into the KPI rollups in the same transaction. A progress snapshot is
+yielded after every flush.
+
+A run that raises is stored as ``failed`` (no approval) and the batch goes on.
+
+The endpoint runs each batch as a ``BatchJob``: a thread with its own
+session, so the batch finishes even if the HTTP client goes away, and its
+progress stays readable from ``batch_jobs`` (this process) afterwards.
+"""
+
+import logging
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.policy_engine import PolicyEngine
+from app.config import settings
+from app.models import AgentRun, Approval, Matter
+from app.services.kpi_rollup import record_approval_rows
+
+logger = logging.getLogger(__name__)
+
+
+def agent_run_status(result: dict[str, Any]) -> str:
+    """blocked (UPL guard), needs_approval, or completed; only ``completed`` skips the Approval."""
+    if result.get("compliance_flags"):
+        return "blocked"
+    if result.get("requires_approval", True):
+        return "needs_approval"
+    return "completed"
+
+
+def matter_input(matter: Matter, input_data: dict[str, Any]) -> dict[str, Any]:
+    """Per-matter agent input: the matter's own context, overridden by the request's ``input_data``."""
+    return {"case_type": matter.type, "jurisdiction": matter.jurisdiction, **input_data}
+
+
+class AgentBatch:
+    def __init__(
+        self,
+        orchestrator: AgentOrchestrator,
+        tenant_id: uuid.UUID,
+        requested_by: uuid.UUID | None,
+        agent_name: str,
+        policy: PolicyEngine | None = None,
+        use_cache: bool = True,
+        workers: int | None = None,
+        flush_size: int | None = None,
+    ):
+        self.orchestrator = orchestrator
+        self.tenant_id = tenant_id
+        self.requested_by = requested_by
+        self.agent_name = agent_name
+        self.policy = policy
+        self.use_cache = use_cache
+        self.workers = workers or settings.AGENT_BATCH_WORKERS
+        self.flush_size = flush_size or settings.AGENT_BATCH_FLUSH_SIZE
+
+        self.total = 0
+        self.done = 0  # runs committed
+        self.counts = {"needs_approval": 0, "completed": 0, "blocked": 0, "failed": 0}
+        self.runs: list[dict[str, Any]] = []  # {matter_id, agent_run_id, status}
+        self._pending: list[tuple[dict[str, Any], dict[str, Any] | None]] = []  # (AgentRun row, Approval row)
+
+    def run(self, db: Session, matters: list[tuple[uuid.UUID, dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+        """Run the agent for each (matter_id, input_data); yields a progress dict after each flush."""
+        self.total = len(matters)
+        pending = iter(matters)
+        in_flight: dict[Future, tuple[uuid.UUID, dict[str, Any]]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agent-batch") as pool:
+            try:
+                while True:
+                    while len(in_flight) < self.workers * 2:
+                        item = next(pending, None)
+                        if item is None:
+                            break
+                        in_flight[pool.submit(self._run_one, item[1])] = item
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        matter_id, input_data = in_flight.pop(future)
+                        self._collect(matter_id, input_data, future)
+                    while len(self._pending) >= self.flush_size:
+                        self._flush(db, self.flush_size)
+                        yield self.progress()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+        if self._pending or not self.total:
+            self._flush(db, len(self._pending))
+            yield self.progress()
+
+    def progress(self) -> dict[str, Any]:
+        return {"total": self.total, "done": self.done, **self.counts}
+
+    def _run_one(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        return self.orchestrator.run(self.agent_name, input_data, policy=self.policy, use_cache=self.use_cache)
+
+    def _collect(self, matter_id: uuid.UUID, input_data: dict[str, Any], future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as exc:
+            logger.exception("Batch run of %s failed for matter %s", self.agent_name, matter_id)
+            result, status = {"error": str(exc)}, "failed"
+        else:
+            status = agent_run_status(result)
+
+        run_id = uuid.uuid4()
+        run_row = {
+            "id": run_id,
+            "tenant_id": self.tenant_id,
+            "matter_id": matter_id,
+            "agent_name": self.agent_name,
+            "input_json": input_data,
+            "output_json": result,
+            "status": status,
+        }
+        approval_row = None
+        if status in ("needs_approval", "blocked"):
+            approval_row = {
+                "id": uuid.uuid4(),
+                "tenant_id": self.tenant_id,
+                "matter_id": matter_id,
+                "object_type": "agent_run",
+                "object_id": run_id,
+                "status": "pending",
+                "requested_by": self.requested_by,
+            }
+        self._pending.append((run_row, approval_row))
+        self.counts[status] += 1
+        self.runs.append({"matter_id": matter_id, "agent_run_id": run_id, "status": status})
+
+    def _flush(self, db: Session, n: int) -> None:
+        chunk, self._pending = self._pending[:n], self._pending[n:]
+        run_rows = [run for run, _ in chunk]
+        approval_rows = [approval for _, approval in chunk if approval is not None]
+        if run_rows:
+            db.execute(insert(AgentRun), run_rows)
+        if approval_rows:
+            db.execute(insert(Approval), approval_rows)
+            record_approval_rows(db, approval_rows)
+        db.commit()
+        self.done += len(run_rows)
+
+
+class BatchJob:
+    """An ``AgentBatch`` running on its own thread and DB session."""
+
+    def __init__(
+        self,
+        batch: AgentBatch,
+        session_factory: Callable[[], Session],
+        matters: list[tuple[uuid.UUID, dict[str, Any]]],
+        not_found: list[str] | None = None,
+    ):
+        self.id = uuid.uuid4()
+        self.batch = batch
+        self.not_found = not_found or []
+        self.error: str | None = None
+        self._session_factory = session_factory
+        self._matters = matters
+        self._events: queue.Queue[dict[str, Any]] = queue.Queue()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"agent-batch-{self.id}", daemon=True)
+
+    @property
+    def tenant_id(self) -> uuid.UUID:
+        return self.batch.tenant_id
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> "BatchJob":
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def events(self) -> Iterator[dict[str, Any]]:
+        """Progress events as they happen, ending with the summary. Stopping early does not stop the batch."""
+        while True:
+            event = self._events.get()
+            yield event
+            if event["type"] == "summary":
+                return
+
+    def snapshot(self) -> dict[str, Any]:
+        """The summary once finished, else the latest progress."""
+        if self.finished:
+            return self._summary()
+        return {"type": "progress", "batch_id": str(self.id), **self.batch.progress()}
+
+    def _run(self) -> None:
+        db = self._session_factory()
+        try:
+            for progress in self.batch.run(db, self._matters):
+                self._events.put({"type": "progress", "batch_id": str(self.id), **progress})
+        except Exception as exc:
+            logger.exception("Agent batch %s stopped", self.id)
+            self.error = str(exc)
+        finally:
+            db.close()
+            self._done.set()
+            self._events.put(self._summary())
+
+    def _summary(self) -> dict[str, Any]:
+        summary = {
+            "type": "summary", "batch_id": str(self.id), **self.batch.progress(),
+            "not_found": self.not_found, "runs": self.batch.runs,
+        }
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+
+class BatchJobs:
+    """The most recent batches started by this process, for the progress endpoint."""
+
+    def __init__(self, max_entries: int = 100):
+        self.max_entries = max_entries
+        self._jobs: OrderedDict[uuid.UUID, BatchJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, job: BatchJob) -> BatchJob:
+        with self._lock:
+            self._jobs[job.id] = job
+            excess = len(self._jobs) - self.max_entries
+            if excess > 0:
+                # Forget the oldest finished batches; running ones stay visible
+                finished = [job_id for job_id, j in self._jobs.items() if j.finished]
+                for job_id in finished[:excess]:
+                    del self._jobs[job_id]
+        return job.start()
+
+    def get(self, batch_id: uuid.UUID, tenant_id: uuid.UUID) -> BatchJob | None:
+        with self._lock:
+            job = self._jobs.get(batch_id)
+        return job if job is not None and job.tenant_id == tenant_id else None
+
+
+batch_jobs = BatchJobs()
@@ -0,0 +1,55 @@
+"""Document completeness helpers shared by analytics and the reminder services.
+
+Resolves "which required template documents has each matter uploaded" for a
+whole set of matters in a single grouped query instead of one Document query
+per matter.
+"""
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models import Document, Matter
+from app.routers.templates import VERTICAL_TEMPLATES
+from app.schemas import TemplateDoc
+
+ACCEPTED_DOC_STATUSES = ("uploaded", "verified")
+
+
+def required_documents(case_type: str) -> list[TemplateDoc] | None:
+    """Required docs for a vertical, or None when the vertical has no template."""
+    template = VERTICAL_TEMPLATES.get(case_type)
+    if not template:
+        return None
+    return [d for d in template.required_documents if d.required]
+
+
+def uploaded_kinds_by_matter(db: Session, *matter_filters) -> dict:
+    """Map matter_id -> (matter type, set of uploaded/verified document kinds).
+
+    One LEFT JOIN over matters matching ``matter_filters``; matters with no
+    documents are included with an empty set.
+    """
+    rows = (
+        db.query(Matter.id, Matter.type, Document.kind)
+        .outerjoin(
+            Document,
+            and_(
+                Document.matter_id == Matter.id,
+                Document.status.in_(ACCEPTED_DOC_STATUSES),
+            ),
+        )
+        .filter(*matter_filters)
+        .distinct()
+        .all()
+    )
+    result: dict = {}
+    for matter_id, matter_type, kind in rows:
+        _, kinds = result.setdefault(matter_id, (matter_type, set()))
+        if kind is not None:
+            kinds.add(kind)
+    return result
+
+
+def missing_documents(case_type: str, uploaded_kinds: set[str]) -> list[TemplateDoc]:
+    required = required_documents(case_type) or []
+    return [d for d in required if d.key not in uploaded_kinds]
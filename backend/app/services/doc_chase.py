@@ -2,14 +2,18 @@
 
 Creates MessageDraft + Approval for document reminders.
 Does NOT send real messages — only creates drafts behind approval gate.
+Cadence state (count, last sent) lives in ``reminder_cadences``.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
 from sqlalchemy.orm import Session
 
-from app.models import Matter, Document, Approval, MessageDraft, Event, Intake
-from app.routers.templates import VERTICAL_TEMPLATES
+from app.models import Approval, Event, MessageDraft
+from app.services.reminder_cadence import find_due_reminders, record_reminder, utcnow
+
+CHANNEL = "email"
+COOLDOWN_HOURS = 24
 
 
 def check_doc_reminders(
@@ -22,56 +26,19 @@ def check_doc_reminders(
     Creates MessageDraft + Approval for each reminder.
     Returns list of created reminders.
     """
-    threshold = datetime.now(timezone.utc) - timedelta(hours=reminder_hours)
-
-    # Find matters in docs_pending stage older than threshold
-    matters = (
-        db.query(Matter)
-        .filter(
-            Matter.tenant_id == tenant_id,
-            Matter.pipeline_stage == "docs_pending",
-            Matter.created_at < threshold,
-        )
-        .all()
+    now = utcnow()
+    due = find_due_reminders(
+        db, tenant_id, CHANNEL,
+        now - timedelta(hours=reminder_hours),
+        now - timedelta(hours=COOLDOWN_HOURS),
     )
 
     results = []
-    for matter in matters:
-        template = VERTICAL_TEMPLATES.get(matter.type)
-        if not template:
-            continue
-
-        # Check which docs are missing
-        docs = db.query(Document).filter(
-            Document.matter_id == matter.id,
-            Document.status.in_(["uploaded", "verified"]),
-        ).all()
-        uploaded_kinds = {d.kind for d in docs}
-        missing = [d for d in template.required_documents if d.required and d.key not in uploaded_kinds]
-
-        if not missing:
-            continue
-
-        # Check if we already sent a reminder recently (24h)
-        recent = (
-            db.query(MessageDraft)
-            .filter(
-                MessageDraft.matter_id == matter.id,
-                MessageDraft.content.contains("[DOC REMINDER]"),
-                MessageDraft.created_at > datetime.now(timezone.utc) - timedelta(hours=24),
-            )
-            .first()
-        )
-        if recent:
-            continue
-
-        # Get client info from intake
-        client_name = "Client"
-        if matter.intake_id:
-            intake = db.query(Intake).filter(Intake.id == matter.intake_id).first()
-            if intake and intake.raw_payload_json:
-                client_name = intake.raw_payload_json.get("full_name", client_name)
+    for item in due:
+        matter, missing = item.matter, item.missing
+        client_name = item.intake_payload.get("full_name", "Client")
 
+        record_reminder(db, item, CHANNEL, now)
         missing_list = "\n".join(f"  - {d.label}" for d in missing)
         content = (
             f"[DOC REMINDER] Dear {client_name},\n\n"
@@ -84,7 +51,7 @@ def check_doc_reminders(
         draft = MessageDraft(
             tenant_id=tenant_id,
             matter_id=matter.id,
-            channel="email",
+            channel=CHANNEL,
             content=content,
             status="needs_approval",
         )
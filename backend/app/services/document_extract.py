@@ -0,0 +1,316 @@
+"""What is in an uploaded document: type, page count, text and likely kind.
+
+Pure functions over the stored bytes, used by app.services.document_pipeline.
+
+PDFs are read without third-party libraries: FlateDecode streams are
+inflated (including object streams, where modern PDFs keep their page
+tree), the page count comes from the root ``/Pages`` node, and text is
+taken from the string operands of the text-showing operators (Tj, TJ, '
+and "). Inflating shares one output budget per document, so a deflate bomb
+costs at most that much memory: parsing stops there and the result is
+marked ``truncated``. Fonts with custom encodings and no literal text (many scanned PDFs)
+yield little or no text; that is reported, not guessed at.
+
+Images need the optional ``pytesseract`` + ``Pillow`` packages for OCR
+and thumbnails; without them those results are simply absent.
+
+``classify_kind`` scores a document's filename and text against the
+``VERTICAL_TEMPLATES`` document keys of its matter's vertical.
+"""
+
+import io
+import logging
+import mimetypes
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+
+from app.config import settings
+from app.routers.templates import VERTICAL_TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+PDF = "application/pdf"
+_MAGIC = [
+    (b"%PDF-", PDF),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+]
+
+
+def sniff_mime(data: bytes, filename: str | None = None) -> str:
+    """MIME type from the leading bytes, falling back to the filename."""
+    for magic, mime in _MAGIC:
+        if data.startswith(magic):
+            return mime
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return (filename and mimetypes.guess_type(filename)[0]) or "application/octet-stream"
+
+
+# ---------------------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------------------
+
+_OBJECT = re.compile(rb"\d+\s+\d+\s+obj\b(.*?)\bendobj", re.S)
+_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\n?endstream", re.S)
+_PAGES_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b", re.S)
+_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_IMAGE = re.compile(rb"/Subtype\s*/Image\b")
+
+# Inflated bytes allowed per character of DOCUMENT_PIPELINE_MAX_TEXT_CHARS:
+# content streams are mostly operators and positioning around the text
+INFLATE_BYTES_PER_TEXT_CHAR = 50
+
+
+@dataclass
+class PdfParts:
+    dicts: list[bytes] = field(default_factory=list)  # object dictionaries, object streams expanded
+    streams: list[bytes] = field(default_factory=list)  # decoded content streams
+    truncated: bool = False  # the inflate budget ran out; later objects were not read
+
+
+def pdf_parts(data: bytes, max_inflated: int | None = None) -> PdfParts:
+    """Object dictionaries and decoded streams, inflating at most ``max_inflated`` bytes in total."""
+    if max_inflated is None:
+        max_inflated = settings.DOCUMENT_PIPELINE_MAX_TEXT_CHARS * INFLATE_BYTES_PER_TEXT_CHAR
+    parts, budget = PdfParts(), max_inflated
+    for obj in _OBJECT.finditer(data):
+        body = obj.group(1)
+        stream = _STREAM.search(body)
+        if not stream:
+            parts.dicts.append(body)
+            continue
+        header = body[:stream.start()]
+        parts.dicts.append(header)
+        if _IMAGE.search(header):
+            continue  # image XObjects carry no text, however they are encoded
+        raw = stream.group(1)
+        if b"/FlateDecode" in header:
+            if budget <= 0:  # max_length=0 would mean "no limit"
+                parts.truncated = True
+                break
+            inflater = zlib.decompressobj()
+            try:
+                raw = inflater.decompress(raw, budget)
+            except zlib.error:
+                continue
+            budget -= len(raw)
+            if inflater.unconsumed_tail:
+                parts.truncated = True
+                break
+        elif b"/Filter" in header:
+            continue  # DCT, JBIG2 and other encodings carry no text
+        if b"/ObjStm" in header:
+            parts.dicts.append(raw)
+        else:
+            parts.streams.append(raw)
+    return parts
+
+
+def _parts(data: bytes | PdfParts) -> PdfParts:
+    return data if isinstance(data, PdfParts) else pdf_parts(data)
+
+
+def pdf_page_count(data: bytes | PdfParts) -> int | None:
+    dicts = _parts(data).dicts
+    counts = [int(a or b) for d in dicts for a, b in _PAGES_COUNT.findall(d)]
+    if counts:
+        return max(counts)  # the root of the page tree counts every page
+    pages = sum(len(_PAGE.findall(d)) for d in dicts)
+    return pages or None
+
+
+_TOKEN = re.compile(
+    rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)"  # literal string (one level of nested parens)
+    rb"|<[0-9A-Fa-f\s]*>"                           # hex string
+    rb"|-?\d*\.?\d+"                                # number
+    rb"|[\[\]]"
+    rb"|[A-Za-z'\"*]+",
+    re.S,
+)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_NEWLINE_OPS = {b"Td", b"TD", b"T*", b"Tm", b"ET", b"'", b'"'}
+
+
+def _literal(token: bytes) -> str:
+    def unescape(m):
+        esc = m.group(1)
+        if esc[:1].isdigit():
+            return bytes([int(esc, 8) & 0xFF])
+        if esc in (b"\n", b"\r\n", b"\r"):
+            return b""
+        return _ESCAPES.get(esc, esc)
+
+    raw = re.sub(rb"\\([0-7]{1,3}|\r\n|.)", unescape, token[1:-1], flags=re.S)
+    return _decode(raw)
+
+
+def _hex(token: bytes) -> str:
+    digits = re.sub(rb"\s", b"", token[1:-1])
+    if len(digits) % 2:
+        digits += b"0"
+    return _decode(bytes.fromhex(digits.decode()))
+
+
+def _decode(raw: bytes) -> str:
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", "ignore")
+    return raw.decode("latin-1")
+
+
+def pdf_text(data: bytes | PdfParts) -> str:
+    lines: list[str] = []
+    for stream in _parts(data).streams:
+        if b"BT" not in stream:
+            continue
+        line: list[str] = []
+        pending: list[str] = []
+        in_array = False
+        for token in _TOKEN.findall(stream):
+            if token[:1] == b"(":
+                pending.append(_literal(token))
+            elif token[:1] == b"<":
+                pending.append(_hex(token))
+            elif token == b"[":
+                in_array, pending = True, []
+            elif token == b"]":
+                in_array = False
+            elif token[:1].isdigit() or token[:1] in b"-.":
+                if in_array and float(token) < -200:
+                    pending.append(" ")  # a wide kerning gap is a word break
+            else:
+                if token in (b"Tj", b"TJ", b"'", b'"'):
+                    line.extend(pending)
+                if token in _NEWLINE_OPS and line:
+                    lines.append("".join(line))
+                    line = []
+                pending = []
+        if line:
+            lines.append("".join(line))
+    text = "\n".join(lines)
+    return "".join(ch for ch in text if ch.isprintable() or ch == "\n").strip()
+
+
+# ---------------------------------------------------------------------------
+# Images (optional pytesseract / Pillow)
+# ---------------------------------------------------------------------------
+
+def image_text(data: bytes, languages: str = "spa+eng") -> str | None:
+    """OCR text of an image, or None when OCR is not available here."""
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        return pytesseract.image_to_string(Image.open(io.BytesIO(data)), lang=languages).strip()
+    except pytesseract.TesseractNotFoundError:
+        return None
+
+
+def image_page_count(data: bytes) -> int:
+    try:
+        from PIL import Image
+    except ImportError:
+        return 1
+    try:
+        return getattr(Image.open(io.BytesIO(data)), "n_frames", 1)  # multi-page TIFF
+    except Exception:
+        return 1
+
+
+def image_thumbnail(data: bytes, size: int) -> bytes | None:
+    """JPEG thumbnail no larger than ``size`` px on a side, or None without Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail((size, size))
+    out = io.BytesIO()
+    image.convert("RGB").save(out, "JPEG", quality=80)
+    return out.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Kind classification
+# ---------------------------------------------------------------------------
+
+# Phrases (accent-free, lower case) that identify a template document beyond its key's own words
+KIND_HINTS: dict[str, list[str]] = {
+    "acta_matrimonio": ["acta de matrimonio", "contrayentes"],
+    "ine_pasaporte": ["instituto nacional electoral", "credencial para votar", "pasaporte", "passport"],
+    "curp": ["clave unica de registro de poblacion"],
+    "comprobante_domicilio": ["comprobante de domicilio", "comision federal de electricidad", "cfe",
+                              "telmex", "recibo de luz", "predial"],
+    "actas_hijos": ["acta de nacimiento"],
+    "convenio_propuesta": ["guarda y custodia", "pension alimenticia"],
+    "regimen_patrimonial": ["sociedad conyugal", "separacion de bienes"],
+    "comprobante_compra": ["factura", "cfdi", "comprobante de compra", "ticket de compra"],
+    "evidencia_problema": ["captura de pantalla", "fotografia"],
+    "comunicaciones": ["correo electronico", "asunto"],
+    "folio_queja": ["profeco", "condusef", "folio de queja"],
+    "contrato_laboral": ["contrato individual de trabajo", "relacion de trabajo"],
+    "recibos_nomina": ["recibo de nomina", "percepciones", "deducciones"],
+    "carta_despido": ["renuncia", "terminacion de la relacion laboral"],
+    "alta_imss": ["instituto mexicano del seguro social", "numero de seguridad social"],
+    "government_id": ["passport", "driver license", "identification card", "national id"],
+    "immigration_notice": ["notice to appear", "request for evidence", "department of homeland security"],
+    "prior_filings": ["receipt notice", "i-797"],
+    "proof_of_address": ["utility bill", "lease agreement", "service address"],
+    "employment_auth": ["employment authorization", "i-766"],
+    "irs_notice": ["internal revenue service", "cp2000", "cp504"],
+    "w2_1099": ["w-2", "wage and tax statement", "1099"],
+    "prior_returns": ["form 1040", "individual income tax return"],
+    "income_proof": ["pay stub", "bank statement", "earnings statement"],
+    "tin_docs": ["social security", "itin", "taxpayer identification number"],
+}
+HINT_WEIGHT = 2  # a curated phrase counts double a word of the key itself
+
+
+@dataclass(frozen=True)
+class KindGuess:
+    kind: str | None
+    confidence: float
+    scores: dict[str, int]
+
+
+def normalize(text: str) -> str:
+    """Lower case, accents stripped, separators as spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[_\s.]+", " ", text)
+
+
+def _has(haystack: str, phrase: str) -> bool:
+    return re.search(rf"(?<![a-z0-9]){re.escape(phrase)}(?![a-z0-9])", haystack) is not None
+
+
+def template_kinds(case_type: str | None) -> list[str]:
+    """Document keys of a vertical; every template's keys when the vertical is unknown."""
+    template = VERTICAL_TEMPLATES.get(case_type or "")
+    templates = [template] if template else VERTICAL_TEMPLATES.values()
+    return list(dict.fromkeys(d.key for t in templates for d in t.required_documents))
+
+
+def classify_kind(case_type: str | None, filename: str | None, text: str | None) -> KindGuess:
+    """Most likely template document key for a document, with a 0..1 confidence."""
+    haystack = normalize(f"{filename or ''}\n{text or ''}")
+    scores = {}
+    for kind in template_kinds(case_type):
+        words = [w for w in kind.split("_") if len(w) >= 3]
+        score = sum(1 for w in words if _has(haystack, w))
+        score += HINT_WEIGHT * sum(1 for phrase in KIND_HINTS.get(kind, []) if _has(haystack, phrase))
+        if score:
+            scores[kind] = score
+    if not scores:
+        return KindGuess(None, 0.0, {})
+    ranked = sorted(scores.values(), reverse=True)
+    best, runner_up = ranked[0], (ranked[1] if len(ranked) > 1 else 0)
+    kind = max(scores, key=scores.get)
+    return KindGuess(kind, round(best / (best + runner_up + 1), 3), scores)
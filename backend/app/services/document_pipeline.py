@@ -0,0 +1,417 @@
+"""Background processing of uploaded documents.
+
+The router submits each uploaded document to the process-wide
+``document_pipeline``, whose workers fill its ``DocumentMetadata`` row (MIME
+type, pages, text, thumbnail, suggested kind). A periodic sweep picks up
+documents the queue missed, and rows are claimed so several API processes can
+run the pipeline side by side.
+"""
+
+import asyncio
+import functools
+import hashlib
+import io
+import logging
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Document, DocumentMetadata, Matter
+from app.services import document_extract as extract
+from app.services.reminder_cadence import utcnow
+from app.storage import get_storage, storage_for_uri
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("load", "fetch", "detect", "pages", "text", "thumbnail", "classify", "store")
+
+
+@dataclass(frozen=True)
+class _Job:
+    document_id: uuid.UUID
+    tenant_id: uuid.UUID
+    case_type: str | None
+    filename: str | None
+    storage_uri: str | None
+    size_bytes: int | None
+    sha256: str | None
+    done: bool  # results exist for this content already, or another worker has claimed it
+    reuse: dict | None  # extraction results of another document with the same content
+
+
+class DocumentPipeline:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+        sweep_seconds: float | None = None,
+        claim_seconds: float | None = None,
+    ):
+        self._session_factory = session_factory
+        self.workers = workers or settings.DOCUMENT_PIPELINE_WORKERS
+        self.queue_size = queue_size or settings.DOCUMENT_PIPELINE_QUEUE_SIZE
+        self.max_attempts = max_attempts or settings.DOCUMENT_PIPELINE_MAX_ATTEMPTS
+        self.retry_base_seconds = (settings.DOCUMENT_PIPELINE_RETRY_BASE_SECONDS
+                                   if retry_base_seconds is None else retry_base_seconds)
+        self.sweep_seconds = sweep_seconds or settings.DOCUMENT_PIPELINE_SWEEP_SECONDS
+        self.claim_seconds = claim_seconds or settings.DOCUMENT_PIPELINE_CLAIM_SECONDS
+
+        self._queue: asyncio.Queue | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._retries: dict[uuid.UUID, asyncio.TimerHandle] = {}
+        self._queued: set[uuid.UUID] = set()  # queued, in flight or awaiting a retry
+
+        self.counts: Counter = Counter()
+        self._stage_ms: dict[str, list[float]] = {}  # stage -> [count, total, max]
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="document-pipeline")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_forever()))
+
+    async def stop(self) -> None:
+        """Stop the workers; unfinished documents are swept again once their claim expires."""
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queued.clear()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def drain(self) -> None:
+        """Wait until every queued document (not scheduled retries) is processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    # ---- producer side -----------------------------------------------------
+
+    def submit(self, document_id: uuid.UUID) -> bool:
+        """Queue a document from the event loop; False when it will be left to the sweep."""
+        if not self.running:
+            return False
+        if document_id in self._queued:
+            return True
+        try:
+            self._queue.put_nowait(document_id)
+        except asyncio.QueueFull:
+            self.counts["deferred"] += 1
+            return False
+        self._queued.add(document_id)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "retrying": len(self._retries),
+            **{k: self.counts[k] for k in ("processed", "skipped", "reused", "retried", "failed", "deferred")},
+            "stages": {
+                stage: {"count": int(n), "avg_ms": round(total / n, 2), "max_ms": round(peak, 2)}
+                for stage in STAGES if stage in self._stage_ms
+                for n, total, peak in [self._stage_ms[stage]]
+            },
+        }
+
+    # ---- consumer side -----------------------------------------------------
+
+    async def _worker(self) -> None:
+        while True:
+            document_id = await self._queue.get()
+            try:
+                await self.process(document_id)
+            except Exception as exc:
+                logger.warning("Processing document %s failed", document_id, exc_info=True)
+                await self._failed(document_id, exc)
+            finally:
+                if document_id not in self._retries:
+                    self._queued.discard(document_id)
+                self._queue.task_done()
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            try:
+                await self._sweep()
+            except Exception:
+                logger.exception("Document pipeline sweep failed")
+            await asyncio.sleep(self.sweep_seconds)
+
+    async def _sweep(self) -> None:
+        after = None
+        while ids := await self._sync(self._unprocessed, after):
+            for document_id in ids:
+                if document_id not in self._queued:
+                    self._queued.add(document_id)
+                    await self._queue.put(document_id)  # waits for room: backpressure, not drops
+            after = ids[-1]
+
+    async def _failed(self, document_id: uuid.UUID, exc: Exception) -> None:
+        attempts = await self._sync(self._record_failure, document_id, f"{type(exc).__name__}: {exc}")
+        if attempts is None:  # deleted, or done by another worker
+            return
+        if attempts >= self.max_attempts:
+            self.counts["failed"] += 1
+            return
+        self.counts["retried"] += 1
+        delay = self.retry_base_seconds * 2 ** (attempts - 1)
+        self._retries[document_id] = asyncio.get_running_loop().call_later(delay, self._retry, document_id)
+
+    def _retry(self, document_id: uuid.UUID) -> None:
+        self._retries.pop(document_id, None)
+        self._queued.discard(document_id)
+        self.submit(document_id)  # with the queue full, the sweep picks it up
+
+    # ---- processing --------------------------------------------------------
+
+    async def process(self, document_id: uuid.UUID) -> DocumentMetadata | None:
+        """Run every stage for one document; None if it no longer exists, is done or is claimed elsewhere."""
+        timings: dict[str, float] = {}
+        with self._timed(timings, "load"):
+            job = await self._sync(self._load, document_id)
+        if job is None:
+            return None
+        if job.done:
+            self.counts["skipped"] += 1
+            return None
+
+        if job.reuse:
+            self.counts["reused"] += 1
+            found = dict(job.reuse)
+        else:
+            found = await self._extract(job, timings)
+
+        with self._timed(timings, "classify"):
+            guess = extract.classify_kind(job.case_type, job.filename, found.get("text"))
+        with self._timed(timings, "store"):
+            meta = await self._sync(self._store, job, found, guess, timings)
+        self.counts["processed"] += 1
+        return meta
+
+    async def _extract(self, job: _Job, timings: dict[str, float]) -> dict:
+        storage, key = storage_for_uri(job.storage_uri or "")
+        oversized = (job.size_bytes or 0) > settings.DOCUMENT_PIPELINE_MAX_BYTES
+        with self._timed(timings, "fetch"):
+            if oversized:  # type detection only
+                data = b"".join([chunk async for chunk in storage.stream(key, 0, 1023)])
+            else:
+                data = await storage.get(key)
+        with self._timed(timings, "detect"):
+            mime = extract.sniff_mime(data, job.filename)
+        found = {"mime_type": mime, "page_count": None, "text": None, "thumbnail_uri": None, "truncated": False}
+        if oversized:
+            return found
+
+        is_image = mime.startswith("image/")
+        pdf = None
+        with self._timed(timings, "pages"):
+            if mime == extract.PDF:
+                pdf = await self._sync(extract.pdf_parts, data)  # parsed once, for pages and text
+                found["page_count"] = extract.pdf_page_count(pdf)
+                found["truncated"] = pdf.truncated
+            elif is_image:
+                found["page_count"] = await self._sync(extract.image_page_count, data)
+        with self._timed(timings, "text"):
+            if pdf is not None:
+                found["text"] = await self._sync(extract.pdf_text, pdf)
+            elif is_image:
+                found["text"] = await self._sync(extract.image_text, data)
+        if is_image:
+            with self._timed(timings, "thumbnail"):
+                thumb = await self._sync(extract.image_thumbnail, data, settings.DOCUMENT_THUMBNAIL_PX)
+                if thumb:
+                    found["thumbnail_uri"] = await self._put_thumbnail(job, thumb)
+        return found
+
+    @staticmethod
+    async def _put_thumbnail(job: _Job, thumb: bytes) -> str:
+        storage = get_storage()
+        name = job.sha256 or hashlib.sha256(thumb).hexdigest()
+        key = f"thumbnails/{name[:2]}/{name[2:4]}/{name}.jpg"
+        await storage.put(key, io.BytesIO(thumb), len(thumb), hashlib.sha256(thumb).hexdigest())
+        return storage.uri(key)
+
+    async def _sync(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args))
+
+    @contextmanager
+    def _timed(self, timings: dict[str, float], stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            timings[stage] = round(ms, 2)
+            agg = self._stage_ms.setdefault(stage, [0, 0.0, 0.0])
+            agg[0] += 1
+            agg[1] += ms
+            agg[2] = max(agg[2], ms)
+
+    # ---- database (executor threads) ---------------------------------------
+
+    def _load(self, document_id: uuid.UUID) -> _Job | None:
+        db = self._session_factory()
+        try:
+            doc = db.get(Document, document_id)
+            if doc is None:
+                return None
+            case_type = db.query(Matter.type).filter(Matter.id == doc.matter_id).scalar()
+            meta = db.get(DocumentMetadata, document_id)
+            done = meta is not None and meta.status == "done" and meta.sha256 == doc.sha256
+            if not done:
+                done = not self._claim(db, doc, meta)
+            reuse = None
+            if not done and doc.sha256:
+                prior = (
+                    db.query(DocumentMetadata)
+                    .filter(DocumentMetadata.sha256 == doc.sha256, DocumentMetadata.status == "done",
+                            DocumentMetadata.document_id != document_id)
+                    .first()
+                )
+                if prior:
+                    reuse = {"mime_type": prior.mime_type, "page_count": prior.page_count,
+                             "text": prior.text, "text_chars": prior.text_chars,
+                             "thumbnail_uri": prior.thumbnail_uri, "truncated": prior.truncated}
+            return _Job(doc.id, doc.tenant_id, case_type, doc.filename, doc.storage_uri,
+                        doc.size_bytes, doc.sha256, done, reuse)
+        finally:
+            db.close()
+
+    def _claim(self, db: Session, doc: Document, meta: DocumentMetadata | None) -> bool:
+        """Move the document's row to ``processing``; False if another worker got there first."""
+        now = utcnow()
+        if meta is None:
+            db.add(DocumentMetadata(document_id=doc.id, tenant_id=doc.tenant_id, status="processing",
+                                    claimed_at=now, attempts=0))
+            try:
+                db.commit()
+            except IntegrityError:  # inserted by another worker
+                db.rollback()
+                return False
+            return True
+        stale = now - timedelta(seconds=self.claim_seconds)
+        claimed = (
+            db.query(DocumentMetadata)
+            .filter(DocumentMetadata.document_id == doc.id, DocumentMetadata.status == meta.status,
+                    or_(DocumentMetadata.status != "processing", DocumentMetadata.claimed_at < stale))
+            .update({"status": "processing", "claimed_at": now}, synchronize_session=False)
+        )
+        db.commit()
+        return claimed == 1
+
+    def _store(self, job: _Job, found: dict, guess: extract.KindGuess, timings: dict) -> DocumentMetadata | None:
+        db = self._session_factory()
+        try:
+            doc = db.get(Document, job.document_id)
+            if doc is None:
+                return None
+            meta = db.get(DocumentMetadata, job.document_id)  # created by the claim
+            if meta is None:
+                return None
+            text = found.get("text")
+            max_chars = settings.DOCUMENT_PIPELINE_MAX_TEXT_CHARS
+            meta.sha256 = job.sha256
+            meta.status = "done"
+            meta.attempts = (meta.attempts or 0) + 1
+            meta.mime_type = found.get("mime_type")
+            meta.page_count = found.get("page_count")
+            meta.text = text[:max_chars] if text is not None else None
+            meta.text_chars = found.get("text_chars", len(text) if text is not None else None)
+            meta.truncated = bool(found.get("truncated"))
+            meta.thumbnail_uri = found.get("thumbnail_uri")
+            meta.suggested_kind = guess.kind
+            meta.kind_confidence = guess.confidence
+            meta.timings_json = timings
+            meta.error = None
+            meta.processed_at = utcnow()
+            meta.claimed_at = None
+            # Only replace a kind outside the vertical's document keys (e.g. the default "other")
+            if (
+                guess.kind
+                and guess.confidence >= settings.DOCUMENT_PIPELINE_MIN_KIND_CONFIDENCE
+                and doc.kind not in extract.template_kinds(job.case_type)
+            ):
+                doc.kind = guess.kind
+            db.commit()
+            db.refresh(meta)
+            db.expunge(meta)
+            return meta
+        finally:
+            db.close()
+
+    def _record_failure(self, document_id: uuid.UUID, error: str) -> int | None:
+        db = self._session_factory()
+        try:
+            doc = db.get(Document, document_id)
+            if doc is None:
+                return None
+            meta = db.get(DocumentMetadata, document_id) or DocumentMetadata(
+                document_id=document_id, tenant_id=doc.tenant_id, attempts=0,
+            )
+            if meta.status == "done":
+                return None
+            meta.attempts = (meta.attempts or 0) + 1
+            meta.status = "failed" if meta.attempts >= self.max_attempts else "pending"
+            meta.claimed_at = None
+            meta.error = error[:2000]
+            db.add(meta)
+            try:
+                db.commit()
+            except IntegrityError:  # the row was inserted by another worker's claim meanwhile
+                db.rollback()
+                return None
+            return meta.attempts
+        finally:
+            db.close()
+
+    def _unprocessed(self, after: uuid.UUID | None = None) -> list[uuid.UUID]:
+        """Next page (by id) of documents with no results yet, pending results or an expired claim."""
+        stale = utcnow() - timedelta(seconds=self.claim_seconds)
+        db = self._session_factory()
+        try:
+            query = (
+                db.query(Document.id)
+                .outerjoin(DocumentMetadata, DocumentMetadata.document_id == Document.id)
+                .filter(or_(
+                    DocumentMetadata.document_id.is_(None),
+                    DocumentMetadata.status == "pending",
+                    and_(DocumentMetadata.status == "processing", DocumentMetadata.claimed_at < stale),
+                ))
+            )
+            if after is not None:
+                query = query.filter(Document.id > after)
+            return [row[0] for row in query.order_by(Document.id).limit(self.queue_size).all()]
+        finally:
+            db.close()
+
+
+# Process-wide pipeline; started/stopped from the app.main lifespan
+document_pipeline = DocumentPipeline()
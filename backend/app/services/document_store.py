@@ -0,0 +1,315 @@
+"""Content-addressed document storage with reference counting.
+
+Uploaded bytes are stored once per SHA-256 (``blobs/ab/cd/<sha256>`` in
+app.storage) and shared by every Document with that content. Session flush
+hooks keep ``document_blobs.ref_count`` in step, and garbage collection deletes
+blobs nobody references: ``python -m app.services.document_store gc``.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Document, DocumentBlob
+from app.storage import LOCAL_URI_PREFIX, LocalStorage, ObjectInfo, get_storage
+from app.uploads import UploadTooLarge, hash_stream, write_stream
+
+logger = logging.getLogger(__name__)
+
+BLOB_KEY_PREFIX = "blobs/"
+_BLOB_URI = re.compile(r"^[a-z0-9]+://[^/]+/blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})$")
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    uri: str
+    sha256: str
+    size: int
+    created: bool  # False when the content was already stored
+
+
+def blob_key(sha256: str) -> str:
+    return f"{BLOB_KEY_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def blob_sha256(uri: str | None) -> str | None:
+    """The content hash a blob URI points at (None for any other URI)."""
+    match = _BLOB_URI.match(uri or "")
+    return match.group(1) if match else None
+
+
+async def store_blob(
+    source: BinaryIO, storage=None, max_bytes: int | None = None, chunk_size: int | None = None,
+) -> StoredBlob:
+    """Store ``source`` by content; existing content is only hashed, never rewritten."""
+    storage = storage or get_storage()
+    if not source.seekable():
+        # The key (and S3's signed Content-Length) must be known before writing: spool first
+        with tempfile.TemporaryFile() as spool:
+            await run_in_threadpool(_spool, source, spool, max_bytes, chunk_size)
+            return await store_blob(spool, storage, max_bytes, chunk_size)
+
+    start = await run_in_threadpool(source.tell)
+    digest, size = await run_in_threadpool(hash_stream, source, max_bytes, chunk_size)
+    key = blob_key(digest)
+    # Refresh the modified time of existing content so a concurrent GC pass keeps it
+    if await storage.touch(key):
+        return StoredBlob(storage.uri(key), digest, size, created=False)
+    await run_in_threadpool(source.seek, start)
+    await storage.put(key, source, size, digest)
+    return StoredBlob(storage.uri(key), digest, size, created=True)
+
+
+def _spool(source: BinaryIO, spool: BinaryIO, max_bytes: int | None, chunk_size: int | None) -> None:
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+    size = 0
+    while chunk := source.read(chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        spool.write(chunk)
+    spool.seek(0)
+
+
+# ---------------------------------------------------------------------------
+# Reference counting (session flush hooks)
+# ---------------------------------------------------------------------------
+
+class _RefDelta:
+    def __init__(self):
+        self.refs: Counter = Counter()
+        self.sizes: dict[str, int] = {}
+
+    def add(self, uri: str | None, size: int | None, n: int) -> None:
+        sha256 = blob_sha256(uri)
+        if sha256:
+            self.refs[sha256] += n
+            if size is not None:
+                self.sizes[sha256] = size
+
+    def __bool__(self):
+        return any(self.refs.values())
+
+
+def _collect(session: Session) -> _RefDelta:
+    delta = _RefDelta()
+    for obj in session.new:
+        if isinstance(obj, Document):
+            delta.add(obj.storage_uri, obj.size_bytes, 1)
+    for obj in session.deleted:
+        if isinstance(obj, Document):
+            hist = inspect(obj).attrs.storage_uri.history
+            delta.add(hist.deleted[0] if hist.deleted else obj.storage_uri, None, -1)
+    for obj in session.dirty:
+        if isinstance(obj, Document):
+            hist = inspect(obj).attrs.storage_uri.history
+            if not hist.added:
+                continue
+            if hist.deleted:
+                delta.add(hist.deleted[0], None, -1)
+            delta.add(hist.added[0], obj.size_bytes, 1)
+    return delta
+
+
+def _insert_for(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Blob reference counts need INSERT .. ON CONFLICT (got {dialect_name})")
+
+
+def _apply(connection, delta: _RefDelta) -> None:
+    insert = _insert_for(connection.dialect.name)
+    blobs = DocumentBlob.__table__
+    for sha256, n in delta.refs.items():
+        if not n:
+            continue
+        stmt = insert(blobs).values(sha256=sha256, size_bytes=delta.sizes.get(sha256, 0), ref_count=n)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[blobs.c.sha256],
+            set_={"ref_count": blobs.c.ref_count + stmt.excluded.ref_count},
+        )
+        connection.execute(stmt)
+
+
+# Load the previous URI when it is reassigned on an expired instance
+@event.listens_for(Document.storage_uri, "set", active_history=True)
+def _track_previous_uri(target, value, oldvalue, initiator):
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _refs_before_flush(session: Session, flush_context, instances) -> None:
+    delta = _collect(session)
+    if delta:
+        session.info["document_blob_delta"] = delta
+
+
+@event.listens_for(Session, "after_flush")
+def _refs_after_flush(session: Session, flush_context) -> None:
+    delta = session.info.pop("document_blob_delta", None)
+    if delta:
+        _apply(session.connection(), delta)
+
+
+# ---------------------------------------------------------------------------
+# Garbage collection and migration
+# ---------------------------------------------------------------------------
+
+async def collect_garbage(
+    db: Session, storage=None, grace_seconds: float | None = None, dry_run: bool = False,
+) -> dict:
+    """Fix reference counts from ``documents`` and delete unreferenced blobs (rows and objects)."""
+    storage = storage or get_storage()
+    grace = settings.DOCUMENT_BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = time.time() - grace
+    stats = Counter()
+
+    actual = dict(
+        db.query(Document.sha256, func.count())
+        .filter(Document.storage_uri.like(f"%/{BLOB_KEY_PREFIX}%"))
+        .group_by(Document.sha256)
+        .all()
+    )
+    known = set()
+    for blob in db.query(DocumentBlob).all():
+        known.add(blob.sha256)
+        refs = actual.get(blob.sha256, 0)
+        if blob.ref_count != refs:
+            stats["refcounts_fixed"] += 1
+            blob.ref_count = refs
+        if refs == 0:
+            info = await storage.stat(blob_key(blob.sha256))
+            # A row without an object is still dropped
+            if info is None or await _delete_object(storage, info, cutoff, dry_run, stats):
+                stats["blobs_deleted"] += 1
+                if not dry_run:
+                    db.delete(blob)
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+    # Objects with no row: written by an upload whose transaction never committed
+    async for info in storage.list_objects(BLOB_KEY_PREFIX):
+        name = info.key.rsplit("/", 1)[-1]
+        if name not in known and name not in actual:
+            if await _delete_object(storage, info, cutoff, dry_run, stats):
+                stats["orphans_deleted"] += 1
+    return dict(stats)
+
+
+async def _delete_object(storage, info: ObjectInfo, cutoff: float, dry_run: bool, stats: Counter) -> bool:
+    if info.modified > cutoff:
+        return False
+    if not dry_run:
+        await storage.delete(info.key)
+    stats["bytes_freed"] += info.size
+    return True
+
+
+async def migrate_legacy_uploads(db: Session, storage=None, batch_size: int = 200) -> dict:
+    """Move ``local://uploads/<uuid>_<name>`` files into the blob store and repoint their Documents.
+
+    With the local backend, legacy files are hard-linked into place when
+    possible (no copy). They are removed only after the batch that repoints
+    them has committed.
+    """
+    storage = storage or get_storage()
+    legacy = LocalStorage()
+    stats = Counter()
+    last_id = None
+    while True:
+        query = db.query(Document).filter(
+            Document.storage_uri.like(LOCAL_URI_PREFIX + "%"),
+            ~Document.storage_uri.like(LOCAL_URI_PREFIX + BLOB_KEY_PREFIX + "%"),
+        )
+        if last_id is not None:
+            query = query.filter(Document.id > last_id)
+        docs = query.order_by(Document.id).limit(batch_size).all()
+        if not docs:
+            break
+        last_id = docs[-1].id
+
+        moved = []
+        for doc in docs:
+            try:
+                path = legacy.local_path(legacy.key(doc.storage_uri))
+                with open(path, "rb") as f:
+                    digest, size = hash_stream(f, max_bytes=1 << 62)
+            except (OSError, ValueError):
+                logger.warning("Legacy upload for document %s not found: %s", doc.id, doc.storage_uri)
+                stats["missing"] += 1
+                continue
+            deduplicated = await _adopt(storage, path, digest, size)
+            stats["deduplicated" if deduplicated else "stored"] += 1
+            doc.storage_uri, doc.sha256, doc.size_bytes = storage.uri(blob_key(digest)), digest, size
+            moved.append(path)
+        db.commit()
+
+        for path in moved:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        stats["migrated"] += len(moved)
+    return dict(stats)
+
+
+async def _adopt(storage, path: str, sha256: str, size: int) -> bool:
+    """Put the file at ``path`` into the blob store; True if that content was already stored."""
+    key = blob_key(sha256)
+    if await storage.touch(key):
+        return True
+    dest = storage.local_path(key)
+    if dest is None:
+        with open(path, "rb") as f:
+            await storage.put(key, f, size, sha256)
+        return False
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        os.link(path, dest)
+        os.utime(dest)  # the link keeps the legacy mtime; don't look stale to GC
+    except FileExistsError:
+        return True
+    except OSError:
+        with open(path, "rb") as f:
+            write_stream(f, dest, max_bytes=1 << 62)
+    return False
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Content-addressed document store maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Move legacy local://uploads files into the blob store")
+    gc = sub.add_parser("gc", help="Delete blobs no document references")
+    gc.add_argument("--dry-run", action="store_true")
+    gc.add_argument("--grace-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.command == "migrate":
+            print(f"Migrated legacy uploads: {asyncio.run(migrate_legacy_uploads(session))}")
+        else:
+            stats = asyncio.run(collect_garbage(session, grace_seconds=args.grace_seconds, dry_run=args.dry_run))
+            print(f"Blob GC{' (dry run)' if args.dry_run else ''}: {stats}")
+    finally:
+        session.close()
@@ -0,0 +1,191 @@
+"""Write-behind buffer for analytics events.
+
+Events submitted through the batch endpoint are queued in-process and
+flushed to the ``events`` table with multi-row INSERTs once either
+``flush_size`` rows are pending or ``flush_interval`` seconds have passed.
+
+The queue is bounded: when ``max_pending`` rows are waiting, ``submit``
+blocks up to ``timeout`` seconds and then raises ``EventBufferFull`` so the
+caller can shed load (the router answers 503 + Retry-After).
+On shutdown ``stop()`` drains everything still pending before returning.
+A flush that hits an integrity error is retried row by row, so only the
+offending rows are dropped.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Event
+from app.services.kpi_rollup import record_event_rows
+
+logger = logging.getLogger(__name__)
+
+
+class EventBufferFull(Exception):
+    """Raised when the buffer cannot accept more events within the timeout."""
+
+
+def insert_events(db: Session, rows: list[dict[str, Any]]) -> None:
+    """Insert event rows with a single multi-row INSERT (no per-row refresh)."""
+    if rows:
+        db.execute(insert(Event), rows)
+        record_event_rows(db, rows)
+
+
+class EventBuffer:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_pending: int | None = None,
+        flush_size: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        self._session_factory = session_factory
+        self.max_pending = max_pending or settings.EVENT_BUFFER_MAX_PENDING
+        self.flush_size = flush_size or settings.EVENT_BUFFER_FLUSH_SIZE
+        self.flush_interval = flush_interval or settings.EVENT_BUFFER_FLUSH_INTERVAL_SECONDS
+
+        self._pending: deque[dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._in_flight = 0
+
+        self.flushed = 0
+        self.flushes = 0
+        self.dropped = 0
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="event-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        """Stop accepting events and drain everything pending to the DB."""
+        if not self._thread:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ---- producer side -----------------------------------------------------
+
+    def submit(self, rows: list[dict[str, Any]], timeout: float | None = None) -> None:
+        """Queue rows for insertion. All-or-nothing: never accepts a partial batch."""
+        if not rows:
+            return
+        if len(rows) > self.max_pending:
+            raise EventBufferFull(f"Batch of {len(rows)} exceeds buffer capacity {self.max_pending}")
+        if timeout is None:
+            timeout = settings.EVENT_BUFFER_SUBMIT_TIMEOUT_SECONDS
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self._pending) + len(rows) > self.max_pending:
+                if self._stopping:
+                    raise EventBufferFull("Event buffer is shutting down")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise EventBufferFull("Event buffer is full")
+                self._cond.wait(remaining)
+            if self._stopping:
+                raise EventBufferFull("Event buffer is shutting down")
+            self._pending.extend(rows)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            pending = len(self._pending) + self._in_flight
+        return {
+            "running": self.running,
+            "pending": pending,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+        }
+
+    # ---- consumer side -----------------------------------------------------
+
+    def _take_chunk(self) -> list[dict[str, Any]]:
+        n = min(self.flush_size, len(self._pending))
+        chunk = [self._pending.popleft() for _ in range(n)]
+        self._in_flight = n
+        # Room was freed: wake producers blocked on backpressure
+        self._cond.notify_all()
+        return chunk
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                while not self._stopping and len(self._pending) < self.flush_size:
+                    remaining = self.flush_interval - (time.monotonic() - last_flush)
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping and not self._pending:
+                    return
+                chunk = self._take_chunk()
+            if chunk:
+                self._write(chunk)
+            last_flush = time.monotonic()
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        db = self._session_factory()
+        try:
+            try:
+                insert_events(db, rows)
+                db.commit()
+                written = len(rows)
+            except IntegrityError:
+                db.rollback()
+                written = self._write_each(db, rows)
+            self.flushed += written
+            self.dropped += len(rows) - written
+            self.flushes += 1
+        except Exception:
+            db.rollback()
+            self.dropped += len(rows)
+            logger.exception("Event buffer flush failed; dropped %d events", len(rows))
+        finally:
+            db.close()
+            with self._cond:
+                self._in_flight = 0
+
+    def _write_each(self, db: Session, rows: list[dict[str, Any]]) -> int:
+        """Insert rows one transaction each, skipping those that violate a constraint."""
+        written = 0
+        for row in rows:
+            try:
+                insert_events(db, [row])
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.warning("Event buffer dropped an invalid %r event", row.get("name"), exc_info=True)
+            else:
+                written += 1
+        return written
+
+
+# Process-wide buffer; started/stopped from the app.main lifespan
+event_buffer = EventBuffer()
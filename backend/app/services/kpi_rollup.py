@@ -0,0 +1,316 @@
+"""Incremental daily KPI rollups (tenant × day).
+
+Every ORM flush that creates intakes, matters, approvals, leads or events –
+or decides an approval / re-routes a lead – is folded into
+``kpi_daily_rollups`` by session flush hooks, inside the same transaction.
+Time-to-approve is kept as a mergeable log-bucket digest in
+``kpi_tta_buckets`` so medians over any window are a sum over days.
+
+Core bulk inserts bypass the hook and must call ``record_event_rows`` /
+``record_approval_rows`` in the same transaction.
+
+Backfill (rebuilds rollups from the source tables):
+    python -m app.services.kpi_rollup [--tenant TENANT_ID]
+"""
+
+import argparse
+import math
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Approval, Event, Intake, KpiDailyRollup, KpiTtaBucket, Lead, Matter
+
+ROLLUP_COUNTERS = (
+    "intakes", "matters",
+    "approvals_requested", "approvals_approved", "approvals_rejected",
+    "leads", "events",
+)
+
+# ---------------------------------------------------------------------------
+# Time-to-approve digest (DDSketch-style, ~1% relative accuracy)
+# ---------------------------------------------------------------------------
+TTA_RELATIVE_ACCURACY = 0.01
+TTA_GAMMA = (1 + TTA_RELATIVE_ACCURACY) / (1 - TTA_RELATIVE_ACCURACY)
+TTA_MIN_HOURS = 0.01  # everything below collapses into bucket 0
+
+
+def tta_bucket(hours: float) -> int:
+    if hours <= TTA_MIN_HOURS:
+        return 0
+    return max(math.ceil(math.log(hours / TTA_MIN_HOURS) / math.log(TTA_GAMMA)), 0)
+
+
+def tta_bucket_value(bucket: int) -> float:
+    """Representative value (hours) of a bucket."""
+    if bucket <= 0:
+        return 0.0
+    return TTA_MIN_HOURS * 2 * TTA_GAMMA ** bucket / (TTA_GAMMA + 1)
+
+
+def tta_median(bucket_counts: list[tuple[int, int]]) -> float | None:
+    """Median (hours) from merged (bucket, count) pairs; mirrors statistics.median."""
+    counts = sorted((b, c) for b, c in bucket_counts if c)
+    total = sum(c for _, c in counts)
+    if not total:
+        return None
+    ranks = [(total - 1) // 2, total // 2]
+    values = []
+    seen = 0
+    for bucket, count in counts:
+        while ranks and ranks[0] < seen + count:
+            values.append(tta_bucket_value(bucket))
+            ranks.pop(0)
+        seen += count
+    return sum(values) / len(values)
+
+
+# ---------------------------------------------------------------------------
+# Increment collection
+# ---------------------------------------------------------------------------
+
+def _as_uuid(value) -> uuid.UUID | None:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+def _naive_utc(dt: datetime | None) -> datetime | None:
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _day(dt: datetime | None) -> date:
+    dt = _naive_utc(dt)
+    return dt.date() if dt else datetime.now(timezone.utc).date()
+
+
+def _loaded(obj, attr: str):
+    """Read an attribute without triggering a lazy load (None if unloaded)."""
+    return inspect(obj).dict.get(attr)
+
+
+class RollupDelta:
+    def __init__(self):
+        self.counters: dict[tuple, Counter] = defaultdict(Counter)
+        self.tta: Counter = Counter()
+
+    def add(self, tenant_id, day: date, counter: str, n: int = 1):
+        tenant_id = _as_uuid(tenant_id)
+        if tenant_id is not None and n:
+            self.counters[(tenant_id, day)][counter] += n
+
+    def add_decision(self, approval: Approval, status: str, n: int = 1, connection=None):
+        decided_at = _loaded(approval, "decided_at")
+        day = _day(decided_at)
+        self.add(approval.tenant_id, day, f"approvals_{status}", n)
+        if status != "approved" or not decided_at:
+            return
+        created_at = _loaded(approval, "created_at")
+        if created_at is None and connection is not None and approval.id is not None:
+            # Expired after a commit: read it on the flush connection (no lazy-load inside a flush)
+            created_at = connection.scalar(select(Approval.created_at).where(Approval.id == approval.id))
+        if created_at:
+            hours = (_naive_utc(decided_at) - _naive_utc(created_at)).total_seconds() / 3600
+            self.tta[(_as_uuid(approval.tenant_id), day, tta_bucket(hours))] += n
+
+    def __bool__(self):
+        return bool(self.counters or self.tta)
+
+
+def _collect(session: Session) -> RollupDelta:
+    delta = RollupDelta()
+    connection = session.connection()
+
+    for obj in session.new:
+        if isinstance(obj, (Intake, Matter, Lead, Event)):
+            counter = {Intake: "intakes", Matter: "matters", Lead: "leads", Event: "events"}[type(obj)]
+            delta.add(obj.tenant_id, _day(_loaded(obj, "created_at")), counter)
+        elif isinstance(obj, Approval):
+            delta.add(obj.tenant_id, _day(_loaded(obj, "created_at")), "approvals_requested")
+            if obj.status in ("approved", "rejected"):
+                delta.add_decision(obj, obj.status, connection=connection)
+
+    for obj in session.dirty:
+        if isinstance(obj, Approval):
+            hist = inspect(obj).attrs.status.history
+            if not hist.added:
+                continue
+            old = hist.deleted[0] if hist.deleted else None
+            new = hist.added[0]
+            if old in ("approved", "rejected"):
+                delta.add_decision(obj, old, -1, connection)
+            if new in ("approved", "rejected"):
+                delta.add_decision(obj, new, connection=connection)
+        elif isinstance(obj, Lead):
+            hist = inspect(obj).attrs.tenant_id.history
+            if not hist.added:
+                continue
+            day = _day(_loaded(obj, "created_at"))
+            if hist.deleted and hist.deleted[0] is not None:
+                delta.add(hist.deleted[0], day, "leads", -1)
+            delta.add(hist.added[0], day, "leads")
+
+    return delta
+
+
+# ---------------------------------------------------------------------------
+# Atomic upserts
+# ---------------------------------------------------------------------------
+
+def _insert_for(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"KPI rollups need INSERT .. ON CONFLICT (got {dialect_name})")
+
+
+def _apply(connection, delta: RollupDelta) -> None:
+    insert = _insert_for(connection.dialect.name)
+
+    rollups = KpiDailyRollup.__table__
+    for (tenant_id, day), counts in delta.counters.items():
+        values = {c: counts.get(c, 0) for c in ROLLUP_COUNTERS}
+        if not any(values.values()):
+            continue
+        stmt = insert(rollups).values(tenant_id=tenant_id, day=day, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollups.c.tenant_id, rollups.c.day],
+            set_={c: rollups.c[c] + stmt.excluded[c] for c, n in values.items() if n},
+        )
+        connection.execute(stmt)
+
+    buckets = KpiTtaBucket.__table__
+    for (tenant_id, day, bucket), n in delta.tta.items():
+        if not n:
+            continue
+        stmt = insert(buckets).values(tenant_id=tenant_id, day=day, bucket=bucket, count=n)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[buckets.c.tenant_id, buckets.c.day, buckets.c.bucket],
+            set_={"count": buckets.c.count + stmt.excluded.count},
+        )
+        connection.execute(stmt)
+
+
+# Load the previous value when these are assigned on an expired instance,
+# otherwise the flush hook cannot tell which rollup to decrement.
+@event.listens_for(Lead.tenant_id, "set", active_history=True)
+@event.listens_for(Approval.status, "set", active_history=True)
+def _track_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _rollup_before_flush(session: Session, flush_context, instances) -> None:
+    # Collect before the flush: session.new / attribute history are final here
+    delta = _collect(session)
+    if delta:
+        session.info["kpi_rollup_delta"] = delta
+
+
+@event.listens_for(Session, "after_flush")
+def _rollup_after_flush(session: Session, flush_context) -> None:
+    delta = session.info.pop("kpi_rollup_delta", None)
+    if delta:
+        _apply(session.connection(), delta)
+
+
+def record_event_rows(db: Session, rows: list[dict]) -> None:
+    """Count events written via Core bulk INSERT (not seen by the flush hook)."""
+    delta = RollupDelta()
+    for row in rows:
+        delta.add(row.get("tenant_id"), _day(row.get("created_at")), "events")
+    if delta:
+        _apply(db.connection(), delta)
+
+
+def record_approval_rows(db: Session, rows: list[dict]) -> None:
+    """Count approvals written via Core bulk INSERT (not seen by the flush hook)."""
+    delta = RollupDelta()
+    for row in rows:
+        tenant_id, created_at = row.get("tenant_id"), row.get("created_at")
+        delta.add(tenant_id, _day(created_at), "approvals_requested")
+        status, decided_at = row.get("status"), row.get("decided_at")
+        if status in ("approved", "rejected"):
+            delta.add(tenant_id, _day(decided_at), f"approvals_{status}")
+            if status == "approved" and decided_at and created_at:
+                hours = (_naive_utc(decided_at) - _naive_utc(created_at)).total_seconds() / 3600
+                delta.tta[(_as_uuid(tenant_id), _day(decided_at), tta_bucket(hours))] += 1
+    if delta:
+        _apply(db.connection(), delta)
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+def _as_date(value) -> date:
+    if isinstance(value, str):  # SQLite returns date() as text
+        return date.fromisoformat(value)
+    return value
+
+
+def backfill_rollups(db: Session, tenant_id=None) -> int:
+    """Rebuild rollups from source tables. Returns number of (tenant, day) rows written."""
+    tenant_id = _as_uuid(tenant_id)
+    for model in (KpiDailyRollup, KpiTtaBucket):
+        q = db.query(model)
+        if tenant_id:
+            q = q.filter(model.tenant_id == tenant_id)
+        q.delete(synchronize_session=False)
+
+    delta = RollupDelta()
+
+    def count_by_day(counter: str, model, date_col, *filters):
+        day = func.date(date_col)
+        q = db.query(model.tenant_id, day, func.count()).filter(
+            model.tenant_id.isnot(None), date_col.isnot(None), *filters,
+        )
+        if tenant_id:
+            q = q.filter(model.tenant_id == tenant_id)
+        for tid, d, n in q.group_by(model.tenant_id, day):
+            delta.add(tid, _as_date(d), counter, n)
+
+    count_by_day("intakes", Intake, Intake.created_at)
+    count_by_day("matters", Matter, Matter.created_at)
+    count_by_day("leads", Lead, Lead.created_at)
+    count_by_day("events", Event, Event.created_at)
+    count_by_day("approvals_requested", Approval, Approval.created_at)
+    count_by_day("approvals_approved", Approval, Approval.decided_at, Approval.status == "approved")
+    count_by_day("approvals_rejected", Approval, Approval.decided_at, Approval.status == "rejected")
+
+    approved = db.query(Approval.tenant_id, Approval.created_at, Approval.decided_at).filter(
+        Approval.status == "approved",
+        Approval.decided_at.isnot(None),
+        Approval.created_at.isnot(None),
+    )
+    if tenant_id:
+        approved = approved.filter(Approval.tenant_id == tenant_id)
+    for tid, created_at, decided_at in approved.yield_per(1000):
+        hours = (_naive_utc(decided_at) - _naive_utc(created_at)).total_seconds() / 3600
+        delta.tta[(_as_uuid(tid), _day(decided_at), tta_bucket(hours))] += 1
+
+    _apply(db.connection(), delta)
+    db.commit()
+    return len(delta.counters)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild KPI daily rollups.")
+    parser.add_argument("--tenant", help="Only rebuild this tenant")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        written = backfill_rollups(session, args.tenant)
+        print(f"Backfilled {written} tenant-day rollup rows.")
+    finally:
+        session.close()
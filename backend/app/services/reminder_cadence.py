@@ -0,0 +1,96 @@
+"""Reminder cadence state shared by doc chase and WhatsApp reminders.
+
+One ``ReminderCadence`` row per (matter, channel) holds how many reminder
+drafts were created and when the last one was. ``find_due_reminders``
+answers "which docs_pending matters need a reminder now" with one query over
+matters ⟕ cadence ⟕ intake plus one grouped document lookup, so a run costs
+O(due matters) instead of scanning message drafts per matter.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models import Intake, Matter, ReminderCadence
+from app.routers.templates import VERTICAL_TEMPLATES
+from app.schemas import TemplateDoc
+from app.services.completeness import missing_documents, required_documents, uploaded_kinds_by_matter
+
+
+@dataclass
+class DueReminder:
+    matter: Matter
+    cadence: ReminderCadence | None
+    intake_payload: dict
+    missing: list[TemplateDoc] = field(default_factory=list)
+
+    @property
+    def reminder_count(self) -> int:
+        return self.cadence.reminder_count if self.cadence else 0
+
+
+def utcnow() -> datetime:
+    """Naive UTC, matching how DateTime columns are stored."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def find_due_reminders(
+    db: Session,
+    tenant_id,
+    channel: str,
+    created_before: datetime,
+    cooldown_since: datetime,
+    *conditions,
+) -> list[DueReminder]:
+    """docs_pending matters older than ``created_before`` whose last ``channel``
+    reminder is older than ``cooldown_since`` (or absent) and that still miss
+    required documents. Extra SQL ``conditions`` may reference ReminderCadence.
+    """
+    verticals = [k for k in VERTICAL_TEMPLATES if required_documents(k)]
+    rows = (
+        db.query(Matter, ReminderCadence, Intake.raw_payload_json)
+        .outerjoin(
+            ReminderCadence,
+            and_(ReminderCadence.matter_id == Matter.id, ReminderCadence.channel == channel),
+        )
+        .outerjoin(Intake, Intake.id == Matter.intake_id)
+        .filter(
+            Matter.tenant_id == tenant_id,
+            Matter.pipeline_stage == "docs_pending",
+            Matter.created_at < created_before,
+            Matter.type.in_(verticals),
+            or_(ReminderCadence.last_sent_at.is_(None), ReminderCadence.last_sent_at <= cooldown_since),
+            *conditions,
+        )
+        .all()
+    )
+    if not rows:
+        return []
+
+    kinds = uploaded_kinds_by_matter(db, Matter.id.in_([m.id for m, _, _ in rows]))
+    due = []
+    for matter, cadence, payload in rows:
+        _, uploaded = kinds.get(matter.id, (matter.type, set()))
+        missing = missing_documents(matter.type, uploaded)
+        if missing:
+            due.append(DueReminder(matter, cadence, payload or {}, missing))
+    return due
+
+
+def record_reminder(db: Session, due: DueReminder, channel: str, sent_at: datetime) -> int:
+    """Advance the cadence for a matter/channel. Returns the new reminder number."""
+    cadence = due.cadence
+    if cadence is None:
+        cadence = ReminderCadence(
+            tenant_id=due.matter.tenant_id,
+            matter_id=due.matter.id,
+            channel=channel,
+            reminder_count=0,
+        )
+        db.add(cadence)
+        due.cadence = cadence
+    cadence.reminder_count += 1
+    cadence.last_sent_at = sent_at
+    return cadence.reminder_count
@@ -0,0 +1,228 @@
+"""Background job scheduler for the cadence services.
+
+Runs ``check_sla_breaches``, ``check_doc_reminders`` and
+``check_whatsapp_reminders`` per tenant on configurable intervals, so read
+endpoints (pilot-kpis) no longer write tasks, drafts or approvals.
+
+Only one API process schedules at a time: the leader holds a Postgres
+advisory lock (same mechanism entrypoint.sh uses for migrations) on a
+dedicated connection. Other dialects (SQLite in tests/dev) are always leader.
+
+Each execution is recorded in ``job_runs`` with its duration and outcome.
+
+Per-tenant configuration (all optional) in ``Tenant.settings_json``::
+
+    {"scheduler": {"sla_nudge": {"interval_minutes": 5, "sla_hours": 2},
+                   "doc_chase": {"enabled": false}}}
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import Engine, func, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, engine as default_engine
+from app.models import JobRun, Tenant
+from app.services.doc_chase import check_doc_reminders
+from app.services.sla_nudge import check_sla_breaches
+from app.services.whatsapp_cadence import check_whatsapp_reminders
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[..., list]  # func(db, tenant_id, **params) -> list of created items
+    interval_minutes: int
+    params: set[str] = field(default_factory=set)  # tenant-overridable kwargs
+
+
+def default_jobs() -> list[ScheduledJob]:
+    return [
+        ScheduledJob("sla_nudge", check_sla_breaches,
+                     settings.SCHEDULER_SLA_NUDGE_INTERVAL_MINUTES, {"sla_hours"}),
+        ScheduledJob("doc_chase", check_doc_reminders,
+                     settings.SCHEDULER_DOC_CHASE_INTERVAL_MINUTES, {"reminder_hours"}),
+        ScheduledJob("whatsapp_cadence", check_whatsapp_reminders,
+                     settings.SCHEDULER_WHATSAPP_CADENCE_INTERVAL_MINUTES,
+                     {"first_reminder_hours", "second_reminder_hours"}),
+    ]
+
+
+class LeaderLock:
+    """Postgres session-level advisory lock held on a dedicated connection.
+
+    The connection runs in AUTOCOMMIT so the heartbeat never leaves it
+    "idle in transaction" (holding a snapshot and blocking vacuum).
+    """
+
+    def __init__(self, engine: Engine, lock_id: int):
+        self._engine = engine
+        self._lock_id = lock_id
+        self._conn = None
+
+    def acquire(self) -> bool:
+        """Try to become (or confirm we still are) the leader. Never blocks."""
+        if self._engine.dialect.name != "postgresql":
+            return True
+        try:
+            if self._conn is not None:
+                self._conn.execute(text("SELECT 1"))
+                return True
+            conn = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            got = conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": self._lock_id}).scalar()
+            if got:
+                self._conn = conn
+                return True
+            conn.close()
+        except Exception:
+            logger.exception("Scheduler leader check failed")
+            self.release()
+        return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": self._lock_id})
+        except Exception:
+            pass  # connection is gone; the server already dropped the lock
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        engine: Engine = default_engine,
+        jobs: list[ScheduledJob] | None = None,
+        tick_seconds: float | None = None,
+    ):
+        self._session_factory = session_factory
+        self._lock = LeaderLock(engine, settings.SCHEDULER_ADVISORY_LOCK_ID)
+        self.jobs = jobs if jobs is not None else default_jobs()
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.is_leader = False
+
+        self._last_run: dict[tuple[str, Any], datetime] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._lock.release()
+        self.is_leader = False
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            self._stop.wait(self.tick_seconds)
+
+    # ---- scheduling --------------------------------------------------------
+
+    def tick(self, now: datetime | None = None) -> list[JobRun]:
+        """Run every (job, tenant) pair that is due. Returns the recorded runs."""
+        leader = self._lock.acquire()
+        if leader and not self.is_leader:
+            # New leader: resume from the persisted history, not from scratch
+            self._load_last_runs()
+        self.is_leader = leader
+        if not leader:
+            return []
+
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        runs = []
+        for tenant_id, tenant_settings in self._tenants():
+            overrides = tenant_settings.get("scheduler", {}) or {}
+            for job in self.jobs:
+                config = overrides.get(job.name, {}) or {}
+                if config.get("enabled", True) is False:
+                    continue
+                interval = config.get("interval_minutes", job.interval_minutes)
+                last = self._last_run.get((job.name, tenant_id))
+                if last is not None and (now - last).total_seconds() < interval * 60:
+                    continue
+                params = {k: v for k, v in config.items() if k in job.params}
+                runs.append(self.run_job(job, tenant_id, params, now))
+        return runs
+
+    def run_job(self, job: ScheduledJob, tenant_id, params: dict, now: datetime) -> JobRun:
+        db = self._session_factory()
+        started = time.perf_counter()
+        status, items, error = "completed", 0, None
+        try:
+            items = len(job.func(db, tenant_id, **params) or [])
+        except Exception as exc:
+            db.rollback()
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+            logger.exception("Job %s failed for tenant %s", job.name, tenant_id)
+
+        run = JobRun(
+            tenant_id=tenant_id,
+            job_name=job.name,
+            status=status,
+            items=items,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+            error=error,
+            started_at=now,
+        )
+        try:
+            db.add(run)
+            db.commit()
+            db.refresh(run)
+        finally:
+            db.close()
+        self._last_run[(job.name, tenant_id)] = now
+        return run
+
+    def _tenants(self) -> list[tuple[Any, dict]]:
+        db = self._session_factory()
+        try:
+            return [(tid, s or {}) for tid, s in db.query(Tenant.id, Tenant.settings_json).all()]
+        finally:
+            db.close()
+
+    def _load_last_runs(self) -> None:
+        db = self._session_factory()
+        try:
+            rows = (
+                db.query(JobRun.job_name, JobRun.tenant_id, func.max(JobRun.started_at))
+                .group_by(JobRun.job_name, JobRun.tenant_id)
+                .all()
+            )
+        finally:
+            db.close()
+        self._last_run = {(name, tid): started for name, tid, started in rows}
+
+
+# Process-wide scheduler; started/stopped from the app.main lifespan
+scheduler = JobScheduler()
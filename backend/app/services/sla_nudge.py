@@ -1,15 +1,27 @@
 """Approval SLA nudge service.
 
 Checks for approvals pending longer than threshold and creates nudge tasks.
-Called on-demand from analytics endpoint or via a scheduled job (stub).
+Run per tenant by the background scheduler (app.services.scheduler).
+
+Each nudge task links back to its approval via
+(source_type="approval_sla_nudge", source_id=approval.id), backed by a unique
+index, so "which breaches are not nudged yet" is a single anti-join.
 """
 
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 
 from app.models import Approval, Task, Event
 
+NUDGE_SOURCE_TYPE = "approval_sla_nudge"
+
+
+def _utc(dt: datetime) -> datetime:
+    """DB timestamps are naive UTC; make them comparable with aware now()."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
 
 def check_sla_breaches(
     db: Session,
@@ -18,37 +30,30 @@ def check_sla_breaches(
 ) -> list[dict]:
     """Find approvals pending longer than sla_hours, create nudge tasks.
 
-    Returns list of breached approval dicts.
+    Returns list of breached approval dicts (only newly nudged ones).
     """
-    threshold = datetime.now(timezone.utc) - timedelta(hours=sla_hours)
+    now = datetime.now(timezone.utc)
+    threshold = now - timedelta(hours=sla_hours)
 
+    already_nudged = exists().where(
+        Task.source_type == NUDGE_SOURCE_TYPE,
+        Task.source_id == Approval.id,
+    )
     breached = (
         db.query(Approval)
         .filter(
             Approval.tenant_id == tenant_id,
             Approval.status == "pending",
             Approval.created_at < threshold,
+            Approval.matter_id.isnot(None),  # tasks always belong to a matter
+            ~already_nudged,
         )
         .all()
     )
 
     results = []
     for approval in breached:
-        # Check if we already created a nudge task for this approval
-        existing_nudge = (
-            db.query(Task)
-            .filter(
-                Task.tenant_id == tenant_id,
-                Task.title.contains(str(approval.id)),
-                Task.title.contains("Nudge"),
-            )
-            .first()
-        )
-        if existing_nudge:
-            continue
-
-        # Create nudge task
-        hours_pending = (datetime.now(timezone.utc) - approval.created_at).total_seconds() / 3600
+        hours_pending = (now - _utc(approval.created_at)).total_seconds() / 3600
         task = Task(
             tenant_id=tenant_id,
             matter_id=approval.matter_id,
@@ -59,6 +64,8 @@ def check_sla_breaches(
                 f"Please review and approve/reject."
             ),
             status="pending",
+            source_type=NUDGE_SOURCE_TYPE,
+            source_id=approval.id,
         )
         db.add(task)
 
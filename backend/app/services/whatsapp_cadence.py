@@ -3,14 +3,20 @@
 Creates MessageDraft with channel=whatsapp for document reminders.
 Does NOT send real WhatsApp messages — only creates drafts behind approval gate.
 Configurable cadence: 24h first reminder, 48h second reminder.
+Cadence state (count, last sent) lives in ``reminder_cadences``.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
-from app.models import Matter, Document, Approval, MessageDraft, Event, Intake
-from app.routers.templates import VERTICAL_TEMPLATES
+from app.models import Approval, Event, Matter, MessageDraft, ReminderCadence
+from app.services.reminder_cadence import find_due_reminders, record_reminder, utcnow
+
+CHANNEL = "whatsapp"
+MAX_REMINDERS = 2
+COOLDOWN_HOURS = 12
 
 
 def check_whatsapp_reminders(
@@ -24,84 +30,29 @@ def check_whatsapp_reminders(
     Creates MessageDraft (channel=whatsapp) + Approval for each reminder.
     Returns list of created reminders.
     """
-    now = datetime.now(timezone.utc)
+    now = utcnow()
     first_threshold = now - timedelta(hours=first_reminder_hours)
     second_threshold = now - timedelta(hours=second_reminder_hours)
 
-    # Find matters in docs_pending stage
-    matters = (
-        db.query(Matter)
-        .filter(
-            Matter.tenant_id == tenant_id,
-            Matter.pipeline_stage == "docs_pending",
-            Matter.created_at < first_threshold,
-        )
-        .all()
+    due = find_due_reminders(
+        db, tenant_id, CHANNEL, first_threshold, now - timedelta(hours=COOLDOWN_HOURS),
+        # Only send up to 2 reminders; the second only once past second_threshold
+        or_(ReminderCadence.id.is_(None), ReminderCadence.reminder_count < MAX_REMINDERS),
+        or_(
+            ReminderCadence.id.is_(None),
+            ReminderCadence.reminder_count == 0,
+            Matter.created_at < second_threshold,
+        ),
     )
 
     results = []
-    for matter in matters:
-        template = VERTICAL_TEMPLATES.get(matter.type)
-        if not template:
-            continue
-
-        # Check which docs are missing
-        docs = db.query(Document).filter(
-            Document.matter_id == matter.id,
-            Document.status.in_(["uploaded", "verified"]),
-        ).all()
-        uploaded_kinds = {d.kind for d in docs}
-        missing = [d for d in template.required_documents if d.required and d.key not in uploaded_kinds]
-
-        if not missing:
-            continue
-
-        # Check if we already sent a WhatsApp reminder recently (12h)
-        recent = (
-            db.query(MessageDraft)
-            .filter(
-                MessageDraft.matter_id == matter.id,
-                MessageDraft.channel == "whatsapp",
-                MessageDraft.content.contains("[RECORDATORIO]"),
-                MessageDraft.created_at > now - timedelta(hours=12),
-            )
-            .first()
-        )
-        if recent:
-            continue
-
-        # Count existing whatsapp reminders to determine cadence step
-        existing_count = (
-            db.query(MessageDraft)
-            .filter(
-                MessageDraft.matter_id == matter.id,
-                MessageDraft.channel == "whatsapp",
-                MessageDraft.content.contains("[RECORDATORIO]"),
-            )
-            .count()
-        )
+    for item in due:
+        matter, missing = item.matter, item.missing
+        payload = item.intake_payload
+        client_name = payload.get("nombre_completo") or payload.get("full_name", "Cliente")
+        client_phone = payload.get("phone", "")
 
-        # Only send up to 2 reminders
-        if existing_count >= 2:
-            continue
-
-        # For second reminder, only if past second_threshold
-        if existing_count == 1 and matter.created_at > second_threshold:
-            continue
-
-        # Get client info
-        client_name = "Cliente"
-        client_phone = ""
-        if matter.intake_id:
-            intake = db.query(Intake).filter(Intake.id == matter.intake_id).first()
-            if intake and intake.raw_payload_json:
-                client_name = (
-                    intake.raw_payload_json.get("nombre_completo")
-                    or intake.raw_payload_json.get("full_name", client_name)
-                )
-                client_phone = intake.raw_payload_json.get("phone", "")
-
-        reminder_num = existing_count + 1
+        reminder_num = record_reminder(db, item, CHANNEL, now)
         missing_list = "\n".join(f"  - {d.label}" for d in missing)
         content = (
             f"[RECORDATORIO #{reminder_num}] Hola {client_name},\n\n"
@@ -115,7 +66,7 @@ def check_whatsapp_reminders(
         draft = MessageDraft(
             tenant_id=tenant_id,
             matter_id=matter.id,
-            channel="whatsapp",
+            channel=CHANNEL,
             content=content,
             status="needs_approval",
         )
@@ -139,7 +90,7 @@ def check_whatsapp_reminders(
                 "matter_id": str(matter.id),
                 "reminder_number": reminder_num,
                 "missing_docs": len(missing),
-                "channel": "whatsapp",
+                "channel": CHANNEL,
                 "client_phone": client_phone,
             },
         ))
@@ -149,7 +100,7 @@ def check_whatsapp_reminders(
             "reminder_number": reminder_num,
             "missing_docs": [d.key for d in missing],
             "draft_id": str(draft.id),
-            "channel": "whatsapp",
+            "channel": CHANNEL,
         })
 
     if results:
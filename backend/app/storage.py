@@ -0,0 +1,340 @@
+"""
+Document storage backends – where uploaded bytes live.
+
+``STORAGE_BACKEND`` picks ``local`` (files under ``UPLOAD_DIR``) or ``s3`` (any
+S3-compatible service over httpx). Both expose the same async interface keyed
+by e.g. ``blobs/ab/cd/<sha256>``, and ``storage_for_uri`` resolves a stored
+``Document.storage_uri`` to the backend that wrote it.
+"""
+
+import datetime as dt
+import email.utils
+import functools
+import hashlib
+import hmac
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO
+from urllib.parse import quote
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.uploads import write_stream
+
+LOCAL_URI_PREFIX = "local://uploads/"
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+class ObjectNotFound(Exception):
+    """The key does not exist in the backend."""
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    key: str
+    size: int
+    modified: float  # epoch seconds
+
+
+# ---------------------------------------------------------------------------
+# Local filesystem
+# ---------------------------------------------------------------------------
+
+class LocalStorage:
+    scheme = "local"
+
+    def __init__(self, root: str | None = None, chunk_size: int | None = None):
+        self.root = os.path.abspath(root or settings.UPLOAD_DIR)
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+
+    def uri(self, key: str) -> str:
+        return LOCAL_URI_PREFIX + key
+
+    def key(self, uri: str) -> str:
+        if not uri.startswith(LOCAL_URI_PREFIX):
+            raise ValueError(f"Not a local upload URI: {uri}")
+        return uri[len(LOCAL_URI_PREFIX):]
+
+    def local_path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Key escapes the storage root: {key}")
+        return path
+
+    async def put(self, key: str, source: BinaryIO, size: int, sha256: str | None = None) -> None:
+        stored = await run_in_threadpool(write_stream, source, self.local_path(key), size or 1, self.chunk_size)
+        if stored.size != size or (sha256 and stored.sha256 != sha256):
+            await self.delete(key)
+            raise ValueError(f"Content of {key} changed while it was being stored")
+
+    async def get(self, key: str) -> bytes:
+        try:
+            return await run_in_threadpool(_read_file, self.local_path(key))
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+
+    async def stream(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        try:
+            f = await run_in_threadpool(open, self.local_path(key), "rb")
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+        try:
+            await run_in_threadpool(f.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                n = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await run_in_threadpool(f.read, n)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await run_in_threadpool(f.close)
+
+    async def stat(self, key: str) -> ObjectInfo | None:
+        try:
+            st = await run_in_threadpool(os.stat, self.local_path(key))
+        except FileNotFoundError:
+            return None
+        return ObjectInfo(key, st.st_size, st.st_mtime)
+
+    async def touch(self, key: str) -> bool:
+        try:
+            await run_in_threadpool(os.utime, self.local_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def delete(self, key: str) -> None:
+        try:
+            await run_in_threadpool(os.unlink, self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def list_objects(self, prefix: str = "") -> AsyncIterator[ObjectInfo]:
+        for info in await run_in_threadpool(self._walk, prefix):
+            yield info
+
+    def _walk(self, prefix: str) -> list[ObjectInfo]:
+        found = []
+        for directory, _, files in os.walk(self.local_path(prefix)):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append(ObjectInfo(os.path.relpath(path, self.root).replace(os.sep, "/"), st.st_size, st.st_mtime))
+        return found
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# ---------------------------------------------------------------------------
+# S3-compatible (SigV4 over httpx)
+# ---------------------------------------------------------------------------
+
+def sigv4_headers(
+    method: str, url: httpx.URL, headers: dict[str, str], payload_sha256: str,
+    access_key: str, secret_key: str, region: str, now: dt.datetime, service: str = "s3",
+) -> dict[str, str]:
+    """``headers`` plus the AWS Signature Version 4 ``Authorization`` and ``x-amz-*`` headers."""
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    scope = f"{now:%Y%m%d}/{region}/{service}/aws4_request"
+    signed = {
+        **{k.lower(): str(v).strip() for k, v in headers.items()},
+        "host": url.netloc.decode(),
+        "x-amz-content-sha256": payload_sha256,
+        "x-amz-date": amz_date,
+    }
+    names = sorted(signed)
+    query = "&".join(
+        f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(url.params.multi_items())
+    )
+    canonical = "\n".join([
+        method,
+        quote(url.path, safe="/-_.~"),
+        query,
+        "".join(f"{n}:{signed[n]}\n" for n in names),
+        ";".join(names),
+        payload_sha256,
+    ])
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical.encode()).hexdigest(),
+    ])
+    key = f"AWS4{secret_key}".encode()
+    for part in (f"{now:%Y%m%d}", region, service, "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    return {
+        **{k: v for k, v in signed.items() if k != "host"},
+        "authorization": (
+            f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+            f"SignedHeaders={';'.join(names)}, Signature={signature}"
+        ),
+    }
+
+
+class S3Storage:
+    scheme = "s3"
+    S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+    def __init__(
+        self,
+        bucket: str | None = None,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        chunk_size: int | None = None,
+    ):
+        self.bucket = bucket or settings.S3_BUCKET
+        self.region = region or settings.S3_REGION
+        self.endpoint_url = (endpoint_url or settings.S3_ENDPOINT_URL
+                             or f"https://s3.{self.region}.amazonaws.com").rstrip("/")
+        self.access_key = access_key or settings.S3_ACCESS_KEY_ID
+        self.secret_key = secret_key or settings.S3_SECRET_ACCESS_KEY
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+        self._client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.STORAGE_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=settings.STORAGE_HTTP_MAX_CONNECTIONS),
+        )
+
+    def uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def key(self, uri: str) -> str:
+        prefix = f"s3://{self.bucket}/"
+        if not uri.startswith(prefix):
+            raise ValueError(f"Not an object in bucket {self.bucket}: {uri}")
+        return uri[len(prefix):]
+
+    def local_path(self, key: str) -> None:
+        return None
+
+    def _request(
+        self, method: str, key: str = "", params: dict | None = None,
+        headers: dict[str, str] | None = None, payload_sha256: str = EMPTY_SHA256, content=None,
+    ) -> httpx.Request:
+        url = httpx.URL(f"{self.endpoint_url}/{self.bucket}/{quote(key, safe='/-_.~')}", params=params)
+        signed = sigv4_headers(
+            method, url, headers or {}, payload_sha256,
+            self.access_key, self.secret_key, self.region, dt.datetime.now(dt.timezone.utc),
+        )
+        return self._client.build_request(method, url, headers=signed, content=content)
+
+    async def put(self, key: str, source: BinaryIO, size: int, sha256: str | None = None) -> None:
+        async def body():
+            while chunk := await run_in_threadpool(source.read, self.chunk_size):
+                yield chunk
+
+        # Content-Length is set, so httpx sends the body as-is rather than chunked
+        request = self._request(
+            "PUT", key, headers={"content-length": str(size)},
+            payload_sha256=sha256 or "UNSIGNED-PAYLOAD", content=body(),
+        )
+        response = await self._client.send(request)
+        response.raise_for_status()
+
+    async def get(self, key: str) -> bytes:
+        response = await self._client.send(self._request("GET", key))
+        self._raise_for(response, key)
+        return response.content
+
+    async def stream(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        headers = {} if start == 0 and end is None else {"range": f"bytes={start}-{'' if end is None else end}"}
+        response = await self._client.send(self._request("GET", key, headers=headers), stream=True)
+        try:
+            self._raise_for(response, key)
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def stat(self, key: str) -> ObjectInfo | None:
+        response = await self._client.send(self._request("HEAD", key))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return ObjectInfo(key, int(response.headers.get("content-length", 0)),
+                          _http_date(response.headers.get("last-modified")))
+
+    async def touch(self, key: str) -> bool:
+        # Copying an object onto itself (metadata REPLACE) refreshes LastModified
+        response = await self._client.send(self._request("PUT", key, headers={
+            "x-amz-copy-source": f"/{self.bucket}/{quote(key, safe='/-_.~')}",
+            "x-amz-metadata-directive": "REPLACE",
+        }))
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def delete(self, key: str) -> None:
+        response = await self._client.send(self._request("DELETE", key))
+        if response.status_code not in (200, 204, 404):
+            response.raise_for_status()
+
+    async def list_objects(self, prefix: str = "") -> AsyncIterator[ObjectInfo]:
+        token = None
+        while True:
+            params = {"list-type": "2", "prefix": prefix}
+            if token:
+                params["continuation-token"] = token
+            response = await self._client.send(self._request("GET", params=params))
+            response.raise_for_status()
+            root = ET.fromstring(response.content)
+            for item in root.iter(f"{self.S3_NS}Contents"):
+                yield ObjectInfo(
+                    item.findtext(f"{self.S3_NS}Key"),
+                    int(item.findtext(f"{self.S3_NS}Size") or 0),
+                    dt.datetime.fromisoformat(
+                        item.findtext(f"{self.S3_NS}LastModified").replace("Z", "+00:00")
+                    ).timestamp(),
+                )
+            token = root.findtext(f"{self.S3_NS}NextContinuationToken")
+            if root.findtext(f"{self.S3_NS}IsTruncated") != "true" or not token:
+                break
+
+    @staticmethod
+    def _raise_for(response: httpx.Response, key: str) -> None:
+        if response.status_code == 404:
+            raise ObjectNotFound(key)
+        response.raise_for_status()
+
+
+def _http_date(value: str | None) -> float:
+    return email.utils.parsedate_to_datetime(value).timestamp() if value else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Configured backends
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _backend(name: str, root: str):
+    return S3Storage() if name == "s3" else LocalStorage(root)
+
+
+def get_storage():
+    """The backend new documents are written to (``STORAGE_BACKEND``)."""
+    return _backend(settings.STORAGE_BACKEND.lower(), settings.UPLOAD_DIR)
+
+
+def storage_for_uri(uri: str):
+    """(backend, key) holding an existing ``storage_uri``."""
+    if uri.startswith(LOCAL_URI_PREFIX):
+        backend = _backend("local", settings.UPLOAD_DIR)
+    elif uri.startswith("s3://"):
+        backend = _backend("s3", settings.UPLOAD_DIR)
+    else:
+        raise ValueError(f"Unsupported storage URI: {uri}")
+    return backend, backend.key(uri)
@@ -0,0 +1,82 @@
+"""Streaming writes of uploaded files.
+
+An upload is copied to disk in ``UPLOAD_CHUNK_BYTES`` chunks, never read
+whole into memory. The SHA-256 and size are computed as the bytes pass. The
+file is written to a temporary ``.part`` file next to its destination and
+renamed into place only once complete, so readers never see a partial file.
+An upload over ``UPLOAD_MAX_BYTES`` is abandoned as soon as the limit is
+crossed and raises ``UploadTooLarge``; the partial file is removed.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from app.config import settings
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded the configured maximum size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit")
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+
+
+def hash_stream(source: BinaryIO, max_bytes: int | None = None, chunk_size: int | None = None) -> tuple[str, int]:
+    """(SHA-256 hex, size) of ``source`` read to the end in chunks, without writing anything."""
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+    return digest.hexdigest(), size
+
+
+def write_stream(
+    source: BinaryIO,
+    dest_path: str,
+    max_bytes: int | None = None,
+    chunk_size: int | None = None,
+) -> StoredUpload:
+    """Copy ``source`` to ``dest_path`` chunk by chunk, hashing on the fly; atomic on success."""
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+    directory = os.path.dirname(dest_path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return StoredUpload(path=dest_path, size=size, sha256=digest.hexdigest())
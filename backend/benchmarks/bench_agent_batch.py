@@ -0,0 +1,136 @@
+"""
+Benchmark: re-processing many matters with one agent.
+
+Compares the per-call path of POST /agents/run (matter lookup, LLM call,
+AgentRun + Approval INSERT and COMMIT per matter, one after another) with
+the batch path of POST /agents/run/batch (bounded worker pool, multi-row
+INSERTs, one COMMIT per flush). The LLM is the mock provider plus a fixed
+simulated latency per completion.
+
+Run: python -m benchmarks.bench_agent_batch [--matters 1000] [--llm-latency 0.02] [--workers 8]
+Uses DATABASE_URL (point it at a scratch database – rows are deleted after).
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.agents.mock_llm import MockLLMProvider
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.response_cache import NullResponseCache
+from app.config import settings
+from app.database import Base
+from app.models import AgentRun, Approval, Matter, Tenant, User
+from app.principal_cache import Principal
+from app.routers.agents import _prepare_run, _record_run
+from app.schemas import AgentRunRequest
+from app.services.agent_batch import AgentBatch, matter_input
+
+AGENT = "intake_specialist"
+
+
+class SimulatedLLM(MockLLMProvider):
+    """Mock output, but each completion takes ``latency`` seconds like a remote model."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_stream(self, agent_name, prompt, context=None):
+        time.sleep(self.latency)
+        yield from super().generate_stream(agent_name, prompt, context)
+
+
+def seed(Session, n: int) -> tuple[Principal, list[Matter]]:
+    db = Session()
+    tenant = Tenant(id=uuid.uuid4(), name="bench_agent_batch", settings_json={})
+    user = User(id=uuid.uuid4(), tenant_id=tenant.id, email=f"bench_{tenant.id}@example.com",
+                hashed_password="x", full_name="Bench", role="admin")
+    db.add_all([tenant, user])
+    db.flush()
+    matters = [Matter(tenant_id=tenant.id, type="immigration", jurisdiction="US") for _ in range(n)]
+    db.add_all(matters)
+    db.commit()
+    principal = Principal(id=user.id, tenant_id=tenant.id, role=user.role)
+    matters = [(m.id, m.type, m.jurisdiction) for m in matters]
+    db.close()
+    return principal, matters
+
+
+def bench_per_call(Session, orchestrator, principal, matters) -> float:
+    db = Session()
+    start = time.perf_counter()
+    for matter_id, case_type, jurisdiction in matters:
+        body = AgentRunRequest(matter_id=matter_id, agent_name=AGENT,
+                               input_data={"case_type": case_type, "jurisdiction": jurisdiction})
+        policy = _prepare_run(db, principal, body)
+        result = orchestrator.run(AGENT, body.input_data, policy=policy, use_cache=False)
+        _record_run(db, principal, body, result)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_batch(Session, orchestrator, principal, matters, workers: int, flush_size: int) -> float:
+    db = Session()
+    start = time.perf_counter()
+    ids = [m[0] for m in matters]
+    loaded = db.query(Matter).filter(Matter.id.in_(ids)).all()
+    items = [(m.id, matter_input(m, {})) for m in loaded]
+    batch = AgentBatch(orchestrator, principal.tenant_id, principal.id, AGENT,
+                       use_cache=False, workers=workers, flush_size=flush_size)
+    for _ in batch.run(db, items):
+        pass
+    elapsed = time.perf_counter() - start
+    assert batch.done == len(matters), batch.progress()
+    db.close()
+    return elapsed
+
+
+def cleanup(Session, principal: Principal) -> None:
+    db = Session()
+    for model in (Approval, AgentRun, Matter):
+        db.query(model).filter(model.tenant_id == principal.tenant_id).delete(synchronize_session=False)
+    db.query(User).filter(User.id == principal.id).delete(synchronize_session=False)
+    db.query(Tenant).filter(Tenant.id == principal.tenant_id).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matters", type=int, default=1000)
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="seconds per simulated completion")
+    parser.add_argument("--workers", type=int, default=settings.AGENT_BATCH_WORKERS)
+    parser.add_argument("--flush-size", type=int, default=settings.AGENT_BATCH_FLUSH_SIZE)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    tables = [t.__table__ for t in (Tenant, User, Matter, AgentRun, Approval)]
+    Base.metadata.create_all(bind=engine, tables=tables, checkfirst=True)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    orchestrator = AgentOrchestrator(cache=NullResponseCache(), llm=SimulatedLLM(args.llm_latency))
+
+    principal, matters = seed(Session, args.matters)
+    try:
+        results = [
+            ("per-call (/agents/run)", bench_per_call(Session, orchestrator, principal, matters)),
+            (f"batch ({args.workers} workers, {args.flush_size}/flush)",
+             bench_batch(Session, orchestrator, principal, matters, args.workers, args.flush_size)),
+        ]
+    finally:
+        cleanup(Session, principal)
+
+    baseline = results[0][1]
+    print(f"{args.matters} matters, {args.llm_latency * 1000:.0f} ms simulated LLM latency, "
+          f"against {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'path':<34}{'seconds':>10}{'matters/s':>12}{'speedup':>10}")
+    for name, elapsed in results:
+        print(f"{name:<34}{elapsed:>10.2f}{args.matters / elapsed:>12.0f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
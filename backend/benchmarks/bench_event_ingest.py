@@ -0,0 +1,104 @@
+"""
+Benchmark: analytics event ingestion throughput.
+
+Compares the per-event path used by POST /events/track (INSERT + COMMIT +
+refresh per event) with the batch endpoint's direct multi-row INSERT and the
+write-behind EventBuffer.
+
+Run: python -m benchmarks.bench_event_ingest [--events 5000] [--batch 100]
+Uses DATABASE_URL (point it at a scratch database – rows are deleted after).
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models import Event
+from app.services.event_buffer import EventBuffer, insert_events
+
+
+def _rows(n: int, tag: str) -> list[dict]:
+    return [
+        {
+            "anonymous_id": f"bench_{tag}",
+            "session_id": f"sess_{i % 50}",
+            "name": "page_view",
+            "properties_json": {"path": f"/page/{i % 20}", "utm_source": "bench"},
+        }
+        for i in range(n)
+    ]
+
+
+def bench_per_event(Session, n: int) -> float:
+    db = Session()
+    start = time.perf_counter()
+    for row in _rows(n, "single"):
+        event = Event(**row)
+        db.add(event)
+        db.commit()
+        db.refresh(event)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_batch_direct(Session, n: int, batch: int) -> float:
+    rows = _rows(n, "batch")
+    db = Session()
+    start = time.perf_counter()
+    for i in range(0, n, batch):
+        insert_events(db, rows[i:i + batch])
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_buffered(Session, n: int, batch: int) -> float:
+    rows = _rows(n, "buffered")
+    buffer = EventBuffer(session_factory=Session, max_pending=max(n, batch))
+    buffer.start()
+    start = time.perf_counter()
+    for i in range(0, n, batch):
+        buffer.submit(rows[i:i + batch], timeout=30)
+    buffer.stop()  # includes draining everything to the DB
+    elapsed = time.perf_counter() - start
+    assert buffer.flushed == n, buffer.stats()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine, tables=[Event.__table__], checkfirst=True)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    results = [
+        ("per-event (/events/track)", bench_per_event(Session, args.events)),
+        (f"batch insert ({args.batch}/stmt)", bench_batch_direct(Session, args.events, args.batch)),
+        ("write-behind buffer", bench_buffered(Session, args.events, args.batch)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{args.events} events against {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'path':<32}{'seconds':>10}{'events/s':>12}{'speedup':>10}")
+    for name, elapsed in results:
+        print(f"{name:<32}{elapsed:>10.2f}{args.events / elapsed:>12.0f}{baseline / elapsed:>9.1f}x")
+
+    db = Session()
+    db.query(Event).filter(Event.anonymous_id.like("bench_%")).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: PolicyEngine (UPL guard) throughput.
+
+Compares the original per-pattern loop (``re.search`` with every pattern
+string on every field) with the compiled engine's single anchor scan, over a
+corpus of agent outputs and PrepKits built from the mock LLM responses plus
+EN/ES case notes. About one packet in ten carries legal-advice phrasing.
+
+Run: python -m benchmarks.bench_policy_engine [--packets 2000] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from app.agents.mock_llm import MOCK_RESPONSES
+from app.agents.policy_engine import PolicyEngine
+
+CASE_NOTES = [
+    "Client reports that the landlord kept the deposit after the lease ended in March.",
+    "The employer has not paid the final two weeks of wages and refuses to answer calls.",
+    "Client received a CP2000 notice for tax year 2022 and has 30 days to respond.",
+    "Cliente indica que su expareja no ha pagado la pensión alimenticia desde enero.",
+    "La audiencia está programada para el 14 de mayo en el juzgado familiar de Guadalajara.",
+    "Faltan el acta de nacimiento, la CURP y el comprobante de domicilio del cliente.",
+    "Client is currently detained and the family needs help locating the facility.",
+    "The hearing notice lists a court date next month; the client cannot attend in person.",
+    "Se solicitó copia certificada del acta de matrimonio al registro civil.",
+    "Please upload your identification document and the most recent notice you received.",
+]
+
+ADVICE = [
+    "You should file Form I-130 before the deadline.",
+    "I recommend suing the employer for the unpaid wages.",
+    "You have a strong case and you will likely win at the hearing.",
+    "As your attorney, my legal advice is to appeal.",
+    "We guarantee approval of the petition.",
+    "Debes presentar la demanda antes del viernes.",
+    "Te recomiendo demandar al arrendador; vas a ganar.",
+    "Como tu abogado, tienes un buen caso.",
+]
+
+
+def build_corpus(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    agents = sorted(MOCK_RESPONSES)
+    corpus = []
+    for i in range(n):
+        notes = rng.sample(CASE_NOTES, k=rng.randint(3, 6))
+        if i % 10 == 0:
+            notes.insert(rng.randrange(len(notes) + 1), rng.choice(ADVICE))
+        if i % 2:
+            agent = agents[i % len(agents)]
+            raw = MOCK_RESPONSES[agent]("", {"case_type": "mx_divorce"})
+            corpus.append({
+                "agent_name": agent,
+                "case_packet": raw + "\n" + " ".join(notes),
+                "questions_to_ask": ["Please provide: date_of_birth", "Please provide: country_of_origin"],
+                "next_actions": ["Send document request email", "Schedule consultation"],
+            })
+        else:
+            corpus.append({
+                "checklist_docs": ["Acta de nacimiento", "CURP", "Comprobante de domicilio", "INE"],
+                "questions_for_lawyer": notes[:2],
+                "next_steps_informational": notes[2:],
+                "disclaimer": "Esta información no constituye asesoría legal.",
+            })
+    return corpus
+
+
+def legacy_check(patterns: list[tuple[str, str]], text: str) -> list[str]:
+    """The pre-compilation PolicyEngine.check loop."""
+    text_lower = text.lower()
+    return [f"Pattern matched: {d}" for p, d in patterns if re.search(p, text_lower)]
+
+
+def _texts(packet: dict):
+    for value in packet.values():
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, list):
+            yield from (v for v in value if isinstance(v, str))
+
+
+def bench_legacy(engine: PolicyEngine, corpus: list[dict], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for packet in corpus:
+            for text in _texts(packet):
+                legacy_check(engine.patterns, text)
+    return time.perf_counter() - start
+
+
+def bench_compiled(engine: PolicyEngine, corpus: list[dict], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for packet in corpus:
+            engine.check_and_annotate(dict(packet))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packets", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = PolicyEngine()
+    corpus = build_corpus(args.packets)
+    texts = [text for packet in corpus for text in _texts(packet)]
+    megabytes = sum(len(t.encode()) for t in texts) / 1e6
+    flagged = sum(bool(engine.check(t).details) for t in texts)
+    for text in texts:
+        assert engine.check(text).details == legacy_check(engine.patterns, text), text
+
+    results = [
+        ("per-pattern re.search loop", bench_legacy(engine, corpus, args.repeat)),
+        ("compiled anchor scan", bench_compiled(engine, corpus, args.repeat)),
+    ]
+
+    baseline = results[0][1]
+    packets = args.packets * args.repeat
+    print(f"{args.packets} packets x {args.repeat}, {len(texts)} texts ({megabytes:.2f} MB), "
+          f"{flagged} flagged, {len(engine.patterns)} rules")
+    print(f"{'path':<30}{'seconds':>10}{'packets/s':>12}{'MB/s':>8}{'speedup':>10}")
+    for name, elapsed in results:
+        print(f"{name:<30}{elapsed:>10.2f}{packets / elapsed:>12.0f}"
+              f"{megabytes * args.repeat / elapsed:>8.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
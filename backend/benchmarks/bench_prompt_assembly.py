@@ -0,0 +1,88 @@
+"""
+Benchmark: agent prompt assembly.
+
+Compares the original ``_build_prompt`` (``str.replace`` of every input key
+in every workflow step's template on each run) with ``definition.prompt.render``
+of the compiled prompts, for every shipped agent definition.
+
+Run: python -m benchmarks.bench_prompt_assembly [--runs 20000] [--extra-keys 20]
+"""
+
+import argparse
+import time
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.registry import AgentDefinition
+
+
+def legacy_build_prompt(defn: dict, input_data: dict) -> str:
+    """The pre-compilation AgentOrchestrator._build_prompt."""
+    parts = [f"Agent: {defn['name']}", f"Purpose: {defn.get('purpose', '')}"]
+
+    boundaries = defn.get("boundaries", [])
+    if boundaries:
+        parts.append("Boundaries: " + "; ".join(boundaries))
+
+    for step in defn.get("workflow_steps", []):
+        template = step.get("prompt_template", "")
+        for key, value in input_data.items():
+            template = template.replace(f"{{{{{key}}}}}", str(value))
+        parts.append(f"Step [{step.get('name', '?')}]: {template}")
+
+    return "\n".join(parts)
+
+
+def build_inputs(orchestrator: AgentOrchestrator, extra_keys: int) -> list[tuple[AgentDefinition, dict]]:
+    """Each definition with every template variable filled, plus unrelated intake fields."""
+    cases = []
+    for name in orchestrator.available_agents():
+        definition = orchestrator.registry.get(name)
+        values = {var: f"value for {var} " * 3 for var in definition.prompt.variables}
+        values.update({f"utm_field_{i}": f"campaign-{i}" for i in range(extra_keys)})
+        cases.append((definition, values))
+    return cases
+
+
+def legacy(definition: AgentDefinition, values: dict) -> str:
+    return legacy_build_prompt(definition.spec, values)
+
+
+def compiled(definition: AgentDefinition, values: dict) -> str:
+    return definition.prompt.render(values)
+
+
+def bench(build, cases, runs: int) -> float:
+    start = time.perf_counter()
+    for i in range(runs):
+        definition, values = cases[i % len(cases)]
+        build(definition, values)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument("--extra-keys", type=int, default=20, help="input keys not used by any template")
+    args = parser.parse_args()
+
+    orchestrator = AgentOrchestrator()
+    cases = build_inputs(orchestrator, args.extra_keys)
+    for definition, values in cases:
+        assert compiled(definition, values) == legacy(definition, values), definition.name
+
+    results = [
+        ("str.replace per key per step", bench(legacy, cases, args.runs)),
+        ("compiled segments + join", bench(compiled, cases, args.runs)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{args.runs} prompts over {len(cases)} definitions, "
+          f"{len(cases[0][1])}+ input keys each")
+    print(f"{'path':<32}{'seconds':>10}{'prompts/s':>12}{'us/prompt':>11}{'speedup':>10}")
+    for name, elapsed in results:
+        print(f"{name:<32}{elapsed:>10.3f}{args.runs / elapsed:>12.0f}"
+              f"{elapsed / args.runs * 1e6:>11.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
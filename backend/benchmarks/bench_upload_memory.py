@@ -0,0 +1,95 @@
+"""
+Benchmark: peak memory of concurrent document uploads.
+
+Compares the original upload write (``f.write(file.file.read())`` – the
+whole file in memory) with the chunked ``app.uploads.write_stream`` under N
+concurrent uploads. As in the endpoint, each upload's source is the
+spooled temporary file Starlette has already written to disk. Each path
+runs in a fresh subprocess, so its peak RSS (ru_maxrss) is its own.
+
+Run: python -m benchmarks.bench_upload_memory [--uploads 20] [--size-mb 50]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.uploads import write_stream
+
+
+def legacy_write(source_path: str, dest_path: str) -> None:
+    """The pre-streaming upload_document write."""
+    with open(source_path, "rb") as src, open(dest_path, "wb") as f:
+        f.write(src.read())
+
+
+def streamed_write(source_path: str, dest_path: str) -> None:
+    with open(source_path, "rb") as src:
+        write_stream(src, dest_path, max_bytes=1 << 40)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def worker(mode: str, source_path: str, uploads: int) -> None:
+    write = legacy_write if mode == "legacy" else streamed_write
+    dest_dir = tempfile.mkdtemp(prefix=f"bench_upload_{mode}_")
+    before = _peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=uploads) as pool:
+            list(pool.map(lambda i: write(source_path, os.path.join(dest_dir, f"{i}.bin")), range(uploads)))
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(dest_dir, ignore_errors=True)
+    print(json.dumps({"seconds": elapsed, "baseline_mb": before, "peak_mb": _peak_rss_mb()}))
+
+
+def run(mode: str, source_path: str, uploads: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_upload_memory", "--worker", mode,
+         "--source", source_path, "--uploads", str(uploads)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--worker", choices=["legacy", "streamed"], help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args.worker, args.source, args.uploads)
+
+    fd, source_path = tempfile.mkstemp(prefix="bench_upload_src_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+        results = [
+            ("whole-file read()", run("legacy", source_path, args.uploads)),
+            ("chunked write_stream", run("streamed", source_path, args.uploads)),
+        ]
+    finally:
+        os.unlink(source_path)
+
+    print(f"{args.uploads} concurrent uploads of {args.size_mb} MB")
+    print(f"{'path':<24}{'seconds':>10}{'peak RSS MB':>14}{'over baseline':>15}")
+    for name, r in results:
+        print(f"{name:<24}{r['seconds']:>10.2f}{r['peak_mb']:>14.0f}{r['peak_mb'] - r['baseline_mb']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,14 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.config import settings
+from app.database import Base, get_db, get_session_factory
 from app.main import app
-from app.models import Tenant, User
+from app.models import Matter, Tenant, User
 from app.dependencies import hash_password, create_access_token
+from app.agents.policy_packs import tenant_policies
+from app.agents.response_cache import response_cache
+from app.principal_cache import principal_cache
 
 SQLALCHEMY_TEST_URL = "sqlite://"
 
@@ -28,6 +32,9 @@ def setup_db():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    principal_cache.clear()
+    tenant_policies.clear()
+    response_cache.clear()
 
 
 @pytest.fixture
@@ -48,6 +55,7 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestSession
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -83,3 +91,53 @@ def seed_user(db, seed_tenant):
 def auth_headers(seed_user):
     token = create_access_token({"sub": str(seed_user.id), "tenant_id": str(seed_user.tenant_id), "role": seed_user.role})
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def staff_headers(db, seed_tenant):
+    """A non-admin user of the seed tenant."""
+    user = User(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000011"),
+        tenant_id=seed_tenant.id,
+        email="staff@test.com",
+        hashed_password=hash_password("test123"),
+        full_name="Staff User",
+        role="paralegal",
+    )
+    db.add(user)
+    db.commit()
+    token = create_access_token({"sub": str(user.id), "tenant_id": str(user.tenant_id), "role": user.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Local storage rooted in a per-test directory."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def matter_type():
+    """Case type of the ``matter`` fixture; override (or parametrize) it per module or test."""
+    return "immigration"
+
+
+@pytest.fixture
+def matter(db, seed_tenant, matter_type):
+    matter = Matter(tenant_id=seed_tenant.id, type=matter_type,
+                    jurisdiction="MX" if matter_type.startswith("mx_") else "US")
+    db.add(matter)
+    db.commit()
+    return matter
+
+
+def upload_document(client, headers, matter, data: bytes, name: str = "scan.pdf", kind: str | None = None) -> dict:
+    """POST /documents/upload (kind defaults server-side to "other"); returns the 201 body."""
+    form = {"matter_id": str(matter.id)}
+    if kind is not None:
+        form["kind"] = kind
+    response = client.post("/documents/upload", headers=headers, data=form,
+                           files={"file": (name, data, "application/pdf")})
+    assert response.status_code == 201
+    return response.json()
@@ -0,0 +1,143 @@
+"""Tests for batch agent runs (POST /agents/run/batch)."""
+
+import json
+import uuid
+
+from sqlalchemy import func
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.response_cache import MemoryResponseCache
+from app.models import AgentRun, Approval, KpiDailyRollup, Matter
+from app.services.agent_batch import AgentBatch, BatchJob
+from tests.conftest import TestSession
+
+
+def _matters(db, tenant_id, n, **fields):
+    matters = [Matter(tenant_id=tenant_id, type="immigration", jurisdiction="US", **fields) for _ in range(n)]
+    db.add_all(matters)
+    db.commit()
+    return matters
+
+
+def _events(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_by_ids_writes_runs_and_approvals(client, db, seed_tenant, auth_headers):
+    matters = _matters(db, seed_tenant.id, 5)
+    missing = uuid.uuid4()
+
+    response = client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist",
+        "matter_ids": [str(m.id) for m in matters] + [str(missing)],
+        "input_data": {"description": "Court hearing next week"},
+    })
+    assert response.status_code == 201
+    events = _events(response)
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert (summary["total"], summary["done"], summary["needs_approval"]) == (5, 5, 5)
+    assert summary["not_found"] == [str(missing)]
+
+    runs = db.query(AgentRun).all()
+    assert len(runs) == 5
+    assert {r.status for r in runs} == {"needs_approval"}
+    assert runs[0].input_json == {
+        "case_type": "immigration", "jurisdiction": "US", "description": "Court hearing next week",
+    }
+    assert "UPCOMING_COURT_DATE" in runs[0].output_json["urgency_flags"]
+    approvals = db.query(Approval).all()
+    assert {a.object_id for a in approvals} == {r.id for r in runs}
+
+
+def test_batch_approvals_show_in_analytics_overview(client, db, seed_tenant, auth_headers):
+    matters = _matters(db, seed_tenant.id, 3)
+    client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist", "matter_ids": [str(m.id) for m in matters],
+    })
+
+    overview = client.get("/app/analytics/overview?days=7", headers=auth_headers).json()
+    assert overview["approvals_pending"] == 3
+    requested = db.query(func.sum(KpiDailyRollup.approvals_requested)).filter(
+        KpiDailyRollup.tenant_id == seed_tenant.id,
+    ).scalar()
+    assert requested == 3
+
+
+def test_batch_by_filter_reports_progress(client, db, seed_tenant, auth_headers, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "AGENT_BATCH_FLUSH_SIZE", 2)
+    _matters(db, seed_tenant.id, 5, pipeline_stage="docs_pending")
+    _matters(db, seed_tenant.id, 3, pipeline_stage="closed")
+
+    response = client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist", "filter": {"pipeline_stage": "docs_pending"},
+    })
+    events = _events(response)
+    progress = [e["done"] for e in events if e["type"] == "progress"]
+    assert progress == [2, 4, 5]
+    assert db.query(AgentRun).count() == 5
+
+
+def test_batch_validation(client, db, seed_tenant, auth_headers, monkeypatch):
+    from app.config import settings
+
+    matters = _matters(db, seed_tenant.id, 3)
+    assert client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist",
+    }).status_code == 400
+    assert client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "nope", "matter_ids": [str(matters[0].id)],
+    }).status_code == 400
+
+    monkeypatch.setattr(settings, "AGENT_BATCH_MAX_MATTERS", 2)
+    assert client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist", "filter": {"type": "immigration"},
+    }).status_code == 400
+
+
+def test_failed_run_is_recorded_and_batch_continues(db, seed_tenant):
+    matters = _matters(db, seed_tenant.id, 3)
+    orchestrator = AgentOrchestrator(cache=MemoryResponseCache())
+    batch = AgentBatch(orchestrator, seed_tenant.id, None, "intake_specialist", workers=2)
+
+    def flaky(input_data):
+        if input_data["n"] == 1:
+            raise RuntimeError("boom")
+        return orchestrator.run("intake_specialist", input_data)
+
+    batch._run_one = flaky
+    list(batch.run(db, [(m.id, {"n": i}) for i, m in enumerate(matters)]))
+
+    assert batch.counts["failed"] == 1 and batch.counts["needs_approval"] == 2
+    failed = db.query(AgentRun).filter(AgentRun.status == "failed").one()
+    assert failed.output_json == {"error": "boom"}
+    assert db.query(Approval).count() == 2
+
+
+def test_batch_finishes_without_a_consumer(db, seed_tenant):
+    matters = _matters(db, seed_tenant.id, 4)
+    orchestrator = AgentOrchestrator(cache=MemoryResponseCache())
+    batch = AgentBatch(orchestrator, seed_tenant.id, None, "intake_specialist", workers=2, flush_size=1)
+    job = BatchJob(batch, TestSession, [(m.id, {}) for m in matters])
+
+    events = job.start().events()
+    assert next(events)["type"] == "progress"
+    events.close()  # the client went away after the first event
+
+    assert job.wait(timeout=10)
+    assert job.snapshot()["done"] == 4
+    assert db.query(AgentRun).count() == 4
+
+
+def test_batch_progress_endpoint(client, db, seed_tenant, auth_headers):
+    matters = _matters(db, seed_tenant.id, 2)
+    response = client.post("/agents/run/batch", headers=auth_headers, json={
+        "agent_name": "intake_specialist", "matter_ids": [str(m.id) for m in matters],
+    })
+    batch_id = _events(response)[-1]["batch_id"]
+
+    status = client.get(f"/agents/run/batch/{batch_id}", headers=auth_headers).json()
+    assert (status["type"], status["total"], status["done"]) == ("summary", 2, 2)
+    assert client.get(f"/agents/run/batch/{uuid.uuid4()}", headers=auth_headers).status_code == 404
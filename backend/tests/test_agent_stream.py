@@ -0,0 +1,104 @@
+"""Tests for streamed agent runs and early abort on UPL matches."""
+
+import json
+import uuid
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.models import AgentRun, Matter
+
+
+class _StubLLM:
+    model_params = {"model": "stub"}
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.served = 0
+        self.closed = False
+
+    def generate_stream(self, agent_name, prompt, context=None):
+        try:
+            for chunk in self.chunks:
+                self.served += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def _orchestrator(chunks) -> AgentOrchestrator:
+    orchestrator = AgentOrchestrator()
+    orchestrator.llm = _StubLLM(chunks)
+    return orchestrator
+
+
+def test_clean_stream_matches_full_run():
+    orchestrator = AgentOrchestrator()
+    expected = orchestrator.run("intake_specialist", {"case_type": "immigration"})
+
+    run = orchestrator.stream("intake_specialist", {"case_type": "immigration"}, use_cache=False)
+    chunks = list(run)
+    assert len(chunks) > 1
+    assert "".join(chunks) == expected["case_packet"]
+    assert run.output == expected
+    assert not run.aborted
+
+
+def test_blocked_stream_stops_generation():
+    chunks = ["Summary: ", "you ", "should ", "file ", "today. "] + ["More text. "] * 50
+    orchestrator = _orchestrator(chunks)
+
+    output = orchestrator.run("intake_specialist", {})
+    llm = orchestrator.llm
+    assert llm.served < 10 and llm.closed
+    assert output["generation_aborted"] is True
+    assert output["_policy_status"] == "BLOCKED – requires human review"
+    assert "case_packet: Pattern matched: Directive to file a legal document" in output["compliance_flags"]
+
+
+def test_run_stream_endpoint_emits_chunks_then_run(client, db, seed_tenant, auth_headers):
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US")
+    db.add(matter)
+    db.commit()
+
+    resp = client.post("/agents/run/stream", json={
+        "matter_id": str(matter.id),
+        "agent_name": "intake_specialist",
+        "input_data": {"case_type": "immigration"},
+    }, headers=auth_headers)
+    assert resp.status_code == 201
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    *chunks, final = events
+    assert chunks and all(e["type"] == "chunk" for e in chunks)
+    assert final["type"] == "run"
+    assert final["run"]["status"] == "needs_approval"
+    assert final["run"]["output_json"]["case_packet"] == "".join(e["text"] for e in chunks)
+    assert db.query(AgentRun).filter(AgentRun.id == uuid.UUID(final["run"]["id"])).count() == 1
+
+
+def test_run_stream_records_on_its_own_session(client, db, seed_tenant, auth_headers):
+    from app.database import get_session_factory
+    from app.main import app
+    from tests.conftest import TestSession
+
+    opened, closed = [], []
+
+    def factory():
+        session = TestSession()
+        close = session.close
+        session.close = lambda: (closed.append(session), close())
+        opened.append(session)
+        return session
+
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US")
+    db.add(matter)
+    db.commit()
+
+    resp = client.post("/agents/run/stream", json={
+        "matter_id": str(matter.id), "agent_name": "intake_specialist", "input_data": {},
+    }, headers=auth_headers)
+    run_id = uuid.UUID(json.loads(resp.text.splitlines()[-1])["run"]["id"])
+
+    assert len(opened) == 1 and closed == opened
+    assert db.query(AgentRun).filter(AgentRun.id == run_id).count() == 1
@@ -0,0 +1,101 @@
+"""Tests for the async LLM provider path and its concurrency limit."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.agents.openai_llm import OpenAIProvider
+from app.agents.orchestrator import AgentOrchestrator
+
+
+class _FakeStream:
+    def __init__(self, text: str):
+        self._chunks = text.split(" ")
+        self.closed = False
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        for i, chunk in enumerate(self._chunks):
+            await asyncio.sleep(0)
+            content = chunk if i == 0 else " " + chunk
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeAsyncOpenAI:
+    """Stands in for AsyncOpenAI: every completion takes ``latency`` seconds."""
+
+    def __init__(self, text: str = "Case summary ready for review.", latency: float = 0.05):
+        self.text = text
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, stream: bool = False, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if stream:
+            return _FakeStream(self.text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))])
+
+
+def _provider(max_concurrency: int, **fake) -> OpenAIProvider:
+    provider = OpenAIProvider(max_concurrency=max_concurrency)
+    provider._async_client = _FakeAsyncOpenAI(**fake)
+    return provider
+
+
+def test_concurrency_limit_caps_in_flight_completions():
+    provider = _provider(max_concurrency=3)
+
+    async def main():
+        return await asyncio.gather(*(provider.agenerate("intake_specialist", "p") for _ in range(12)))
+
+    results = asyncio.run(main())
+    assert results == ["Case summary ready for review."] * 12
+    assert provider._async_client.peak == 3
+
+
+def test_hundreds_of_concurrent_runs_share_one_loop():
+    orchestrator = AgentOrchestrator()
+    orchestrator.llm = _provider(max_concurrency=500, latency=0.2)
+
+    async def main():
+        return await asyncio.gather(*(
+            orchestrator.arun("intake_specialist", {"case_type": "immigration"}) for _ in range(300)
+        ))
+
+    start = time.perf_counter()
+    outputs = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+
+    assert all(o["case_packet"] == "Case summary ready for review." for o in outputs)
+    assert orchestrator.llm._async_client.peak == 300
+    assert elapsed < 300 * 0.2 / 10  # far from serial
+
+
+def test_arun_matches_run_with_mock_provider():
+    orchestrator = AgentOrchestrator()
+    expected = orchestrator.run("tax_solutions_assistant", {"notice_type": "CP2000"})
+    actual = asyncio.run(orchestrator.arun("tax_solutions_assistant", {"notice_type": "CP2000"}, use_cache=False))
+    assert actual == expected
+
+
+def test_async_stream_aborts_on_upl_match():
+    orchestrator = AgentOrchestrator()
+    provider = _provider(max_concurrency=1, text="Summary: you should file today. " + "More text. " * 50)
+    orchestrator.llm = provider
+
+    output = asyncio.run(orchestrator.arun("intake_specialist", {}))
+    assert output["generation_aborted"] is True
+    assert len(output["case_packet"]) < 60
+    assert output["_policy_status"] == "BLOCKED – requires human review"
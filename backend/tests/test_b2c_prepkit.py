@@ -1,6 +1,18 @@
 """Test: B2C Prep Kit always requires human approval."""
 
+import asyncio
+import json
+import time
+
+import httpx
+import openai
+import pytest
+
+from app.agents.openai_llm import OpenAIProvider
+from app.config import settings
 from app.models import Approval, AgentRun, Intake, Matter, Lead
+from app.rate_limit import limiter
+from app.routers import leads
 
 
 def test_prepkit_creates_intake_matter_and_approval(client, seed_tenant):
@@ -151,3 +163,131 @@ def test_onboard_rejects_duplicate_email(client):
 
     resp2 = client.post("/public/onboard", json=payload)
     assert resp2.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Concurrent PrepKit + intake_specialist calls under one deadline
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    """Delay each PrepKit LLM call by the given number of seconds."""
+    limiter.reset()
+    monkeypatch.setattr(settings, "PREPKIT_LLM_TIMEOUT_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "PREPKIT_AGENT_TIMEOUT_SECONDS", 0.5)
+
+    def _slow(prepkit: float = 0.0, agent: float = 0.0):
+        generate_prepkit = leads.orchestrator.llm.agenerate_prepkit
+        generate_stream = leads.orchestrator.llm.agenerate_stream
+
+        async def slow_prepkit(**kwargs):
+            await asyncio.sleep(prepkit)
+            return {**await generate_prepkit(**kwargs), "checklist_docs": ["From the LLM"]}
+
+        async def slow_stream(*args):
+            await asyncio.sleep(agent)
+            async for chunk in generate_stream(*args):
+                yield chunk
+
+        monkeypatch.setattr(leads.orchestrator.llm, "agenerate_prepkit", slow_prepkit)
+        monkeypatch.setattr(leads.orchestrator.llm, "agenerate_stream", slow_stream)
+
+    return _slow
+
+
+def _post_prepkit(client, tenant_id):
+    start = time.perf_counter()
+    response = client.post("/public/prepkit", json={
+        "tenant_id": str(tenant_id),
+        "case_type": "immigration",
+        "description": "I received a Notice to Appear",
+        "full_name": "Juan Test",
+        "email": "juan@test.com",
+        "language": "en",
+        "utm": {},
+    })
+    assert response.status_code == 201
+    return response.json(), time.perf_counter() - start
+
+
+def test_prepkit_llm_calls_run_concurrently(client, db, seed_tenant, slow_llm):
+    slow_llm(prepkit=0.3, agent=0.3)
+
+    data, elapsed = _post_prepkit(client, seed_tenant.id)
+    assert data["document_checklist"] == ["From the LLM"]
+    assert elapsed < 0.55  # not 0.3 + 0.3
+
+    run = db.query(AgentRun).filter(AgentRun.tenant_id == seed_tenant.id).one()
+    assert "fallback" not in run.output_json
+
+
+def test_prepkit_timeout_falls_back_to_template(client, db, seed_tenant, slow_llm):
+    slow_llm(prepkit=5.0)
+
+    data, elapsed = _post_prepkit(client, seed_tenant.id)
+    assert elapsed < 2.0
+    template = leads.orchestrator.llm.template_prepkit("immigration", "en")
+    assert data["document_checklist"] == template["checklist_docs"]
+
+
+def test_agent_timeout_falls_back_to_template(client, db, seed_tenant, slow_llm):
+    slow_llm(agent=5.0)
+
+    data, elapsed = _post_prepkit(client, seed_tenant.id)
+    assert elapsed < 2.0
+    assert data["document_checklist"] == ["From the LLM"]
+
+    run = db.query(AgentRun).filter(AgentRun.tenant_id == seed_tenant.id).one()
+    assert run.status == "needs_approval"
+    assert run.output_json["fallback"] == "timeout"
+    assert run.output_json["case_packet"].startswith("[MOCK] Intake analysis complete")
+
+
+class _ResetAfterFirstChunk(httpx.AsyncByteStream):
+    """An SSE body whose connection drops after the first chunk."""
+
+    async def __aiter__(self):
+        chunk = {"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+                 "choices": [{"index": 0, "delta": {"content": "Partial case packet "}, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+        raise httpx.ReadError("connection reset by peer")
+
+
+def test_agent_stream_dropped_mid_response_falls_back_to_template(client, db, seed_tenant, monkeypatch):
+    limiter.reset()
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                                  stream=_ResetAfterFirstChunk())
+        prepkit = {"checklist_docs": ["From the LLM"], "questions_for_lawyer": [],
+                   "next_steps_informational": [], "disclaimer": "Not legal advice."}
+        return httpx.Response(200, json={
+            "id": "c1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": json.dumps(prepkit)}}],
+        })
+
+    provider = OpenAIProvider()
+    provider._async_client = openai.AsyncOpenAI(
+        api_key="sk-test", base_url="http://llm.test/v1", max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)),
+    )
+    monkeypatch.setattr(leads.orchestrator, "llm", provider)
+
+    data, _ = _post_prepkit(client, seed_tenant.id)
+    assert data["document_checklist"] == ["From the LLM"]
+    assert provider.stats()["errors"] == 1
+
+    run = db.query(AgentRun).filter(AgentRun.tenant_id == seed_tenant.id).one()
+    assert run.status == "needs_approval"
+    assert run.output_json["fallback"] == "llm_unavailable"
+    assert run.output_json["case_packet"].startswith("[MOCK] Intake analysis complete")
+
+
+def test_shared_deadline_bounds_both_calls(client, seed_tenant, slow_llm, monkeypatch):
+    monkeypatch.setattr(settings, "PREPKIT_DEADLINE_SECONDS", 0.2)
+    slow_llm(prepkit=5.0, agent=5.0)
+
+    _, elapsed = _post_prepkit(client, seed_tenant.id)
+    assert elapsed < 0.45
@@ -0,0 +1,98 @@
+"""Tests for the shared, hot-reloadable agent definition registry."""
+
+import os
+
+from app.agents.orchestrator import get_orchestrator
+from app.agents.registry import DefinitionRegistry
+from app.routers import agents, leads
+
+DEMO = (
+    "name: demo\npurpose: {purpose}\nrequired_input_fields: [client]\n"
+    "workflow_steps:\n  - name: s\n    prompt_template: 'Hi {{{{client}}}}'\n"
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write(path, purpose="First", mtime_ns=None):
+    path.write_text(DEMO.format(purpose=purpose))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_loads_lazily(tmp_path):
+    registry = DefinitionRegistry(tmp_path, reload_seconds=0)
+    _write(tmp_path / "demo.yaml")  # written after construction, still picked up
+
+    assert registry.names() == ["demo"]
+    assert registry.get("demo").prompt.render({"client": "Ana"}).endswith("Hi Ana")
+
+
+def test_unchanged_files_are_not_reparsed(tmp_path, monkeypatch):
+    _write(tmp_path / "demo.yaml", mtime_ns=1_000_000_000)
+    registry = DefinitionRegistry(tmp_path, reload_seconds=0)
+    first = registry.get("demo")
+
+    parsed = []
+    monkeypatch.setattr(registry, "_parse", lambda path, raw: parsed.append(path))
+    assert registry.reload() == []
+
+    # Touched but identical content: matched by hash
+    os.utime(tmp_path / "demo.yaml", ns=(2_000_000_000, 2_000_000_000))
+    assert registry.reload() == []
+    assert parsed == []
+    assert registry.get("demo") is first
+
+
+def test_hot_reload_after_interval(tmp_path):
+    clock = _Clock()
+    _write(tmp_path / "demo.yaml", mtime_ns=1_000_000_000)
+    registry = DefinitionRegistry(tmp_path, reload_seconds=5, clock=clock)
+    first = registry.get("demo")
+
+    _write(tmp_path / "demo.yaml", purpose="Second", mtime_ns=2_000_000_000)
+    clock.now = 4
+    assert registry.get("demo") is first
+
+    clock.now = 6
+    updated = registry.get("demo")
+    assert updated.spec["purpose"] == "Second"
+    assert updated.content_hash != first.content_hash
+
+
+def test_invalid_edit_keeps_last_good_definition(tmp_path):
+    _write(tmp_path / "demo.yaml", mtime_ns=1_000_000_000)
+    registry = DefinitionRegistry(tmp_path, reload_seconds=0)
+    first = registry.get("demo")
+
+    (tmp_path / "demo.yaml").write_text("name: [unclosed\n")
+    assert registry.reload() == []
+    assert registry.get("demo") is first
+
+
+def test_removed_file_is_dropped(tmp_path):
+    _write(tmp_path / "demo.yaml")
+    registry = DefinitionRegistry(tmp_path, reload_seconds=0)
+    assert registry.names() == ["demo"]
+
+    (tmp_path / "demo.yaml").unlink()
+    assert registry.reload() == ["demo"]
+    assert registry.get("demo") is None
+
+
+def test_routers_share_one_orchestrator():
+    assert agents.orchestrator is leads.orchestrator is get_orchestrator()
+    assert "intake_specialist" in get_orchestrator().available_agents()
+
+
+def test_reload_endpoint(client, auth_headers, staff_headers):
+    response = client.post("/agents/definitions/reload", headers=auth_headers)
+    assert response.status_code == 200
+    assert "intake_specialist" in response.json()["agents"]
+    assert client.post("/agents/definitions/reload", headers=staff_headers).status_code == 403
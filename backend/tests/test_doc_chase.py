@@ -0,0 +1,53 @@
+"""Tests for the doc chase cadence service."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import Matter, MessageDraft, ReminderCadence
+from app.services.doc_chase import check_doc_reminders
+from tests.test_pilot_kpis import count_queries
+
+
+def _docs_pending_matter(db, tenant_id, age_hours: int) -> Matter:
+    matter = Matter(
+        tenant_id=tenant_id, type="mx_divorce", jurisdiction="MX",
+        urgency_score=50, status="open", pipeline_stage="docs_pending",
+    )
+    db.add(matter)
+    db.commit()
+    matter.created_at = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+    db.commit()
+    return matter
+
+
+def test_doc_reminder_respects_cooldown(db, seed_tenant):
+    matter = _docs_pending_matter(db, seed_tenant.id, 50)
+
+    assert len(check_doc_reminders(db, seed_tenant.id)) == 1
+    assert check_doc_reminders(db, seed_tenant.id) == []
+
+    cadence = db.query(ReminderCadence).filter(ReminderCadence.matter_id == matter.id).one()
+    assert cadence.channel == "email"
+    assert cadence.reminder_count == 1
+
+    cadence.last_sent_at = datetime.now(timezone.utc) - timedelta(hours=25)
+    db.commit()
+    assert len(check_doc_reminders(db, seed_tenant.id)) == 1
+    db.refresh(cadence)
+    assert cadence.reminder_count == 2
+    assert db.query(MessageDraft).filter(MessageDraft.matter_id == matter.id).count() == 2
+
+
+def test_doc_reminder_reads_do_not_scale_with_matters(db, seed_tenant):
+    _docs_pending_matter(db, seed_tenant.id, 50)
+    with count_queries() as few:
+        check_doc_reminders(db, seed_tenant.id)
+
+    for _ in range(10):
+        _docs_pending_matter(db, seed_tenant.id, 50)
+    with count_queries() as many:
+        check_doc_reminders(db, seed_tenant.id)
+
+    def reads(statements):
+        return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+    assert len(reads(many)) == len(reads(few))
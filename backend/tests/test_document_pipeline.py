@@ -0,0 +1,236 @@
+"""Tests for background document processing: extraction, classification, retries and the worker pool."""
+
+import asyncio
+import uuid
+import zlib
+from datetime import timedelta
+
+import pytest
+
+from app.config import settings
+from app.models import Document, DocumentMetadata
+from app.services.document_extract import classify_kind, pdf_page_count, pdf_parts, pdf_text, sniff_mime
+from app.services.document_pipeline import DocumentPipeline
+from app.services.reminder_cadence import utcnow
+from tests.conftest import TestSession, upload_document
+
+
+def _pdf(pages: list[bytes], compress: bool = True) -> bytes:
+    """A minimal PDF: one content stream per page, optionally FlateDecode-compressed."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    for i, content in enumerate(pages):
+        objects.append(f"<< /Type /Page /Parent 2 0 R /Contents {4 + 2 * i} 0 R >>".encode())
+        body = zlib.compress(content) if compress else content
+        flt = b" /Filter /FlateDecode" if compress else b""
+        objects.append(b"<< /Length %d%s >>\nstream\n%s\nendstream" % (len(body), flt, body))
+    out = b"%PDF-1.7\n"
+    for n, obj in enumerate(objects, 1):
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, obj)
+    return out + b"trailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+
+ACTA = _pdf([
+    b"BT /F1 12 Tf 72 720 Td (ACTA DE MATRIMONIO) Tj 0 -14 Td [(Contra) -20 (yentes:) -300 (Ana)] TJ ET",
+    b"BT /F1 12 Tf 72 720 Td (Registro Civil \\(CDMX\\)) Tj ET",
+])
+
+
+@pytest.fixture
+def matter_type():
+    return "mx_divorce"
+
+
+def _upload(client, auth_headers, matter, data, **kwargs) -> uuid.UUID:
+    return uuid.UUID(upload_document(client, auth_headers, matter, data, **kwargs)["id"])
+
+
+def test_pdf_page_count_and_text():
+    for compress in (True, False):
+        pdf = _pdf([b"BT (uno) Tj ET", b"BT (dos) Tj ET", b"BT (tres) Tj ET"], compress)
+        assert pdf_page_count(pdf) == 3
+        assert pdf_text(pdf) == "uno\ndos\ntres"
+    assert pdf_text(ACTA) == "ACTA DE MATRIMONIO\nContrayentes: Ana\nRegistro Civil (CDMX)"
+
+
+def _bomb_pdf(first_page: bytes, inflated_mb: int = 64) -> bytes:
+    """A readable first page, then a content stream of ``inflated_mb`` MiB of zeros (~64 KiB deflated)."""
+    deflate = zlib.compressobj(9)
+    zeros = b"\0" * (1024 * 1024)
+    bomb = b"".join(deflate.compress(zeros) for _ in range(inflated_mb)) + deflate.flush()
+    pdf = _pdf([first_page, b"placeholder"])
+    body = b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(bomb), bomb)
+    start = pdf.index(b"6 0 obj\n") + len(b"6 0 obj\n")
+    return pdf[:start] + body + pdf[pdf.index(b"\nendobj", start):]
+
+
+def test_deflate_bomb_stops_at_inflate_budget():
+    pdf = _bomb_pdf(b"BT (ACTA DE MATRIMONIO) Tj ET")
+    parts = pdf_parts(pdf, max_inflated=1024 * 1024)
+    assert parts.truncated
+    assert sum(len(s) for s in parts.streams) <= 1024 * 1024
+    assert pdf_page_count(parts) == 2
+    assert pdf_text(parts) == "ACTA DE MATRIMONIO"
+    assert not pdf_parts(ACTA).truncated
+
+
+def test_sniff_mime():
+    assert sniff_mime(ACTA) == "application/pdf"
+    assert sniff_mime(b"\x89PNG\r\n\x1a\n....") == "image/png"
+    assert sniff_mime(b"\xff\xd8\xff\xe0") == "image/jpeg"
+    assert sniff_mime(b"hello", "notes.txt") == "text/plain"
+
+
+def test_classify_kind_against_vertical_template():
+    ine = classify_kind("mx_divorce", "IMG_2041.jpg", "INSTITUTO NACIONAL ELECTORAL\nCREDENCIAL PARA VOTAR")
+    assert ine.kind == "ine_pasaporte"
+    assert ine.confidence >= 0.6
+
+    by_name = classify_kind("mx_labor", "recibos_nomina_marzo.pdf", None)
+    assert by_name.kind == "recibos_nomina"
+    # Keys outside the matter's vertical are not candidates
+    assert classify_kind("mx_labor", "acta_matrimonio.pdf", None).kind != "acta_matrimonio"
+    assert classify_kind("mx_divorce", "scan.pdf", "").kind is None
+
+
+def test_process_stores_metadata_and_fixes_kind(client, db, auth_headers, matter, upload_dir):
+    doc_id = _upload(client, auth_headers, matter, ACTA)
+    pipeline = DocumentPipeline(session_factory=TestSession)
+
+    meta = asyncio.run(pipeline.process(doc_id))
+    assert (meta.status, meta.mime_type, meta.page_count) == ("done", "application/pdf", 2)
+    assert meta.text.startswith("ACTA DE MATRIMONIO")
+    assert meta.suggested_kind == "acta_matrimonio"
+    assert set(meta.timings_json) == {"load", "fetch", "detect", "pages", "text", "classify"}
+    db.expire_all()
+    assert db.get(Document, doc_id).kind == "acta_matrimonio"
+
+    response = client.get(f"/documents/{doc_id}/metadata", headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.json()["page_count"], response.json()["kind"]) == (2, "acta_matrimonio")
+
+
+def test_deflate_bomb_is_processed_as_truncated(client, db, auth_headers, matter, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_PIPELINE_MAX_TEXT_CHARS", 1000)  # 50 KB inflate budget
+    doc_id = _upload(client, auth_headers, matter, _bomb_pdf(b"BT (ACTA DE MATRIMONIO) Tj ET"))
+
+    meta = asyncio.run(DocumentPipeline(session_factory=TestSession).process(doc_id))
+    assert (meta.status, meta.truncated, meta.page_count) == ("done", True, 2)
+    assert meta.text == "ACTA DE MATRIMONIO"
+    assert client.get(f"/documents/{doc_id}/metadata", headers=auth_headers).json()["truncated"] is True
+
+
+def test_client_kind_from_template_is_kept(client, db, auth_headers, matter, upload_dir):
+    doc_id = _upload(client, auth_headers, matter, ACTA, kind="actas_hijos")
+    meta = asyncio.run(DocumentPipeline(session_factory=TestSession).process(doc_id))
+    assert meta.suggested_kind == "acta_matrimonio"
+    db.expire_all()
+    assert db.get(Document, doc_id).kind == "actas_hijos"
+
+
+def test_reprocessing_is_idempotent_and_same_content_reused(client, db, auth_headers, matter, upload_dir):
+    first = _upload(client, auth_headers, matter, ACTA)
+    second = _upload(client, auth_headers, matter, ACTA, name="copy.pdf")
+    pipeline = DocumentPipeline(session_factory=TestSession)
+
+    async def scenario():
+        await pipeline.process(first)
+        again = await pipeline.process(first)
+        (upload_dir / "blobs").rename(upload_dir / "gone")  # the copy must not need the bytes
+        return again, await pipeline.process(second)
+
+    again, copy = asyncio.run(scenario())
+    assert again is None
+    assert (copy.page_count, copy.suggested_kind) == (2, "acta_matrimonio")
+    assert "fetch" not in copy.timings_json
+    assert (pipeline.counts["processed"], pipeline.counts["skipped"], pipeline.counts["reused"]) == (2, 1, 1)
+
+
+def test_failures_are_retried_then_marked_failed(db, matter):
+    doc = Document(tenant_id=matter.tenant_id, matter_id=matter.id, filename="gone.pdf",
+                   storage_uri="local://uploads/gone.pdf")
+    db.add(doc)
+    db.commit()
+    pipeline = DocumentPipeline(session_factory=TestSession, workers=1, max_attempts=3,
+                                retry_base_seconds=0.01, sweep_seconds=60)
+
+    async def scenario():
+        await pipeline.start()
+        try:
+            for _ in range(200):
+                if pipeline.counts["failed"]:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pipeline.stop()
+
+    asyncio.run(scenario())
+    assert (pipeline.counts["retried"], pipeline.counts["failed"]) == (2, 1)
+    meta = db.get(DocumentMetadata, doc.id)
+    assert (meta.status, meta.attempts) == ("failed", 3)
+    assert "ObjectNotFound" in meta.error
+
+
+def test_documents_claimed_elsewhere_are_skipped_until_the_claim_expires(client, db, auth_headers, matter, upload_dir):
+    doc_id = _upload(client, auth_headers, matter, ACTA)
+    db.add(DocumentMetadata(document_id=doc_id, tenant_id=matter.tenant_id, status="processing",
+                            claimed_at=utcnow(), attempts=0))
+    db.commit()
+    pipeline = DocumentPipeline(session_factory=TestSession, claim_seconds=60)
+
+    assert asyncio.run(pipeline.process(doc_id)) is None
+    assert pipeline._unprocessed() == []
+    assert pipeline.counts["skipped"] == 1
+
+    db.get(DocumentMetadata, doc_id).claimed_at = utcnow() - timedelta(minutes=5)
+    db.commit()
+    assert pipeline._unprocessed() == [doc_id]
+    meta = asyncio.run(pipeline.process(doc_id))
+    assert (meta.status, meta.page_count, meta.claimed_at) == ("done", 2, None)
+
+
+def test_failure_does_not_overwrite_done_results(client, db, auth_headers, matter, upload_dir):
+    doc_id = _upload(client, auth_headers, matter, ACTA)
+    pipeline = DocumentPipeline(session_factory=TestSession)
+    asyncio.run(pipeline.process(doc_id))
+
+    assert pipeline._record_failure(doc_id, "IntegrityError: duplicate key") is None
+    db.expire_all()
+    meta = db.get(DocumentMetadata, doc_id)
+    assert (meta.status, meta.attempts, meta.error) == ("done", 1, None)
+
+
+def test_worker_pool_sweeps_unprocessed_documents(client, db, auth_headers, matter, upload_dir):
+    curp = b"BT (CURP - Clave Unica de Registro de Poblacion) Tj ET"
+    ids = [_upload(client, auth_headers, matter, _pdf([curp] * (i + 1))) for i in range(5)]
+    # One worker: the test database is a single shared SQLite connection.
+    # The queue holds 2, so the sweep has to wait for room
+    pipeline = DocumentPipeline(session_factory=TestSession, workers=1, queue_size=2, sweep_seconds=60)
+
+    async def scenario():
+        await pipeline.start()
+        try:
+            for _ in range(300):
+                if pipeline.counts["processed"] == len(ids):
+                    break
+                await asyncio.sleep(0.01)
+            await pipeline.drain()
+            return pipeline.stats()
+        finally:
+            await pipeline.stop()
+
+    stats = asyncio.run(scenario())
+    assert stats["processed"] == 5
+    assert stats["stages"]["text"]["count"] == 5
+    pages = dict(db.query(DocumentMetadata.document_id, DocumentMetadata.page_count).all())
+    assert [pages[i] for i in ids] == [1, 2, 3, 4, 5]
+    db.expire_all()
+    assert {d.kind for d in db.query(Document).all()} == {"curp"}
+
+
+def test_processing_stats_are_admin_only(client, auth_headers, staff_headers):
+    assert client.get("/documents/processing/stats", headers=staff_headers).status_code == 403
+    response = client.get("/documents/processing/stats", headers=auth_headers)
+    assert response.status_code == 200
+    assert "queued" in response.json()
@@ -0,0 +1,90 @@
+"""Tests for the content-addressed document store (dedup, reference counts, GC, migration)."""
+
+import asyncio
+import hashlib
+import io
+import os
+
+from app.models import Document, DocumentBlob
+from app.services.document_store import blob_key, collect_garbage, migrate_legacy_uploads, store_blob
+from app.storage import get_storage
+from tests.conftest import upload_document
+
+
+def _blob_files(root):
+    return sorted(name for _, _, files in os.walk(root / "blobs") for name in files)
+
+
+def test_repeat_upload_is_stored_once(client, db, auth_headers, matter, upload_dir):
+    data = os.urandom(5000)
+    first = upload_document(client, auth_headers, matter, data, name="ine.pdf")
+    second = upload_document(client, auth_headers, matter, data, name="ine (1).pdf")
+
+    assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+    assert first["storage_uri"] == second["storage_uri"]
+    assert _blob_files(upload_dir) == [hashlib.sha256(data).hexdigest()]
+    assert db.get(DocumentBlob, first["sha256"]).ref_count == 2
+
+
+def test_non_seekable_source_is_deduplicated(upload_dir):
+    class _Pipe(io.BytesIO):
+        def seekable(self):
+            return False
+
+    first = asyncio.run(store_blob(_Pipe(b"acta de nacimiento")))
+    second = asyncio.run(store_blob(_Pipe(b"acta de nacimiento")))
+    assert (first.created, second.created) == (True, False)
+    assert _blob_files(upload_dir) == [first.sha256]
+
+
+def test_gc_deletes_unreferenced_blobs_and_orphans(client, db, auth_headers, matter, upload_dir):
+    kept = upload_document(client, auth_headers, matter, b"kept")
+    dropped = upload_document(client, auth_headers, matter, b"dropped")
+    orphan = asyncio.run(store_blob(io.BytesIO(b"never committed")))
+
+    db.delete(db.query(Document).filter(Document.sha256 == dropped["sha256"]).one())
+    db.commit()
+    assert db.get(DocumentBlob, dropped["sha256"]).ref_count == 0
+
+    assert asyncio.run(collect_garbage(db)) == {}  # everything is within the grace period
+    stats = asyncio.run(collect_garbage(db, grace_seconds=-1, dry_run=True))
+    assert (stats["blobs_deleted"], stats["orphans_deleted"]) == (1, 1)
+    assert len(_blob_files(upload_dir)) == 3
+
+    asyncio.run(collect_garbage(db, grace_seconds=-1))
+    assert _blob_files(upload_dir) == [kept["sha256"]]
+    assert db.get(DocumentBlob, dropped["sha256"]) is None
+    assert not os.path.exists(get_storage().local_path(blob_key(orphan.sha256)))
+
+
+def test_gc_fixes_drifted_refcounts(client, db, auth_headers, matter, upload_dir):
+    doc = upload_document(client, auth_headers, matter, b"ine")
+    db.get(DocumentBlob, doc["sha256"]).ref_count = 7
+    db.commit()
+
+    assert asyncio.run(collect_garbage(db, grace_seconds=-1))["refcounts_fixed"] == 1
+    assert db.get(DocumentBlob, doc["sha256"]).ref_count == 1
+    assert _blob_files(upload_dir) == [doc["sha256"]]
+
+
+def test_migrate_legacy_uploads(db, matter, upload_dir):
+    docs = []
+    for i, data in enumerate([b"curp", b"curp", b"acta"]):
+        name = f"legacy{i}_file.pdf"
+        (upload_dir / name).write_bytes(data)
+        docs.append(Document(tenant_id=matter.tenant_id, matter_id=matter.id, filename=name,
+                             storage_uri=f"local://uploads/{name}"))
+    docs.append(Document(tenant_id=matter.tenant_id, matter_id=matter.id, filename="gone.pdf",
+                         storage_uri="local://uploads/gone.pdf"))
+    db.add_all(docs)
+    db.commit()
+
+    stats = asyncio.run(migrate_legacy_uploads(db, batch_size=2))
+    assert (stats["migrated"], stats["stored"], stats["deduplicated"], stats["missing"]) == (3, 2, 1, 1)
+
+    curp = hashlib.sha256(b"curp").hexdigest()
+    assert docs[0].storage_uri == docs[1].storage_uri == f"local://uploads/{blob_key(curp)}"
+    assert docs[3].storage_uri == "local://uploads/gone.pdf"
+    assert db.get(DocumentBlob, curp).ref_count == 2
+    assert sorted(os.listdir(upload_dir)) == ["blobs"]
+    assert open(get_storage().local_path(blob_key(curp)), "rb").read() == b"curp"
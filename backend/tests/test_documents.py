@@ -0,0 +1,169 @@
+"""Tests for document uploads."""
+
+import hashlib
+import io
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.models import Document
+from app.uploads import UploadTooLarge, write_stream
+from tests.conftest import upload_document
+
+
+class _CountingReader(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads: list[int] = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+def test_write_stream_hashes_in_chunks(tmp_path):
+    data = os.urandom(10_000)
+    source = _CountingReader(data)
+
+    stored = write_stream(source, str(tmp_path / "a.bin"), chunk_size=4096)
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "a.bin").read_bytes() == data
+    assert set(source.reads) == {4096}
+    assert os.listdir(tmp_path) == ["a.bin"]
+
+
+def test_write_stream_stops_at_limit(tmp_path):
+    source = _CountingReader(b"x" * 10_000)
+
+    with pytest.raises(UploadTooLarge):
+        write_stream(source, str(tmp_path / "big.bin"), max_bytes=5000, chunk_size=1000)
+    assert len(source.reads) == 6  # abandoned right after crossing the limit
+    assert os.listdir(tmp_path) == []
+
+
+def test_upload_endpoint_streams_to_disk(client, db, auth_headers, matter, upload_dir):
+    data = b"%PDF-1.4 " + os.urandom(3000)
+    response = client.post(
+        "/documents/upload", headers=auth_headers,
+        data={"matter_id": str(matter.id), "kind": "id_document"},
+        files={"file": ("ine.pdf", data, "application/pdf")},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    digest = hashlib.sha256(data).hexdigest()
+    assert body["size_bytes"] == len(data)
+    assert body["sha256"] == digest
+    assert body["storage_uri"] == f"local://uploads/blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert (upload_dir / "blobs" / digest[:2] / digest[2:4] / digest).read_bytes() == data
+    assert db.query(Document).one().sha256 == digest
+
+
+def test_upload_over_limit_is_rejected(client, db, auth_headers, matter, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1000)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 256)
+
+    response = client.post(
+        "/documents/upload", headers=auth_headers,
+        data={"matter_id": str(matter.id)},
+        files={"file": ("scan.pdf", b"x" * 5000, "application/pdf")},
+    )
+    assert response.status_code == 413
+    assert [files for _, _, files in os.walk(upload_dir) if files] == []
+    assert db.query(Document).count() == 0
+
+
+def test_download_streams_whole_file(client, auth_headers, matter, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 1000)
+    data = os.urandom(4500)
+    doc = upload_document(client, auth_headers, matter, data, name="acta de nacimiento.pdf")
+
+    response = client.get(f"/documents/{doc['id']}/download", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-length"] == str(len(data))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == f'"{doc["sha256"]}"'
+    assert response.headers["content-disposition"] == "attachment; filename*=utf-8''acta%20de%20nacimiento.pdf"
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=4000-", 4000, 4499),
+    ("bytes=-500", 4000, 4499),
+    ("bytes=4400-9999", 4400, 4499),
+])
+def test_download_range(client, auth_headers, matter, upload_dir, header, start, end):
+    data = os.urandom(4500)
+    doc = upload_document(client, auth_headers, matter, data)
+
+    response = client.get(f"/documents/{doc['id']}/download", headers={**auth_headers, "Range": header})
+    assert response.status_code == 206
+    assert response.content == data[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/4500"
+
+
+def test_download_unsatisfiable_or_ignored_ranges(client, auth_headers, matter, upload_dir):
+    doc = upload_document(client, auth_headers, matter, b"x" * 100)
+    url = f"/documents/{doc['id']}/download"
+
+    response = client.get(url, headers={**auth_headers, "Range": "bytes=100-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */100"
+    # Multiple ranges: serving the whole file is allowed
+    assert client.get(url, headers={**auth_headers, "Range": "bytes=0-1,5-6"}).status_code == 200
+
+
+def test_download_requires_auth_and_stored_file(client, db, auth_headers, matter, upload_dir):
+    doc = upload_document(client, auth_headers, matter, b"secret")
+    other = Document(tenant_id=matter.tenant_id, matter_id=matter.id, filename="gone.pdf",
+                     storage_uri="local://uploads/gone.pdf")
+    db.add(other)
+    db.commit()
+
+    assert client.get(f"/documents/{doc['id']}/download").status_code in (401, 403)
+    assert client.get(f"/documents/{other.id}/download", headers=auth_headers).status_code == 404
+
+
+@pytest.mark.parametrize("matter_type", ["mx_divorce"])
+def test_bulk_upload_commits_once_with_per_file_results(client, db, auth_headers, matter, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1000)
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+
+    files = [
+        ("files", ("acta.pdf", b"acta" * 10, "application/pdf")),
+        ("files", ("video.mp4", b"x" * 5000, "video/mp4")),
+        ("files", ("ine.jpg", b"ine" * 10, "image/jpeg")),
+        ("files", ("curp.pdf", b"curp" * 10, "application/pdf")),
+    ]
+    response = client.post(
+        "/documents/upload/bulk", headers=auth_headers, files=files,
+        data={"matter_id": str(matter.id), "kinds": ["acta_matrimonio", "other", "ine_pasaporte", "curp"]},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["uploaded"], body["rejected"]) == (3, 1)
+    assert [d["filename"] for d in body["documents"]] == ["acta.pdf", "video.mp4", "ine.jpg", "curp.pdf"]
+    assert body["documents"][1]["status"] == "rejected"
+    assert [d["kind"] for d in body["documents"] if d["status"] == "uploaded"] == [
+        "acta_matrimonio", "ine_pasaporte", "curp"]
+    assert len(commits) == 1
+    assert db.query(Document).count() == 3
+    completeness = body["completeness"]
+    assert completeness["docs_uploaded"] == 3
+    assert "Comprobante de domicilio reciente (< 3 meses)" in completeness["docs_missing"]
+
+
+def test_bulk_upload_validation(client, auth_headers, matter, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_BULK_MAX_FILES", 2)
+    files = [("files", (f"{i}.pdf", b"x", "application/pdf")) for i in range(3)]
+    data = {"matter_id": str(matter.id)}
+    assert client.post("/documents/upload/bulk", headers=auth_headers, files=files, data=data).status_code == 422
+    assert client.post("/documents/upload/bulk", headers=auth_headers, files=files[:2],
+                       data={**data, "kinds": ["curp"]}).status_code == 422
+    other = {"matter_id": "00000000-0000-0000-0000-0000000000ff"}
+    assert client.post("/documents/upload/bulk", headers=auth_headers, files=files[:2], data=other).status_code == 404
@@ -1,5 +1,13 @@
 """Test: public event tracking endpoint."""
 
+import uuid
+
+import pytest
+
+from app.models import Event
+from app.services.event_buffer import EventBuffer, EventBufferFull
+from tests.conftest import TestSession
+
 
 def test_track_event_creates_event(client):
     """POST /events/track should create an event without auth."""
@@ -53,3 +61,75 @@ def test_track_multiple_events(client):
     })
     assert last.status_code == 201
     assert last.json()["name"] == "intake_submitted"
+
+
+# ---------------------------------------------------------------------------
+# Batch ingestion + write-behind buffer
+# ---------------------------------------------------------------------------
+
+def test_track_batch_inserts_all_events(client, db):
+    """POST /events/track/batch stores every event in the array."""
+    events = [
+        {"anonymous_id": "anon_batch", "name": "page_view", "properties": {"path": f"/p{i}"}}
+        for i in range(25)
+    ]
+    response = client.post("/events/track/batch", json=events)
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 25, "buffered": False}
+    assert db.query(Event).filter(Event.anonymous_id == "anon_batch").count() == 25
+
+
+def test_track_batch_rejects_oversized_batch(client):
+    events = [{"anonymous_id": "anon_big", "name": "page_view"}] * 501
+    response = client.post("/events/track/batch", json=events)
+    assert response.status_code == 413
+
+
+def test_track_batch_validates_each_event(client):
+    response = client.post("/events/track/batch", json=[
+        {"anonymous_id": "anon_ok", "name": "page_view"},
+        {"name": "missing_anon"},
+    ])
+    assert response.status_code == 422
+
+
+def test_event_buffer_flushes_on_size_and_drains_on_stop(db):
+    buffer = EventBuffer(session_factory=TestSession, flush_size=10, flush_interval=60)
+    buffer.start()
+    buffer.submit([{"anonymous_id": "anon_buf", "name": "page_view", "properties_json": {}}] * 25)
+    buffer.stop()
+
+    assert buffer.flushed == 25
+    assert buffer.dropped == 0
+    assert buffer.flushes >= 3
+    assert db.query(Event).filter(Event.anonymous_id == "anon_buf").count() == 25
+
+
+def test_event_buffer_applies_backpressure():
+    buffer = EventBuffer(session_factory=TestSession, max_pending=5, flush_size=100)
+    buffer.submit([{"anonymous_id": "a", "name": "x"}] * 5)
+    with pytest.raises(EventBufferFull):
+        buffer.submit([{"anonymous_id": "a", "name": "x"}], timeout=0.01)
+    assert buffer.stats()["pending"] == 5
+
+
+def test_track_batch_nulls_unknown_tenant_and_user(client, db, seed_tenant):
+    response = client.post("/events/track/batch", json=[
+        {"anonymous_id": "anon_ids", "name": "page_view", "tenant_id": str(seed_tenant.id)},
+        {"anonymous_id": "anon_ids", "name": "page_view", "tenant_id": str(uuid.uuid4()),
+         "user_id": str(uuid.uuid4())},
+    ])
+    assert response.status_code == 202
+    rows = db.query(Event.tenant_id, Event.user_id).filter(Event.anonymous_id == "anon_ids").all()
+    assert sorted(rows, key=lambda r: r[0] is None) == [(seed_tenant.id, None), (None, None)]
+
+
+def test_event_buffer_drops_only_invalid_rows(db):
+    buffer = EventBuffer(session_factory=TestSession, flush_size=100, flush_interval=60)
+    good = {"anonymous_id": "anon_mixed", "name": "page_view", "properties_json": {}}
+    buffer.submit([good, {"anonymous_id": "anon_mixed", "name": None}, good])
+    buffer.start()
+    buffer.stop()
+
+    assert (buffer.flushed, buffer.dropped) == (2, 1)
+    assert db.query(Event).filter(Event.anonymous_id == "anon_mixed").count() == 2
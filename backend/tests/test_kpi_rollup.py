@@ -0,0 +1,129 @@
+"""Tests for incremental KPI rollups behind /app/analytics/overview."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from statistics import median
+
+from app.models import Approval, Event, Intake, KpiDailyRollup, KpiTtaBucket, Lead, Matter, Tenant
+from app.services.event_buffer import insert_events
+from app.services.kpi_rollup import backfill_rollups, tta_bucket, tta_median
+
+
+def _rollup_totals(db, tenant_id) -> dict:
+    rows = db.query(KpiDailyRollup).filter(KpiDailyRollup.tenant_id == tenant_id).all()
+    totals = {}
+    for row in rows:
+        for col in ("intakes", "matters", "approvals_requested", "approvals_approved",
+                    "approvals_rejected", "leads", "events"):
+            totals[col] = totals.get(col, 0) + getattr(row, col)
+    return totals
+
+
+def _seed_activity(db, tenant_id):
+    intake = Intake(tenant_id=tenant_id, channel="web", raw_payload_json={}, status="new")
+    db.add(intake)
+    db.flush()
+    matter = Matter(tenant_id=tenant_id, intake_id=intake.id, type="mx_divorce", status="open")
+    db.add(matter)
+    db.flush()
+    approvals = [
+        Approval(tenant_id=tenant_id, matter_id=matter.id, object_type="agent_run",
+                 object_id=uuid.uuid4(), status="pending")
+        for _ in range(4)
+    ]
+    db.add_all(approvals)
+    db.add(Lead(tenant_id=tenant_id, source_type="b2c_prepkit", status="new", contact_json={}))
+    db.add(Event(tenant_id=tenant_id, anonymous_id="anon", name="page_view", properties_json={}))
+    db.commit()
+
+    # Decide: approve two (2h and 4h to approve), reject one, leave one pending
+    now = datetime.now(timezone.utc)
+    for approval, hours in zip(approvals[:2], (2, 4)):
+        approval.created_at = (now - timedelta(hours=hours)).replace(tzinfo=None)
+    db.commit()
+    for approval in approvals[:2]:
+        approval.status = "approved"
+        approval.decided_at = now
+    approvals[2].status = "rejected"
+    approvals[2].decided_at = now
+    db.commit()
+
+
+def test_rollups_follow_orm_writes(db, seed_tenant):
+    _seed_activity(db, seed_tenant.id)
+
+    assert _rollup_totals(db, seed_tenant.id) == {
+        "intakes": 1, "matters": 1, "approvals_requested": 4,
+        "approvals_approved": 2, "approvals_rejected": 1, "leads": 1, "events": 1,
+    }
+
+
+def test_overview_reads_rollups(client, db, seed_tenant, seed_user, auth_headers):
+    _seed_activity(db, seed_tenant.id)
+
+    data = client.get("/app/analytics/overview?days=7", headers=auth_headers).json()
+    assert data["intakes_total"] == 1
+    assert data["matters_total"] == 1
+    assert data["approvals_pending"] == 1
+    assert data["approvals_approved"] == 2
+    assert data["approvals_rejected"] == 1
+    assert data["leads_total"] == 1
+    assert data["events_total"] == 1
+    assert data["time_to_approve_median_hours"] == 3.0
+
+
+def test_decision_with_unloaded_created_at_is_sampled(db, seed_tenant):
+    approval = Approval(tenant_id=seed_tenant.id, object_type="agent_run", object_id=uuid.uuid4(),
+                        status="pending", created_at=datetime(2024, 1, 1, 8))
+    db.add(approval)
+    db.commit()
+
+    db.refresh(approval)
+    db.expire(approval, ["created_at"])
+    approval.status = "approved"
+    approval.decided_at = datetime(2024, 1, 1, 10)
+    db.commit()
+
+    buckets = db.query(KpiTtaBucket).filter(KpiTtaBucket.tenant_id == seed_tenant.id).all()
+    assert [(b.bucket, b.count) for b in buckets] == [(tta_bucket(2.0), 1)]
+
+
+def test_lead_reroute_moves_count(db, seed_tenant):
+    other = Tenant(name="Partner", settings_json={})
+    db.add(other)
+    lead = Lead(tenant_id=seed_tenant.id, source_type="b2c_prepkit", status="new", contact_json={})
+    db.add(lead)
+    db.commit()
+
+    lead.tenant_id = other.id
+    db.commit()
+
+    assert _rollup_totals(db, seed_tenant.id).get("leads") == 0
+    assert _rollup_totals(db, other.id).get("leads") == 1
+
+
+def test_bulk_event_insert_is_counted(db, seed_tenant):
+    insert_events(db, [
+        {"tenant_id": seed_tenant.id, "anonymous_id": "a", "name": "page_view", "properties_json": {}},
+        {"tenant_id": None, "anonymous_id": "b", "name": "page_view", "properties_json": {}},
+    ])
+    db.commit()
+    assert _rollup_totals(db, seed_tenant.id)["events"] == 1
+
+
+def test_backfill_matches_incremental(db, seed_tenant):
+    _seed_activity(db, seed_tenant.id)
+    incremental = _rollup_totals(db, seed_tenant.id)
+
+    backfill_rollups(db, seed_tenant.id)
+    assert _rollup_totals(db, seed_tenant.id) == incremental
+
+
+def test_tta_digest_median_within_one_percent():
+    samples = [0.5, 1.2, 3.3, 7.9, 26.0, 48.5, 100.0]
+    buckets: dict[int, int] = {}
+    for h in samples:
+        buckets[tta_bucket(h)] = buckets.get(tta_bucket(h), 0) + 1
+    estimate = tta_median(list(buckets.items()))
+    assert abs(estimate - median(samples)) <= median(samples) * 0.01
+    assert tta_median([]) is None
@@ -0,0 +1,209 @@
+"""Tests for the pooled OpenAI client: retries, circuit breaker and metrics, against a local stub server."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from app.agents.llm_resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LLMUnavailable, RetryPolicy
+from app.agents.openai_llm import OpenAIProvider
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.response_cache import MemoryResponseCache
+from app.config import settings
+
+TEXT = "Case summary ready for review."
+DROP = "drop"  # stream the first chunk, then close the connection
+SSE_ERROR = "sse_error"  # stream the first chunk, then an SSE error event
+
+
+class _StubOpenAI:
+    """Serves /v1/chat/completions; ``script`` holds status codes (or DROP / SSE_ERROR) for the next requests."""
+
+    def __init__(self):
+        self.script: list[int | str] = []
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests += 1
+                status = stub.script.pop(0) if stub.script else 200
+                if status not in (200, DROP, SSE_ERROR):
+                    return self._send(status, "application/json", json.dumps(
+                        {"error": {"message": "stub failure", "type": "server_error"}}).encode(),
+                        {"retry-after": "0"})
+                if body.get("stream"):
+                    events = [
+                        {"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+                        for word in (TEXT[:13], TEXT[13:])
+                    ]
+                    payload = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+                    if status == DROP:  # promise the whole payload, send one event
+                        first = f"data: {json.dumps(events[0])}\n\n".encode()
+                        return self._send(200, "text/event-stream", first, length=len(payload))
+                    if status == SSE_ERROR:
+                        error = {"error": {"message": "upstream overloaded", "type": "server_error"}}
+                        payload = f"data: {json.dumps(events[0])}\n\ndata: {json.dumps(error)}\n\n"
+                    return self._send(200, "text/event-stream", payload.encode())
+                return self._send(200, "application/json", json.dumps({
+                    "id": "c1", "object": "chat.completion", "created": 0, "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": stub.content(body)}}],
+                }).encode())
+
+            def _send(self, status, content_type, payload, headers=None, length=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(length or len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def content(body: dict) -> str:
+        if body.get("response_format"):
+            return json.dumps({"checklist_docs": ["From the LLM"], "questions_for_lawyer": [],
+                               "next_steps_informational": [], "disclaimer": "Not legal advice."})
+        return TEXT
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = _StubOpenAI()
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", server.base_url)
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _provider(clock=None, threshold: int = 3) -> OpenAIProvider:
+    return OpenAIProvider(
+        breaker=CircuitBreaker(failure_threshold=threshold, reset_seconds=30, clock=clock or _Clock()),
+        retry=RetryPolicy(max_retries=2, base_seconds=0.001, max_seconds=0.01),
+    )
+
+
+def test_retries_429_and_5xx_then_succeeds(stub):
+    provider = _provider()
+    stub.script = [503, 429]
+
+    assert provider.generate("intake_specialist", "p") == TEXT
+    stats = provider.stats()
+    assert stub.requests == 3
+    assert (stats["calls"], stats["errors"], stats["retries"]) == (3, 2, 2)
+    assert stats["breaker"]["state"] == CLOSED
+    assert sum(stats["latency_buckets"].values()) == 3
+
+
+def test_client_errors_are_not_retried(stub):
+    provider = _provider()
+    stub.script = [400]
+
+    with pytest.raises(openai.BadRequestError):
+        provider.generate("intake_specialist", "p")
+    assert stub.requests == 1
+    assert provider.breaker.failures == 0
+
+
+def test_breaker_opens_and_switches_to_template_path(stub):
+    provider = _provider()
+    stub.script = [500, 500, 500]
+
+    prepkit = provider.generate_prepkit("immigration", "NTA", "en")
+    assert prepkit == provider.template_prepkit("immigration", "en")
+    assert provider.breaker.state == OPEN
+    assert stub.requests == 3
+
+    # While open, nothing goes upstream
+    cache = MemoryResponseCache()
+    output = AgentOrchestrator(cache=cache, llm=provider).run("intake_specialist", {"case_type": "immigration"})
+    assert output["fallback"] == "llm_unavailable"
+    assert output["case_packet"]
+    assert cache.stats()["entries"] == 0
+    assert stub.requests == 3
+    stats = provider.stats()
+    assert (stats["rejected"], stats["fallbacks"], stats["breaker"]["opened"]) == (1, 1, 1)
+
+
+def test_half_open_probe_closes_circuit(stub):
+    clock = _Clock()
+    provider = _provider(clock, threshold=1)
+    stub.script = [500]
+
+    assert provider.generate_prepkit("immigration", "NTA", "en")["checklist_docs"] != ["From the LLM"]
+    assert provider.breaker.state == OPEN
+
+    clock.now = 31
+    assert provider.breaker.allow() is True
+    assert provider.breaker.state == HALF_OPEN
+    assert provider.breaker.allow() is False  # one probe at a time
+    provider.breaker.release()
+
+    assert provider.generate_prepkit("immigration", "NTA", "en")["checklist_docs"] == ["From the LLM"]
+    assert provider.breaker.state == CLOSED
+
+
+def test_async_stream_retries_against_stub(stub):
+    provider = _provider()
+    stub.script = [502]
+    orchestrator = AgentOrchestrator(cache=MemoryResponseCache(), llm=provider)
+
+    output = asyncio.run(orchestrator.arun("intake_specialist", {"case_type": "immigration"}))
+    assert output["case_packet"] == TEXT
+    assert "fallback" not in output
+    assert provider.stats()["retries"] == 1
+
+
+@pytest.mark.parametrize("failure", [DROP, SSE_ERROR])
+def test_stream_failing_mid_response_counts_against_breaker(stub, failure):
+    provider = _provider(threshold=1)
+    stub.script = [failure]
+
+    chunks = []
+    with pytest.raises(LLMUnavailable):
+        for chunk in provider.generate_stream("intake_specialist", "p"):
+            chunks.append(chunk)
+    assert chunks == [TEXT[:13]]
+    stats = provider.stats()
+    assert (stats["calls"], stats["errors"], stats["breaker"]["state"]) == (1, 1, OPEN)
+
+
+def test_async_stream_failing_mid_response_raises_llm_unavailable(stub):
+    provider = _provider()
+    stub.script = [DROP]
+
+    async def consume():
+        return [chunk async for chunk in provider.agenerate_stream("intake_specialist", "p")]
+
+    with pytest.raises(LLMUnavailable):
+        asyncio.run(consume())
+    assert (provider.stats()["errors"], provider.breaker.failures) == (1, 1)
+
+
+def test_llm_stats_endpoint(client, auth_headers, staff_headers):
+    response = client.get("/agents/llm/stats", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["breaker"]["state"] == CLOSED
+    assert client.get("/agents/llm/stats", headers=staff_headers).status_code == 403
@@ -0,0 +1,91 @@
+"""Tests for keyset (cursor) pagination on list endpoints."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from app.models import Approval, Lead, Matter
+
+
+def _add_approvals(db, tenant_id, n: int, created_at: datetime | None = None):
+    base = datetime(2026, 1, 1)
+    for i in range(n):
+        db.add(Approval(
+            tenant_id=tenant_id, object_type="message_draft", object_id=uuid.uuid4(),
+            status="pending", created_at=created_at or base + timedelta(minutes=i),
+        ))
+    db.commit()
+
+
+def _collect(client, path, headers, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        url = f"{path}{'&' if '?' in path else '?'}limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= limit
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items, pages
+
+
+def test_approvals_paginate_newest_first(client, db, seed_tenant, auth_headers):
+    _add_approvals(db, seed_tenant.id, 5)
+
+    items, pages = _collect(client, "/approvals/", auth_headers, limit=2)
+    assert pages == 3
+    created = [a["created_at"] for a in items]
+    assert created == sorted(created, reverse=True)
+    assert len({a["id"] for a in items}) == 5
+
+
+def test_pagination_breaks_created_at_ties_by_id(client, db, seed_tenant, auth_headers):
+    _add_approvals(db, seed_tenant.id, 7, created_at=datetime(2026, 1, 1))
+
+    items, _ = _collect(client, "/approvals/", auth_headers, limit=3)
+    ids = [a["id"] for a in items]
+    assert len(ids) == len(set(ids)) == 7
+
+
+def test_exact_page_has_no_next_cursor(client, db, seed_tenant, auth_headers):
+    for _ in range(2):
+        db.add(Lead(tenant_id=seed_tenant.id, source_type="organic"))
+    db.commit()
+
+    body = client.get("/app/leads?limit=2", headers=auth_headers).json()
+    assert len(body["items"]) == 2
+    assert body["next_cursor"] is None
+
+
+def test_invalid_cursor_and_limit(client, seed_tenant, auth_headers):
+    assert client.get("/approvals/?cursor=not-a-cursor", headers=auth_headers).status_code == 400
+    assert client.get("/approvals/?limit=0", headers=auth_headers).status_code == 422
+    assert client.get("/approvals/?limit=100000", headers=auth_headers).status_code == 422
+
+
+def test_approvals_filter_by_matter(client, db, seed_tenant, auth_headers):
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US")
+    db.add(matter)
+    db.flush()
+    _add_approvals(db, seed_tenant.id, 3)
+    db.add(Approval(tenant_id=seed_tenant.id, matter_id=matter.id, object_type="agent_run",
+                    object_id=uuid.uuid4(), status="approved"))
+    db.commit()
+
+    body = client.get(f"/approvals/?status=&matter_id={matter.id}", headers=auth_headers).json()
+    assert [(a["matter_id"], a["status"]) for a in body["items"]] == [(str(matter.id), "approved")]
+
+
+def test_matters_sorted_by_urgency_across_pages(client, db, seed_tenant, auth_headers):
+    base = datetime(2026, 1, 1)
+    for i, urgency in enumerate([10, 90, 0, 50, 90, 30]):
+        db.add(Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US",
+                      urgency_score=urgency, created_at=base + timedelta(minutes=i)))
+    db.commit()
+
+    items, pages = _collect(client, "/matters/?sort=urgency", auth_headers, limit=4)
+    assert pages == 2
+    assert [m["urgency_score"] for m in items] == [90, 90, 50, 30, 10, 0]
+    assert client.get("/matters/?sort=urgency&cursor=bm9wZQ", headers=auth_headers).status_code == 400
@@ -0,0 +1,58 @@
+"""Tests for /app/analytics/pilot-kpis doc completeness (no N+1 queries)."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.models import Document, Matter
+from tests.conftest import engine
+
+
+@contextmanager
+def count_queries():
+    statements: list[str] = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+
+
+def _add_matters(db, tenant_id, n: int, complete: bool):
+    four_days_ago = (datetime.now(timezone.utc) - timedelta(days=4)).replace(tzinfo=None)
+    for _ in range(n):
+        matter = Matter(tenant_id=tenant_id, type="mx_divorce", jurisdiction="MX", status="open")
+        db.add(matter)
+        db.flush()
+        kinds = ["acta_matrimonio", "ine_pasaporte", "curp", "comprobante_domicilio"]
+        for kind in kinds if complete else kinds[:1]:
+            db.add(Document(tenant_id=tenant_id, matter_id=matter.id, kind=kind, status="uploaded"))
+        matter.created_at = four_days_ago
+    db.commit()
+
+
+def test_doc_completeness_72h_pct(client, db, seed_tenant, seed_user, auth_headers):
+    _add_matters(db, seed_tenant.id, 3, complete=True)
+    _add_matters(db, seed_tenant.id, 1, complete=False)
+
+    response = client.get("/app/analytics/pilot-kpis?days=7", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["doc_completeness_72h_pct"] == 75.0
+
+
+def test_pilot_kpis_query_count_is_constant(client, db, seed_tenant, seed_user, auth_headers):
+    _add_matters(db, seed_tenant.id, 2, complete=True)
+    client.get("/app/analytics/pilot-kpis", headers=auth_headers)  # warm the principal cache
+    with count_queries() as few:
+        assert client.get("/app/analytics/pilot-kpis", headers=auth_headers).status_code == 200
+
+    _add_matters(db, seed_tenant.id, 25, complete=False)
+    with count_queries() as many:
+        assert client.get("/app/analytics/pilot-kpis", headers=auth_headers).status_code == 200
+
+    assert len(many) == len(few)
@@ -4,6 +4,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from app.models import Intake, Matter, Event
+from tests.test_pilot_kpis import count_queries
 
 
 SEED_TENANT = uuid.UUID("00000000-0000-0000-0000-000000000001")
@@ -129,3 +130,74 @@ def test_pipeline_requires_auth(client):
     """Pipeline endpoint requires authentication."""
     resp = client.get("/app/pipeline/")
     assert resp.status_code == 401
+
+
+def _add_docs_pending_matters(db, tenant_id, n: int, with_intake: bool = True):
+    for i in range(n):
+        intake = None
+        if with_intake:
+            intake = Intake(
+                tenant_id=tenant_id, raw_payload_json={"nombre_completo": f"Cliente {i}"},
+                status="converted", pipeline_stage="intake_completed",
+            )
+            db.add(intake)
+            db.flush()
+        db.add(Matter(
+            tenant_id=tenant_id, intake_id=intake.id if intake else None,
+            type="mx_divorce", jurisdiction="MX", urgency_score=i, status="open",
+            pipeline_stage="docs_pending",
+        ))
+    db.commit()
+
+
+def test_pipeline_stage_limit_and_load_more(client, db, seed_tenant, auth_headers):
+    """Columns are capped at ?limit=; the stage cursor pages through the rest in board order."""
+    _add_docs_pending_matters(db, seed_tenant.id, 5)
+
+    data = client.get("/app/pipeline/?limit=2", headers=auth_headers).json()
+    first = data["stages"]["docs_pending"]
+    assert data["stage_counts"]["docs_pending"] == 5
+    assert [c["urgency_score"] for c in first] == [4, 3]
+    assert first[0]["client_name"] == "Cliente 4"
+    assert data["next_cursors"]["docs_pending"]
+    assert data["next_cursors"]["new_lead"] is None
+
+    cursor, rest = data["next_cursors"]["docs_pending"], []
+    while cursor:
+        page = client.get(
+            f"/app/pipeline/stages/docs_pending?limit=2&cursor={cursor}", headers=auth_headers,
+        ).json()
+        rest.extend(page["items"])
+        cursor = page["next_cursor"]
+    assert [c["urgency_score"] for c in rest] == [2, 1, 0]
+
+
+def test_pipeline_unknown_stage_falls_back(client, db, seed_tenant, auth_headers):
+    """Open intakes / matters outside the board land in new_lead / docs_pending."""
+    db.add(Intake(tenant_id=seed_tenant.id, raw_payload_json={"full_name": "Legacy"},
+                  status="new", pipeline_stage="new_intake"))
+    db.add(Matter(tenant_id=seed_tenant.id, type="immigration", urgency_score=10,
+                  pipeline_stage="matter_created"))
+    db.commit()
+
+    data = client.get("/app/pipeline/", headers=auth_headers).json()
+    assert [c["client_name"] for c in data["stages"]["new_lead"]] == ["Legacy"]
+    assert [c["entity_type"] for c in data["stages"]["docs_pending"]] == ["matter"]
+
+    page = client.get("/app/pipeline/stages/new_lead", headers=auth_headers).json()
+    assert [c["client_name"] for c in page["items"]] == ["Legacy"]
+    assert client.get("/app/pipeline/stages/nonexistent", headers=auth_headers).status_code == 400
+
+
+def test_pipeline_query_count_is_constant(client, db, seed_tenant, auth_headers):
+    """The board is one query regardless of how many matters the tenant has."""
+    _add_docs_pending_matters(db, seed_tenant.id, 2)
+    client.get("/app/pipeline/", headers=auth_headers)  # warm the principal cache
+    with count_queries() as few:
+        assert client.get("/app/pipeline/", headers=auth_headers).status_code == 200
+
+    _add_docs_pending_matters(db, seed_tenant.id, 20)
+    with count_queries() as many:
+        assert client.get("/app/pipeline/", headers=auth_headers).status_code == 200
+
+    assert len(many) == len(few)
@@ -85,3 +85,71 @@ def test_policy_annotate_clean_output():
 
     annotated = engine.check_and_annotate(output)
     assert annotated.get("compliance_flags") is None or len(annotated.get("compliance_flags", [])) == 0
+
+
+def test_policy_reports_every_matched_rule():
+    engine = PolicyEngine()
+
+    # "you should file" matches two EN rules at the same position
+    result = engine.check("You should file now. I guarantee the result. Vas a ganar.")
+    assert result.flags == ["UPL_DETECTED"]
+    assert result.details == [
+        "Pattern matched: Directive to file a legal document",
+        "Pattern matched: Advising specific legal action",
+        "Pattern matched: Guaranteeing legal outcomes",
+        "Pattern matched: Prediciendo resultado legal",
+    ]
+
+
+def test_compiled_matcher_agrees_with_per_pattern_search():
+    import re
+
+    extra = [
+        (r"visa(do)?\s+garantizad[ao]", "Unanchored rule"),
+        (r"\bcasos?\b|\bdeport", "Top-level alternation"),
+        (r"\bwinn?ing\b", "Quantified literal"),
+    ]
+    engine = PolicyEngine(extra_patterns=extra)
+    texts = [
+        "As your best option is to wait, you should file nothing yet.",
+        "Your best legal option is mediation; you will win.",
+        "El visado garantizado no existe. Caso cerrado, no hay deportación.",
+        "Wining and winning. Legally bound to appear; legally obligated to pay.",
+        "te recomiendo presentar la forma; presenta la solicitud mañana.",
+        "guaranteed\nresult",
+        "Please upload your documents.",
+        "",
+    ]
+    for text in texts:
+        expected = [
+            f"Pattern matched: {d}" for p, d in engine.patterns if re.search(p, text.lower())
+        ]
+        assert engine.check(text).details == expected, text
+
+
+def _feed_all(engine, chunks):
+    scan = engine.stream_scan()
+    for chunk in chunks:
+        scan.feed(chunk)
+    return scan
+
+
+def test_stream_scan_matches_across_chunk_boundaries():
+    engine = PolicyEngine()
+    scan = _feed_all(engine, ["Based on this, yo", "u sho", "uld fi", "le ", "now."])
+    assert scan.blocked
+    assert sorted(scan.matched) == engine.matched_rules("based on this, you should file now.")
+
+
+def test_stream_scan_waits_for_text_past_the_match():
+    engine = PolicyEngine()
+    scan = engine.stream_scan()
+
+    # "vas a ganar" could still become "vas a ganaría"
+    assert scan.feed("Pronto vas a ganar") == []
+    assert scan.feed("ía experiencia.") == []
+    assert not scan.blocked
+
+    assert scan.feed(" Vas a ganar") == []
+    assert scan.feed(" el caso.") != []
+    assert scan.blocked
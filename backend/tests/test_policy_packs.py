@@ -0,0 +1,111 @@
+"""Tests for tenant UPL rule packs and the compiled-engine cache."""
+
+import uuid
+
+from app.agents.policy_packs import TenantPolicyEngines, rule_pack_version, tenant_policies
+from app.models import Matter
+
+
+def _pack(*patterns: str, version: int = 1) -> dict:
+    return {"policy": {"version": version, "rules": [
+        {"pattern": p, "description": f"Tenant rule {p}"} for p in patterns
+    ]}}
+
+
+def test_rule_pack_extends_global_patterns():
+    engines = TenantPolicyEngines()
+    engine = engines.for_settings(uuid.uuid4(), _pack(r"\bte aseguro\b"))
+
+    assert engine.check("Te aseguro que todo saldrá bien.").details == [
+        r"Pattern matched: Tenant rule \bte aseguro\b"
+    ]
+    assert engine.check("You should file now.").is_blocked
+    assert not engines.default.check("Te aseguro que todo saldrá bien.").is_blocked
+
+
+def test_rule_patterns_are_lowercased_for_matching():
+    engine = TenantPolicyEngines().for_settings(uuid.uuid4(), _pack(r"\bPresente la Demanda\b", r"\bNo\SHay\b"))
+
+    assert engine.patterns[-2:] == [
+        (r"\bpresente la demanda\b", r"Tenant rule \bPresente la Demanda\b"),
+        (r"\bno\Shay\b", r"Tenant rule \bNo\SHay\b"),
+    ]
+    assert engine.check("Mañana presente la demanda en el juzgado.").is_blocked
+    assert engine.check("NO-HAY prisa").is_blocked
+    assert not engine.check("no hay prisa").is_blocked
+
+
+def test_tenants_without_pack_share_default_engine():
+    engines = TenantPolicyEngines()
+    assert engines.for_settings(uuid.uuid4(), {}) is engines.default
+    assert engines.for_settings(uuid.uuid4(), {"policy": {"rules": []}}) is engines.default
+    assert len(engines) == 0
+
+
+def test_engine_compiled_once_per_pack_version():
+    engines = TenantPolicyEngines()
+    tid = uuid.uuid4()
+
+    first = engines.for_settings(tid, _pack(r"\bsin riesgo\b"))
+    assert engines.for_settings(tid, _pack(r"\bsin riesgo\b")) is first
+
+    # Editing the rules changes the version even without bumping "version"
+    edited = _pack(r"\bsin riesgo\b", r"\b100% seguro")
+    assert rule_pack_version(edited["policy"]) != rule_pack_version(_pack(r"\bsin riesgo\b")["policy"])
+    assert engines.for_settings(tid, edited) is not first
+
+
+def test_cache_is_bounded_lru():
+    engines = TenantPolicyEngines(max_entries=2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    engine_a = engines.for_settings(a, _pack(r"\bfoo\b"))
+    engines.for_settings(b, _pack(r"\bfoo\b"))
+    engines.for_settings(a, _pack(r"\bfoo\b"))  # a is now most recent
+    engines.for_settings(c, _pack(r"\bfoo\b"))
+
+    assert len(engines) == 2
+    assert engines.for_settings(a, _pack(r"\bfoo\b")) is engine_a
+
+
+def test_invalid_rules_are_skipped():
+    engines = TenantPolicyEngines()
+    engine = engines.for_settings(uuid.uuid4(), {"policy": {"rules": [
+        {"pattern": "(unclosed"}, "not-a-dict", {"pattern": r"\bvalid\b"},
+    ]}})
+    assert engine.patterns[-1] == (r"\bvalid\b", "Tenant policy rule")
+    assert len(engine.patterns) == len(engines.default.patterns) + 1
+
+
+def test_settings_update_evicts_tenant_engines(db, seed_tenant):
+    seed_tenant.settings_json = _pack(r"\bfoo\b")
+    db.commit()
+    engine = tenant_policies.for_tenant(db, seed_tenant.id)
+    assert len(tenant_policies) == 1
+
+    seed_tenant.settings_json = _pack(r"\bbar\b", version=2)
+    db.commit()
+    assert len(tenant_policies) == 0
+
+    updated = tenant_policies.for_tenant(db, seed_tenant.id)
+    assert updated is not engine
+    assert updated.check("bar").is_blocked and not updated.check("foo").is_blocked
+
+
+def test_agent_run_uses_tenant_rule_pack(client, db, seed_tenant, auth_headers):
+    # Matches the intake_specialist case packet produced by the mock LLM
+    seed_tenant.settings_json = _pack(r"\bschedule consultation\b")
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US")
+    db.add(matter)
+    db.commit()
+
+    resp = client.post("/agents/run", json={
+        "matter_id": str(matter.id),
+        "agent_name": "intake_specialist",
+        "input_data": {"case_type": "immigration"},
+    }, headers=auth_headers)
+    assert resp.status_code == 201
+    assert resp.json()["status"] == "blocked"
+    assert resp.json()["output_json"]["compliance_flags"] == [
+        r"case_packet: Pattern matched: Tenant rule \bschedule consultation\b"
+    ]
@@ -0,0 +1,125 @@
+"""Tests for the authenticated principal cache."""
+
+import uuid
+
+from jose import jwt
+
+from app.config import settings
+from app.dependencies import access_token_for
+from app.principal_cache import MemoryPrincipalCache, Principal, RedisPrincipalCache, principal_cache
+from tests.test_pilot_kpis import count_queries
+
+
+def _users_queries(statements):
+    return [s for s in statements if "FROM users" in s]
+
+
+def test_cached_principal_skips_users_lookup(client, seed_user, auth_headers):
+    with count_queries() as first:
+        assert client.get("/tasks/", headers=auth_headers).status_code == 200
+    with count_queries() as second:
+        assert client.get("/tasks/", headers=auth_headers).status_code == 200
+
+    assert len(_users_queries(first)) == 1
+    assert _users_queries(second) == []
+    assert principal_cache.get(seed_user.id) == Principal.from_user(seed_user)
+
+
+def test_user_update_invalidates_principal(client, db, seed_user, auth_headers):
+    client.get("/tasks/", headers=auth_headers)
+    assert principal_cache.get(seed_user.id) is not None
+
+    seed_user.role = "paralegal"
+    db.commit()
+    assert principal_cache.get(seed_user.id) is None
+
+    with count_queries() as statements:
+        client.get("/tasks/", headers=auth_headers)
+    assert len(_users_queries(statements)) == 1
+    assert principal_cache.get(seed_user.id).role == "paralegal"
+
+
+def test_invalidation_waits_for_commit(db, seed_user):
+    principal_cache.set(Principal.from_user(seed_user))
+    seed_user.role = "paralegal"
+    db.flush()
+    assert principal_cache.get(seed_user.id).role == "admin"
+
+    db.rollback()
+    assert principal_cache.get(seed_user.id) is not None
+
+    seed_user.role = "paralegal"
+    db.flush()
+    principal_cache.set(Principal(id=seed_user.id, tenant_id=seed_user.tenant_id, role="admin"))  # raced re-cache
+    db.commit()
+    assert principal_cache.get(seed_user.id) is None
+
+
+def test_deleted_user_rejected_after_invalidation(client, db, seed_user, auth_headers):
+    client.get("/tasks/", headers=auth_headers)
+    db.delete(seed_user)
+    db.commit()
+
+    assert client.get("/tasks/", headers=auth_headers).status_code == 401
+
+
+def test_login_token_claims(client, seed_user):
+    resp = client.post("/auth/login", json={"email": "test@test.com", "password": "test123"})
+    claims = jwt.decode(resp.json()["access_token"], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    assert claims["sub"] == str(seed_user.id)
+    assert claims["tenant_id"] == str(seed_user.tenant_id)
+    assert claims["role"] == "admin"
+    assert "email" not in claims and "name" not in claims
+    assert access_token_for(seed_user)
+
+
+def test_memory_cache_ttl_and_lru():
+    now = [0.0]
+    cache = MemoryPrincipalCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    a, b, c = (Principal(id=uuid.uuid4(), tenant_id=uuid.uuid4(), role="admin") for _ in range(3))
+
+    cache.set(a)
+    cache.set(b)
+    assert cache.get(a.id) == a
+    cache.set(c)  # evicts b (least recently used)
+    assert cache.get(b.id) is None
+    assert cache.get(c.id) == c
+
+    now[0] = 11
+    assert cache.get(a.id) is None
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.data, self.fail = {}, fail
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self._check()
+        self.data[key] = value.encode()
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_redis_cache_roundtrip_and_degrades_on_errors():
+    principal = Principal(id=uuid.uuid4(), tenant_id=uuid.uuid4(), role="staff", email="x@y.z")
+    cache = RedisPrincipalCache(client=_FakeRedis(), ttl_seconds=30)
+    cache.set(principal)
+    assert cache.get(principal.id) == principal
+    cache.invalidate(principal.id)
+    assert cache.get(principal.id) is None
+
+    broken = RedisPrincipalCache(client=_FakeRedis(fail=True))
+    broken.set(principal)
+    assert broken.get(principal.id) is None
+    broken.invalidate(principal.id)
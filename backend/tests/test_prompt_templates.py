@@ -0,0 +1,72 @@
+"""Tests for precompiled agent prompt templates."""
+
+import logging
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.prompt_templates import compile_prompt, undeclared_variables
+from app.agents.registry import DefinitionRegistry
+
+DEFN = {
+    "name": "demo",
+    "purpose": "Demo {{not_a_slot}}",
+    "boundaries": ["No advice"],
+    "required_input_fields": ["client", "case_type"],
+    "workflow_steps": [
+        {"name": "greet", "prompt_template": "Hello {{client}}, about {{case_type}}."},
+        {"name": "docs", "prompt_template": "Docs for {{case_type}} in {{county}}"},
+        {"name": "plain"},
+    ],
+}
+
+
+def legacy_build_prompt(defn: dict, input_data: dict) -> str:
+    """The pre-compilation _build_prompt (str.replace per key per step)."""
+    parts = [f"Agent: {defn['name']}", f"Purpose: {defn.get('purpose', '')}"]
+    if defn.get("boundaries"):
+        parts.append("Boundaries: " + "; ".join(defn["boundaries"]))
+    for step in defn.get("workflow_steps", []):
+        template = step.get("prompt_template", "")
+        for key, value in input_data.items():
+            template = template.replace(f"{{{{{key}}}}}", str(value))
+        parts.append(f"Step [{step.get('name', '?')}]: {template}")
+    return "\n".join(parts)
+
+
+def test_compiled_prompt_matches_legacy_rendering():
+    orchestrator = AgentOrchestrator()
+    for name in orchestrator.available_agents():
+        definition = orchestrator.registry.get(name)
+        for values in ({}, {var: f"<{var}>" for var in definition.prompt.variables}, {"x": 1}):
+            assert definition.prompt.render(values) == legacy_build_prompt(definition.spec, values)
+
+
+def test_render_leaves_missing_and_header_placeholders():
+    prompt = compile_prompt(DEFN)
+    assert prompt.variables == ("client", "case_type", "case_type", "county")
+    assert prompt.render({"client": "Ana", "case_type": 7}) == (
+        "Agent: demo\nPurpose: Demo {{not_a_slot}}\nBoundaries: No advice\n"
+        "Step [greet]: Hello Ana, about 7.\n"
+        "Step [docs]: Docs for 7 in {{county}}\n"
+        "Step [plain]: "
+    )
+
+
+def test_values_are_substituted_once():
+    prompt = compile_prompt(DEFN)
+    rendered = prompt.render({"client": "{{case_type}}", "case_type": "tax"})
+    assert "Hello {{case_type}}, about tax." in rendered
+
+
+def test_undeclared_variables_reported_at_load(tmp_path, monkeypatch, caplog):
+    (tmp_path / "demo.yaml").write_text(
+        "name: demo\nrequired_input_fields: [client]\n"
+        "workflow_steps:\n  - name: s\n    prompt_template: 'Hi {{client}} in {{county}}'\n"
+    )
+    orchestrator = AgentOrchestrator(registry=DefinitionRegistry(tmp_path))
+
+    with caplog.at_level(logging.WARNING, logger="app.agents.registry"):
+        orchestrator.available_agents()
+
+    assert orchestrator.template_diagnostics == {"demo": ["county"]}
+    assert "county" in caplog.text
+    assert undeclared_variables(DEFN, compile_prompt(DEFN)) == ["county"]
@@ -0,0 +1,269 @@
+"""Query-plan regression suite for the tenant-scoped hot paths.
+
+Each case drives a real endpoint or service, captures every SELECT it
+issues and runs EXPLAIN on it with the same parameters. A case fails if a
+large table is read with a full scan, i.e. a query lost its index.
+
+By default this runs against the in-memory SQLite test database
+(``EXPLAIN QUERY PLAN``). To check real plans, point ``TEST_POSTGRES_URL`` at
+a scratch Postgres database: the schema is created and seeded with several
+tenants, then ANALYZEd and planned with ``enable_seqscan = off``. Postgres
+still picks a Seq Scan in that mode when no index can serve the query, so the
+check does not depend on how much data was seeded.
+"""
+
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.dependencies import create_access_token, hash_password
+from app.main import app
+from app.models import (
+    Approval, Document, Event, Intake, InterpreterRequest, Lead, Matter, MessageDraft, Task, Tenant, User,
+)
+from app.services.completeness import uploaded_kinds_by_matter
+from app.services.doc_chase import check_doc_reminders
+from app.services.sla_nudge import check_sla_breaches
+from app.services.whatsapp_cadence import check_whatsapp_reminders
+
+LARGE_TABLES = {
+    "intakes", "matters", "documents", "tasks", "agent_runs", "approvals", "message_drafts",
+    "reminder_cadences", "interpreter_requests", "events", "leads", "job_runs",
+}
+
+SEED_TENANTS = 20
+SEED_MATTERS_PER_TENANT = 50
+
+
+# ---------------------------------------------------------------------------
+# Plan inspection
+# ---------------------------------------------------------------------------
+
+def _sqlite_full_scans(conn, statement, parameters) -> list[str]:
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        if not detail.startswith("SCAN "):
+            continue
+        words = detail.split()
+        table = words[2] if words[1] == "TABLE" else words[1]  # "SCAN TABLE x" before SQLite 3.36
+        if table in LARGE_TABLES:
+            scans.append(detail)
+    return scans
+
+
+def _postgres_full_scans(conn, statement, parameters) -> list[str]:
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scans = []
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES:
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        stack.extend(node.get("Plans", []))
+    return scans
+
+
+@contextmanager
+def capture_selects(engine):
+    statements: list[tuple[str, object]] = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+
+
+def assert_no_full_scans(db, statements):
+    assert statements, "case issued no SELECTs"
+    conn = db.connection()
+    full_scans = _postgres_full_scans if conn.dialect.name == "postgresql" else _sqlite_full_scans
+    failures = []
+    for statement, parameters in statements:
+        scans = full_scans(conn, statement, parameters)
+        if scans:
+            failures.append(f"{scans}\n    {statement}")
+    assert not failures, "Full scan on a large table:\n" + "\n".join(failures)
+
+
+# ---------------------------------------------------------------------------
+# Database / seed
+# ---------------------------------------------------------------------------
+
+def _seed(db) -> tuple[Tenant, User, Matter]:
+    """The tenant, user and docs_pending matter the cases run as."""
+    tenant = Tenant(name="Plan Tenant", settings_json={})
+    db.add(tenant)
+    db.flush()
+    user = User(
+        tenant_id=tenant.id, email=f"plans-{uuid.uuid4().hex[:8]}@test.com",
+        hashed_password=hash_password("test123"), full_name="Plan User", role="admin",
+    )
+    intake = Intake(tenant_id=tenant.id, raw_payload_json={"full_name": "Plan Client"}, status="converted")
+    db.add_all([user, intake])
+    db.flush()
+    matter = Matter(
+        tenant_id=tenant.id, intake_id=intake.id, type="mx_divorce", jurisdiction="MX",
+        pipeline_stage="docs_pending", created_at=datetime.now(timezone.utc) - timedelta(days=5),
+    )
+    db.add(matter)
+    db.commit()
+    return tenant, user, matter
+
+
+def _seed_volume(db) -> None:
+    """Bulk rows across many tenants so the Postgres statistics look realistic."""
+    long_ago = datetime.now(timezone.utc) - timedelta(days=5)
+    for _ in range(SEED_TENANTS):
+        tenant = Tenant(name="Volume Tenant", settings_json={})
+        db.add(tenant)
+        db.flush()
+        tid = tenant.id
+        intakes = [{"id": uuid.uuid4(), "tenant_id": tid, "status": "converted"} for _ in range(SEED_MATTERS_PER_TENANT)]
+        matters = [
+            {"id": uuid.uuid4(), "tenant_id": tid, "intake_id": i["id"], "type": "mx_divorce",
+             "pipeline_stage": "docs_pending", "created_at": long_ago}
+            for i in intakes
+        ]
+        db.execute(insert(Intake), intakes)
+        db.execute(insert(Matter), matters)
+        for model, extra in (
+            (Document, {"kind": "curp", "status": "uploaded"}),
+            (Task, {"title": "Follow up", "status": "pending"}),
+            (MessageDraft, {"content": "Hola", "channel": "whatsapp"}),
+            (Approval, {"object_type": "message_draft", "object_id": uuid.uuid4(), "status": "pending",
+                        "created_at": long_ago}),
+            (InterpreterRequest, {"language": "es"}),
+        ):
+            db.execute(insert(model), [{"tenant_id": tid, "matter_id": m["id"], **extra} for m in matters])
+        db.execute(insert(Lead), [{"tenant_id": tid, "source_type": "organic"} for _ in matters])
+        db.execute(insert(Event), [
+            {"tenant_id": tid, "anonymous_id": "a", "name": "consult_scheduled"} for _ in matters
+        ])
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def postgres_session():
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        yield None
+        return
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        _seed_volume(session)
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def plan_db(postgres_session, db):
+    if postgres_session is None:
+        return db
+    postgres_session.execute(text("SET enable_seqscan = off"))
+    return postgres_session
+
+
+@pytest.fixture
+def seeded(plan_db):
+    return _seed(plan_db)
+
+
+@pytest.fixture
+def plan_client(plan_db, seeded):
+    _, user, _ = seeded
+
+    def _override_get_db():
+        yield plan_db
+
+    app.dependency_overrides[get_db] = _override_get_db
+    token = create_access_token({"sub": str(user.id), "tenant_id": str(user.tenant_id), "role": user.role})
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {token}"
+    yield client
+    app.dependency_overrides.clear()
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+HOT_ENDPOINTS = [
+    "/matters/",
+    "/approvals/?status=pending",
+    "/tasks/?status=pending",
+    "/app/leads?status=new",
+    "/interpreters/",
+    "/app/pipeline/",
+    "/app/analytics/pilot-kpis",
+    "/app/analytics/job-runs",
+    "/intakes/?tenant_id={tenant_id}",
+    "/intakes/?tenant_id={tenant_id}&status=new",
+    "/matters/?sort=urgency",
+    "/approvals/?status=&matter_id={matter_id}",
+]
+
+
+@pytest.mark.parametrize("path", HOT_ENDPOINTS)
+def test_endpoint_plans_use_indexes(plan_client, plan_db, seeded, path):
+    tenant, _, matter = seeded
+    with capture_selects(plan_db.get_bind()) as statements:
+        response = plan_client.get(path.format(tenant_id=tenant.id, matter_id=matter.id))
+    assert response.status_code == 200
+    assert_no_full_scans(plan_db, statements)
+
+
+# Routes taking string ids (matter_id query params) are mirrored as queries:
+# SQLite cannot bind those strings to UUID columns.
+@pytest.mark.parametrize("query", [
+    lambda db, tid, mid: db.query(Task).filter(Task.tenant_id == tid, Task.matter_id == mid)
+    .order_by(Task.due_at.asc().nullslast(), Task.created_at.desc()),
+    lambda db, tid, mid: db.query(MessageDraft).filter(MessageDraft.matter_id == mid, MessageDraft.tenant_id == tid)
+    .order_by(MessageDraft.created_at.desc()),
+    lambda db, tid, mid: db.query(Document).filter(Document.matter_id == mid, Document.tenant_id == tid),
+    lambda db, tid, mid: db.query(Event.id).filter(
+        Event.tenant_id == tid, Event.name == "consult_scheduled",
+        Event.created_at >= datetime.now(timezone.utc) - timedelta(days=30),
+    ),
+], ids=["list_tasks_for_matter", "list_drafts", "list_documents", "consult_events"])
+def test_query_plans_use_indexes(plan_db, seeded, query):
+    tenant, _, matter = seeded
+    with capture_selects(plan_db.get_bind()) as statements:
+        query(plan_db, tenant.id, matter.id).all()
+    assert_no_full_scans(plan_db, statements)
+
+
+@pytest.mark.parametrize("run", [
+    lambda db, tid: check_sla_breaches(db, tid),
+    lambda db, tid: check_doc_reminders(db, tid),
+    lambda db, tid: check_whatsapp_reminders(db, tid),
+    lambda db, tid: uploaded_kinds_by_matter(db, Matter.tenant_id == tid),
+], ids=["sla_nudge", "doc_chase", "whatsapp_cadence", "completeness"])
+def test_service_plans_use_indexes(plan_db, seeded, run):
+    tenant, _, _ = seeded
+    with capture_selects(plan_db.get_bind()) as statements:
+        run(plan_db, tenant.id)
+    assert_no_full_scans(plan_db, statements)
@@ -0,0 +1,155 @@
+"""Tests for the content-addressed agent response cache."""
+
+import re
+import uuid
+
+from app.agents.orchestrator import AgentOrchestrator
+from app.agents.response_cache import (
+    MemoryResponseCache, NullResponseCache, RedisResponseCache, response_cache, response_key,
+)
+from app.models import Matter
+
+
+class _CountingLLM:
+    model_params = {"model": "counting"}
+
+    def __init__(self, text: str = "Summary for review. "):
+        self.text = text
+        self.calls = 0
+
+    def generate_stream(self, agent_name, prompt, context=None):
+        self.calls += 1
+        yield from re.findall(r"\S+\s*", self.text)
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.data, self.fail = {}, fail
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self._check()
+        self.data[key] = value.encode()
+
+    def scan_iter(self, pattern):
+        self._check()
+        return [k for k in self.data if k.startswith(pattern.rstrip("*"))]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+
+def _orchestrator(llm=None, cache=None) -> AgentOrchestrator:
+    orchestrator = AgentOrchestrator(cache=cache or MemoryResponseCache())
+    orchestrator.llm = llm or _CountingLLM()
+    return orchestrator
+
+
+def test_key_canonicalizes_input():
+    key = response_key("intake_specialist", "def1", {"model": "m"}, {"a": " Maria ", "b": [1, {"x": "y"}]})
+    assert key == response_key("intake_specialist", "def1", {"model": "m"}, {"b": [1, {"x": "y"}], "a": "Maria"})
+    assert key != response_key("intake_specialist", "def2", {"model": "m"}, {"a": "Maria", "b": [1, {"x": "y"}]})
+    assert key != response_key("intake_specialist", "def1", {"model": "n"}, {"a": "Maria", "b": [1, {"x": "y"}]})
+    assert key != response_key("tax_solutions_assistant", "def1", {"model": "m"}, {"a": "Maria", "b": [1, {"x": "y"}]})
+
+
+def test_memory_cache_ttl_and_lru():
+    now = [0.0]
+    cache = MemoryResponseCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # a is now most recent
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"backend": "memory", "hits": 2, "misses": 2, "hit_rate": 0.5, "entries": 1}
+
+
+def test_repeat_run_served_from_cache():
+    orchestrator = _orchestrator()
+    first = orchestrator.run("intake_specialist", {"case_type": "immigration", "full_name": "Ana"})
+    second = orchestrator.run("intake_specialist", {"full_name": "Ana ", "case_type": "immigration"})
+
+    assert orchestrator.llm.calls == 1
+    assert second["response_cached"] is True
+    assert second["case_packet"] == first["case_packet"]
+    assert orchestrator.cache.stats()["hits"] == 1
+
+
+def test_bypass_forces_generation_and_refreshes_entry():
+    orchestrator = _orchestrator()
+    orchestrator.run("intake_specialist", {"case_type": "immigration"})
+    orchestrator.llm.text = "Updated summary. "
+
+    fresh = orchestrator.run("intake_specialist", {"case_type": "immigration"}, use_cache=False)
+    assert orchestrator.llm.calls == 2
+    assert "response_cached" not in fresh
+
+    cached = orchestrator.run("intake_specialist", {"case_type": "immigration"})
+    assert cached["case_packet"] == fresh["case_packet"] == "Updated summary. "
+    assert orchestrator.llm.calls == 2
+
+
+def test_aborted_generation_is_not_cached():
+    orchestrator = _orchestrator(_CountingLLM("Summary: you should file today. " + "More text. " * 20))
+    orchestrator.run("intake_specialist", {})
+    orchestrator.run("intake_specialist", {})
+    assert orchestrator.llm.calls == 2
+
+
+def test_redis_backend_and_degraded_mode():
+    cache = RedisResponseCache(client=_FakeRedis(), ttl_seconds=30)
+    assert cache.get("k") is None
+    cache.set("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.stats() == {"backend": "redis", "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    broken = RedisResponseCache(client=_FakeRedis(fail=True))
+    broken.set("k", "value")
+    assert broken.get("k") is None
+
+    orchestrator = _orchestrator(cache=broken)
+    orchestrator.run("intake_specialist", {})
+    assert orchestrator.llm.calls == 1
+
+
+def test_null_backend_always_misses():
+    orchestrator = _orchestrator(cache=NullResponseCache())
+    orchestrator.run("intake_specialist", {})
+    orchestrator.run("intake_specialist", {})
+    assert orchestrator.llm.calls == 2
+    assert orchestrator.cache.stats()["misses"] == 2
+
+
+def test_agent_run_endpoint_cache_and_stats(client, db, seed_tenant, auth_headers):
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", jurisdiction="US")
+    db.add(matter)
+    db.commit()
+    body = {"matter_id": str(matter.id), "agent_name": "intake_specialist", "input_data": {"case_type": "immigration"}}
+
+    first = client.post("/agents/run", json=body, headers=auth_headers).json()
+    second = client.post("/agents/run", json=body, headers=auth_headers).json()
+    bypassed = client.post("/agents/run", json={**body, "bypass_cache": True}, headers=auth_headers).json()
+
+    assert "response_cached" not in first["output_json"]
+    assert second["output_json"]["response_cached"] is True
+    assert "response_cached" not in bypassed["output_json"]
+    assert uuid.UUID(second["id"]) != uuid.UUID(first["id"])  # every run is still recorded
+
+    stats = client.get("/agents/cache/stats", headers=auth_headers).json()
+    assert stats == {**response_cache.stats(), "hits": 1, "misses": 1}
+
+
+def test_cache_stats_are_admin_only(client, staff_headers):
+    assert client.get("/agents/cache/stats", headers=staff_headers).status_code == 403
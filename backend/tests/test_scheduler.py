@@ -0,0 +1,98 @@
+"""Tests for the background job scheduler (cadence services off the request path)."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from app.models import Approval, JobRun, Matter, MessageDraft, Task
+from app.services.doc_chase import check_doc_reminders
+from app.services.scheduler import JobScheduler, ScheduledJob
+from tests.conftest import TestSession, engine
+
+
+def _scheduler(jobs):
+    return JobScheduler(session_factory=TestSession, engine=engine, jobs=jobs)
+
+
+def _docs_pending_matter(db, tenant_id):
+    matter = Matter(
+        tenant_id=tenant_id, type="mx_divorce", jurisdiction="MX",
+        status="open", pipeline_stage="docs_pending",
+    )
+    db.add(matter)
+    db.commit()
+    matter.created_at = datetime.utcnow() - timedelta(hours=72)
+    db.commit()
+    return matter
+
+
+def test_tick_runs_job_and_records_timing(db, seed_tenant):
+    _docs_pending_matter(db, seed_tenant.id)
+    scheduler = _scheduler([ScheduledJob("doc_chase", check_doc_reminders, 60, {"reminder_hours"})])
+
+    runs = scheduler.tick()
+
+    assert [(r.job_name, r.status, r.items) for r in runs] == [("doc_chase", "completed", 1)]
+    assert db.query(MessageDraft).count() == 1
+    recorded = db.query(JobRun).one()
+    assert recorded.tenant_id == seed_tenant.id
+    assert recorded.duration_ms >= 0
+
+
+def test_tick_respects_interval_and_tenant_override(db, seed_tenant):
+    calls = []
+    job = ScheduledJob("probe", lambda db, tid, **kw: calls.append(kw) or [], 60, {"sla_hours"})
+    seed_tenant.settings_json = {"scheduler": {"probe": {"interval_minutes": 5, "sla_hours": 2}}}
+    db.commit()
+    scheduler = _scheduler([job])
+
+    now = datetime.utcnow()
+    scheduler.tick(now)
+    scheduler.tick(now + timedelta(minutes=3))  # not due yet
+    scheduler.tick(now + timedelta(minutes=6))
+
+    assert calls == [{"sla_hours": 2}, {"sla_hours": 2}]
+
+
+def test_disabled_job_is_skipped(db, seed_tenant):
+    seed_tenant.settings_json = {"scheduler": {"probe": {"enabled": False}}}
+    db.commit()
+    scheduler = _scheduler([ScheduledJob("probe", lambda db, tid: 1 / 0, 1)])
+    assert scheduler.tick() == []
+
+
+def test_failed_job_is_recorded(db, seed_tenant):
+    scheduler = _scheduler([ScheduledJob("broken", lambda db, tid: 1 / 0, 1)])
+    runs = scheduler.tick()
+    assert runs[0].status == "failed"
+    assert "ZeroDivisionError" in runs[0].error
+
+
+def test_new_leader_resumes_from_job_history(db, seed_tenant):
+    calls = []
+    job = ScheduledJob("probe", lambda db, tid: calls.append(tid) or [], 60)
+    now = datetime.utcnow()
+    _scheduler([job]).tick(now)
+
+    # A different process taking over should not re-run before the interval
+    _scheduler([job]).tick(now + timedelta(minutes=10))
+    assert len(calls) == 1
+
+
+def test_pilot_kpis_is_read_only(client, db, seed_tenant, seed_user, auth_headers):
+    matter = Matter(tenant_id=seed_tenant.id, type="immigration", status="open")
+    db.add(matter)
+    db.flush()
+    approval = Approval(
+        tenant_id=seed_tenant.id, matter_id=matter.id,
+        object_type="agent_run", object_id=uuid.uuid4(), status="pending",
+    )
+    db.add(approval)
+    db.commit()
+    approval.created_at = datetime.utcnow() - timedelta(hours=6)
+    db.commit()
+
+    response = client.get("/app/analytics/pilot-kpis?sla_hours=4", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["sla_breaches"] == 1
+    assert db.query(Task).count() == 0
+    assert db.query(MessageDraft).count() == 0
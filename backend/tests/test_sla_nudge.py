@@ -139,3 +139,47 @@ def test_sla_ignores_decided_approvals(db, seed_tenant, seed_user):
 
     results = check_sla_breaches(db, seed_tenant.id, sla_hours=4)
     assert len(results) == 0
+
+
+def test_sla_nudge_links_task_to_approval(db, seed_tenant, seed_user):
+    """Nudge tasks carry a structured source reference to their approval."""
+    matter = Matter(
+        tenant_id=seed_tenant.id, type="immigration",
+        jurisdiction="US", urgency_score=50, status="open",
+    )
+    db.add(matter)
+    db.flush()
+
+    approvals = [
+        Approval(
+            tenant_id=seed_tenant.id,
+            matter_id=matter.id,
+            object_type="agent_run",
+            object_id=uuid.uuid4(),
+            status="pending",
+        )
+        for _ in range(3)
+    ]
+    db.add_all(approvals)
+    db.commit()
+    for approval in approvals:
+        approval.created_at = datetime.now(timezone.utc) - timedelta(hours=6)
+    db.commit()
+
+    # An unrelated task mentioning the approval id must not suppress the nudge
+    db.add(Task(
+        tenant_id=seed_tenant.id, matter_id=matter.id,
+        title=f"Nudge follow-up {approvals[0].id}", status="pending",
+    ))
+    db.commit()
+
+    results = check_sla_breaches(db, seed_tenant.id, sla_hours=4)
+    assert {r["approval_id"] for r in results} == {str(a.id) for a in approvals}
+
+    nudges = db.query(Task).filter(Task.source_type == "approval_sla_nudge").all()
+    assert {t.source_id for t in nudges} == {a.id for a in approvals}
+
+    # Deciding one approval and re-running creates nothing new
+    approvals[0].status = "approved"
+    db.commit()
+    assert check_sla_breaches(db, seed_tenant.id, sla_hours=4) == []
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timedelta, timezone
 
-from app.models import Intake, Matter, Document, MessageDraft, Approval, Event
+from app.models import Intake, Matter, Document, MessageDraft, Approval, Event, ReminderCadence
 from app.services.whatsapp_cadence import check_whatsapp_reminders
 
 
@@ -173,12 +173,12 @@ def test_whatsapp_max_two_reminders(db, seed_tenant):
     results1 = check_whatsapp_reminders(db, seed_tenant.id, first_reminder_hours=24, second_reminder_hours=48)
     assert len(results1) == 1
 
-    # Backdate the first draft so it's not "recent" (outside 12h cooldown)
-    first_draft = db.query(MessageDraft).filter(
-        MessageDraft.matter_id == matter.id,
-        MessageDraft.channel == "whatsapp",
-    ).first()
-    first_draft.created_at = datetime.now(timezone.utc) - timedelta(hours=13)
+    # Backdate the last reminder so it's not "recent" (outside 12h cooldown)
+    cadence = db.query(ReminderCadence).filter(
+        ReminderCadence.matter_id == matter.id,
+        ReminderCadence.channel == "whatsapp",
+    ).one()
+    cadence.last_sent_at = datetime.now(timezone.utc) - timedelta(hours=13)
     db.commit()
 
     # Second reminder
@@ -186,12 +186,9 @@ def test_whatsapp_max_two_reminders(db, seed_tenant):
     assert len(results2) == 1
     assert results2[0]["reminder_number"] == 2
 
-    # Backdate second draft outside cooldown
-    second_draft = db.query(MessageDraft).filter(
-        MessageDraft.matter_id == matter.id,
-        MessageDraft.channel == "whatsapp",
-    ).order_by(MessageDraft.created_at.desc()).first()
-    second_draft.created_at = datetime.now(timezone.utc) - timedelta(hours=13)
+    # Backdate second reminder outside cooldown
+    assert cadence.reminder_count == 2
+    cadence.last_sent_at = datetime.now(timezone.utc) - timedelta(hours=13)
     db.commit()
 
     # Third attempt — should NOT create a reminder (max 2)
@@ -244,3 +241,31 @@ def test_whatsapp_idempotent_within_cooldown(db, seed_tenant):
         MessageDraft.channel == "whatsapp",
     ).count()
     assert total_drafts == 1
+
+
+def test_whatsapp_cadence_state_tracked(db, seed_tenant):
+    """Cadence row records count and last sent; other channels don't interfere."""
+    matter = Matter(
+        tenant_id=seed_tenant.id, type="mx_divorce", jurisdiction="MX",
+        urgency_score=50, status="open", pipeline_stage="docs_pending",
+    )
+    db.add(matter)
+    db.commit()
+    matter.created_at = datetime.now(timezone.utc) - timedelta(hours=25)
+    # A recent email doc-chase reminder must not block the WhatsApp cadence
+    db.add(ReminderCadence(
+        tenant_id=seed_tenant.id, matter_id=matter.id, channel="email",
+        reminder_count=1, last_sent_at=datetime.now(timezone.utc),
+    ))
+    db.commit()
+
+    results = check_whatsapp_reminders(db, seed_tenant.id, first_reminder_hours=24)
+    assert len(results) == 1
+    assert "Cliente" in db.query(MessageDraft).filter(MessageDraft.channel == "whatsapp").one().content
+
+    cadence = db.query(ReminderCadence).filter(
+        ReminderCadence.matter_id == matter.id,
+        ReminderCadence.channel == "whatsapp",
+    ).one()
+    assert cadence.reminder_count == 1
+    assert cadence.last_sent_at is not None
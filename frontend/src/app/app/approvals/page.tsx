@@ -1,28 +1,17 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useState } from 'react';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
 import { useI18n } from '@/lib/i18n';
 import ApprovalQueue from '@/components/ApprovalQueue';
 import ErrorCard from '@/components/ErrorCard';
+import LoadMoreButton from '@/components/LoadMoreButton';
 
 export default function ApprovalsPage() {
   const { t } = useI18n();
-  const [approvals, setApprovals] = useState<any[]>([]);
   const [filter, setFilter] = useState<'pending' | 'approved' | 'rejected' | ''>('pending');
-  const [error, setError] = useState(false);
-
-  const load = async () => {
-    try {
-      setError(false);
-      const data = await api.getApprovals(filter || undefined);
-      setApprovals(data);
-    } catch {
-      setError(true);
-    }
-  };
-
-  useEffect(() => { load(); }, [filter]);
+  const approvals = usePagedList((cursor) => api.getApprovals(filter, cursor), [filter]);
 
   const filterMap: Record<string, string> = {
     pending: t('approvals.filters.pending'),
@@ -31,7 +20,7 @@ export default function ApprovalsPage() {
     '': t('approvals.filters.all'),
   };
 
-  if (error) return <div className="py-12"><ErrorCard onRetry={load} /></div>;
+  if (approvals.error) return <div className="py-12"><ErrorCard onRetry={approvals.reload} /></div>;
 
   return (
     <div>
@@ -56,7 +45,8 @@ export default function ApprovalsPage() {
         {t('approvals.subtitle')}
       </p>
 
-      <ApprovalQueue approvals={approvals} onUpdate={load} />
+      <ApprovalQueue approvals={approvals.items} onUpdate={approvals.reload} />
+      {approvals.hasMore && <LoadMoreButton onClick={approvals.loadMore} />}
     </div>
   );
 }
@@ -1,34 +1,21 @@
 'use client';
 
-import { useEffect, useState } from 'react';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
 import Link from 'next/link';
 import MatterCard from '@/components/MatterCard';
 import { useI18n } from '@/lib/i18n';
 import ErrorCard from '@/components/ErrorCard';
 import { SkeletonCard } from '@/components/Skeleton';
+import LoadMoreButton from '@/components/LoadMoreButton';
 
 export default function DashboardPage() {
   const { t } = useI18n();
-  const [matters, setMatters] = useState<any[]>([]);
-  const [intakes, setIntakes] = useState<any[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(false);
+  // Most urgent matters and new intakes, one page at a time
+  const matters = usePagedList((cursor) => api.getMatters(cursor, 'urgency'));
+  const intakes = usePagedList((cursor) => api.getIntakes(cursor, 'new'));
 
-  const loadData = async () => {
-    try {
-      setError(false);
-      const [m, i] = await Promise.all([api.getMatters(), api.getIntakes()]);
-      setMatters(m);
-      setIntakes(i.filter((x: any) => x.status === 'new'));
-    } catch {
-      setError(true);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => { loadData(); }, []);
+  const loadData = () => Promise.all([matters.reload(), intakes.reload()]);
 
   const convertIntake = async (intake: any) => {
     try {
@@ -45,9 +32,9 @@ export default function DashboardPage() {
     }
   };
 
-  if (error) return <div className="py-12"><ErrorCard onRetry={loadData} /></div>;
+  if (matters.error || intakes.error) return <div className="py-12"><ErrorCard onRetry={loadData} /></div>;
 
-  if (loading) {
+  if (matters.loading || intakes.loading) {
     return (
       <div>
         <h1 className="text-2xl font-bold mb-6">{t('dashboard.title')}</h1>
@@ -63,8 +50,8 @@ export default function DashboardPage() {
       <h1 className="text-2xl font-bold mb-6">{t('dashboard.title')}</h1>
 
       <section className="mb-8">
-        <h2 className="text-lg font-semibold mb-3">{t('dashboard.pendingIntakes')} ({intakes.length})</h2>
-        {intakes.length === 0 ? (
+        <h2 className="text-lg font-semibold mb-3">{t('dashboard.pendingIntakes')} ({intakes.items.length}{intakes.hasMore ? '+' : ''})</h2>
+        {intakes.items.length === 0 ? (
           <div className="text-center py-8 bg-gray-50 rounded-lg">
             <p className="text-gray-400 mb-2">{t('dashboard.noIntakes')}</p>
             <Link href="/intake" className="text-blue-600 hover:underline text-sm">
@@ -73,7 +60,7 @@ export default function DashboardPage() {
           </div>
         ) : (
           <div className="space-y-3">
-            {intakes.map((intake: any) => (
+            {intakes.items.map((intake: any) => (
               <div key={intake.id} className="bg-yellow-50 border border-yellow-200 rounded-lg p-4">
                 <div className="flex justify-between items-start">
                   <div>
@@ -100,24 +87,26 @@ export default function DashboardPage() {
             ))}
           </div>
         )}
+        {intakes.hasMore && <LoadMoreButton onClick={intakes.loadMore} />}
       </section>
 
       <section>
-        <h2 className="text-lg font-semibold mb-3">{t('dashboard.activeMatters')} ({matters.length})</h2>
-        {matters.length === 0 ? (
+        <h2 className="text-lg font-semibold mb-3">{t('dashboard.activeMatters')} ({matters.items.length}{matters.hasMore ? '+' : ''})</h2>
+        {matters.items.length === 0 ? (
           <div className="text-center py-8 bg-gray-50 rounded-lg">
             <p className="text-gray-400 mb-2">{t('dashboard.noMatters')}</p>
             <p className="text-xs text-gray-400">{t('emptyStates.noMattersCta')}</p>
           </div>
         ) : (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-            {matters.map((matter: any) => (
+            {matters.items.map((matter: any) => (
               <Link key={matter.id} href={`/app/matters/${matter.id}`}>
                 <MatterCard matter={matter} />
               </Link>
             ))}
           </div>
         )}
+        {matters.hasMore && <LoadMoreButton onClick={matters.loadMore} />}
       </section>
     </div>
   );
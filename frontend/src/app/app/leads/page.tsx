@@ -2,10 +2,12 @@
 
 import { useEffect, useState } from 'react';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
 import { track } from '@/lib/tracker';
 import { useI18n } from '@/lib/i18n';
 import ErrorCard from '@/components/ErrorCard';
 import { SkeletonTable } from '@/components/Skeleton';
+import LoadMoreButton from '@/components/LoadMoreButton';
 
 interface Lead {
   id: string;
@@ -27,38 +29,22 @@ const STATUS_COLORS: Record<string, string> = {
 
 export default function LeadsPage() {
   const { t, locale } = useI18n();
-  const [leads, setLeads] = useState<Lead[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(false);
   const [filter, setFilter] = useState('');
-
-  const loadLeads = async () => {
-    try {
-      setError(false);
-      const data = await api.getLeads();
-      setLeads(data);
-    } catch {
-      setError(true);
-    } finally {
-      setLoading(false);
-    }
-  };
+  const leads = usePagedList<Lead>((cursor) => api.getLeads(filter || undefined, cursor), [filter]);
 
   useEffect(() => {
-    loadLeads();
     track('page_view', { page: '/app/leads' });
   }, []);
 
-  const filtered = filter ? leads.filter((l) => l.status === filter) : leads;
   const filterKeys = ['', 'new', 'routed', 'contacted', 'converted', 'lost'];
 
-  if (loading) return (
+  if (leads.loading) return (
     <div>
       <h1 className="text-2xl font-bold mb-4">{t('leads.title')}</h1>
       <SkeletonTable rows={5} />
     </div>
   );
-  if (error) return <div className="py-12"><ErrorCard onRetry={loadLeads} /></div>;
+  if (leads.error) return <div className="py-12"><ErrorCard onRetry={leads.reload} /></div>;
 
   return (
     <div>
@@ -74,12 +60,12 @@ export default function LeadsPage() {
               filter === s ? 'bg-blue-600 text-white border-blue-600' : 'bg-white text-gray-600 border-gray-200 hover:border-gray-400'
             }`}
           >
-            {s ? t(`leads.filters.${s}`) : t('leads.filters.all')} ({s === '' ? leads.length : leads.filter((l) => l.status === s).length})
+            {s ? t(`leads.filters.${s}`) : t('leads.filters.all')}
           </button>
         ))}
       </div>
 
-      {filtered.length === 0 ? (
+      {leads.items.length === 0 ? (
         <div className="text-center py-12 bg-gray-50 rounded-lg">
           <p className="text-gray-400 mb-2">{t('leads.noLeads')}</p>
           <p className="text-xs text-gray-400">{t('emptyStates.noLeadsCta')}</p>
@@ -97,7 +83,7 @@ export default function LeadsPage() {
               </tr>
             </thead>
             <tbody>
-              {filtered.map((lead) => (
+              {leads.items.map((lead) => (
                 <tr key={lead.id} className="border-b hover:bg-gray-50 transition">
                   <td className="p-3">
                     <div className="font-medium">{lead.contact_json?.name || lead.contact_json?.firm_name || 'N/A'}</div>
@@ -123,6 +109,7 @@ export default function LeadsPage() {
           </table>
         </div>
       )}
+      {leads.hasMore && <LoadMoreButton onClick={leads.loadMore} />}
     </div>
   );
 }
@@ -3,11 +3,13 @@
 import { useEffect, useState } from 'react';
 import { useParams } from 'next/navigation';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
 import { useI18n } from '@/lib/i18n';
 import DocumentUploader from '@/components/DocumentUploader';
 import TaskList from '@/components/TaskList';
 import AgentRunPanel from '@/components/AgentRunPanel';
 import MessageDraftEditor from '@/components/MessageDraftEditor';
+import LoadMoreButton from '@/components/LoadMoreButton';
 import ErrorCard from '@/components/ErrorCard';
 
 type Tab = 'overview' | 'documents' | 'tasks' | 'agents' | 'approvals' | 'messages';
@@ -92,13 +94,9 @@ function OverviewTab({ matter }: { matter: any }) {
 
 function ApprovalsTab({ matterId }: { matterId: string }) {
   const { t } = useI18n();
-  const [approvals, setApprovals] = useState<any[]>([]);
-
-  useEffect(() => {
-    api.getApprovals().then((all) => {
-      setApprovals(all.filter((a: any) => a.matter_id === matterId));
-    }).catch(() => {});
-  }, [matterId]);
+  const { items: approvals, hasMore, loadMore } = usePagedList(
+    (cursor) => api.getApprovals('', cursor, matterId), [matterId],
+  );
 
   return (
     <div className="space-y-3">
@@ -118,6 +116,7 @@ function ApprovalsTab({ matterId }: { matterId: string }) {
           </div>
         ))
       )}
+      {hasMore && <LoadMoreButton onClick={loadMore} />}
     </div>
   );
 }
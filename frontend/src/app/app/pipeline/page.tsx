@@ -41,6 +41,7 @@ export default function PipelinePage() {
   const { t } = useI18n();
   const [stages, setStages] = useState<Record<string, PipelineItem[]>>({});
   const [counts, setCounts] = useState<Record<string, number>>({});
+  const [cursors, setCursors] = useState<Record<string, string | null>>({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
 
@@ -49,6 +50,7 @@ export default function PipelinePage() {
       const data = await api.getPipeline();
       setStages(data.stages);
       setCounts(data.stage_counts);
+      setCursors(data.next_cursors || {});
       setError(false);
     } catch (err: any) {
       if (err.message?.includes('fetch')) setError(true);
@@ -81,6 +83,18 @@ export default function PipelinePage() {
     }
   };
 
+  const loadMore = async (stage: string) => {
+    const cursor = cursors[stage];
+    if (!cursor) return;
+    try {
+      const page = await api.getPipelineStage(stage, cursor);
+      setStages((prev) => ({ ...prev, [stage]: [...(prev[stage] || []), ...page.items] }));
+      setCursors((prev) => ({ ...prev, [stage]: page.next_cursor }));
+    } catch (err) {
+      console.error('Load more error:', err);
+    }
+  };
+
   const stageIndex = (key: string) => STAGE_KEYS.indexOf(key);
 
   const verticalLabel = (type: string | null) => {
@@ -156,6 +170,14 @@ export default function PipelinePage() {
                 {items.length === 0 && (
                   <div className="text-xs text-gray-400 text-center py-4">{t('pipeline.noItems')}</div>
                 )}
+                {cursors[key] && (
+                  <button
+                    onClick={() => loadMore(key)}
+                    className="w-full text-xs py-1.5 text-blue-700 bg-white hover:bg-blue-50 border rounded transition"
+                  >
+                    {t('pipeline.loadMore')}
+                  </button>
+                )}
               </div>
             </div>
           );
@@ -16,6 +16,7 @@ export default function AgentRunPanel({ matterId }: { matterId: string }) {
   const [selectedAgent, setSelectedAgent] = useState(AGENTS[0].name);
   const [inputData, setInputData] = useState('{}');
   const [result, setResult] = useState<any>(null);
+  const [streamed, setStreamed] = useState('');
   const [running, setRunning] = useState(false);
   const [error, setError] = useState('');
 
@@ -23,6 +24,7 @@ export default function AgentRunPanel({ matterId }: { matterId: string }) {
     setRunning(true);
     setError('');
     setResult(null);
+    setStreamed('');
     try {
       let parsed = {};
       try {
@@ -32,11 +34,10 @@ export default function AgentRunPanel({ matterId }: { matterId: string }) {
         setRunning(false);
         return;
       }
-      const res = await api.runAgent({
-        matter_id: matterId,
-        agent_name: selectedAgent,
-        input_data: parsed,
-      });
+      const res = await api.runAgentStream(
+        { matter_id: matterId, agent_name: selectedAgent, input_data: parsed },
+        (text) => setStreamed((prev) => prev + text),
+      );
       setResult(res);
     } catch (err: any) {
       setError(err.message);
@@ -85,6 +86,12 @@ export default function AgentRunPanel({ matterId }: { matterId: string }) {
         </button>
       </div>
 
+      {running && streamed && (
+        <div className="bg-white p-4 rounded-lg shadow mb-4">
+          <pre className="text-xs bg-gray-50 p-3 rounded whitespace-pre-wrap">{streamed}</pre>
+        </div>
+      )}
+
       {error && <div className="bg-red-100 text-red-700 p-3 rounded mb-4 text-sm">{error}</div>}
 
       {result && (
@@ -0,0 +1,16 @@
+'use client';
+
+import { useI18n } from '@/lib/i18n';
+
+export default function LoadMoreButton({ onClick }: { onClick: () => void }) {
+  const { t } = useI18n();
+
+  return (
+    <button
+      onClick={onClick}
+      className="w-full mt-4 text-sm py-2 text-blue-700 bg-white hover:bg-blue-50 border rounded transition"
+    >
+      {t('common.loadMore')}
+    </button>
+  );
+}
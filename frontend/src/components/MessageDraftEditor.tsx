@@ -1,30 +1,19 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useState } from 'react';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
+import LoadMoreButton from '@/components/LoadMoreButton';
 
 const CHANNELS = ['email', 'sms', 'whatsapp', 'call_script'];
 
 export default function MessageDraftEditor({ matterId }: { matterId: string }) {
-  const [drafts, setDrafts] = useState<any[]>([]);
+  const drafts = usePagedList((cursor) => api.getDrafts(matterId, cursor), [matterId]);
   const [channel, setChannel] = useState('email');
   const [content, setContent] = useState('');
   const [saving, setSaving] = useState(false);
   const [error, setError] = useState('');
 
-  useEffect(() => {
-    loadDrafts();
-  }, [matterId]);
-
-  const loadDrafts = async () => {
-    try {
-      const data = await api.getDrafts(matterId);
-      setDrafts(data);
-    } catch (err: any) {
-      setError(err.message);
-    }
-  };
-
   const handleCreate = async () => {
     if (!content.trim()) return;
     setSaving(true);
@@ -32,7 +21,7 @@ export default function MessageDraftEditor({ matterId }: { matterId: string }) {
     try {
       await api.createDraft({ matter_id: matterId, channel, content });
       setContent('');
-      loadDrafts();
+      drafts.reload();
     } catch (err: any) {
       setError(err.message);
     } finally {
@@ -43,7 +32,7 @@ export default function MessageDraftEditor({ matterId }: { matterId: string }) {
   const handleSend = async (draftId: string) => {
     try {
       await api.sendMessage(draftId);
-      loadDrafts();
+      drafts.reload();
     } catch (err: any) {
       alert(err.message);
     }
@@ -90,12 +79,14 @@ export default function MessageDraftEditor({ matterId }: { matterId: string }) {
         >
           {saving ? 'Saving...' : 'Create Draft (sends to approval)'}
         </button>
-        {error && <p className="text-red-600 text-sm mt-2">{error}</p>}
+        {(error || drafts.error) && (
+          <p className="text-red-600 text-sm mt-2">{error || 'Could not load drafts.'}</p>
+        )}
       </div>
 
       {/* Drafts list */}
       <div className="space-y-3">
-        {drafts.map((d: any) => (
+        {drafts.items.map((d: any) => (
           <div key={d.id} className="bg-white p-4 rounded-lg shadow-sm">
             <div className="flex justify-between items-start mb-2">
               <span className="text-xs text-gray-500">{d.channel}</span>
@@ -115,6 +106,7 @@ export default function MessageDraftEditor({ matterId }: { matterId: string }) {
           </div>
         ))}
       </div>
+      {drafts.hasMore && <LoadMoreButton onClick={drafts.loadMore} />}
     </div>
   );
 }
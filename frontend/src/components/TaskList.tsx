@@ -1,14 +1,13 @@
 'use client';
 
-import { useEffect, useState } from 'react';
 import { api } from '@/lib/api';
+import { usePagedList } from '@/lib/paging';
+import LoadMoreButton from '@/components/LoadMoreButton';
 
 export default function TaskList({ matterId }: { matterId: string }) {
-  const [tasks, setTasks] = useState<any[]>([]);
-
-  useEffect(() => {
-    api.getTasks(matterId).then(setTasks).catch(() => {});
-  }, [matterId]);
+  const { items: tasks, hasMore, loadMore } = usePagedList(
+    (cursor) => api.getTasks(matterId, cursor), [matterId],
+  );
 
   const statusIcon: Record<string, string> = {
     pending: '[ ]',
@@ -43,6 +42,7 @@ export default function TaskList({ matterId }: { matterId: string }) {
           ))}
         </div>
       )}
+      {hasMore && <LoadMoreButton onClick={loadMore} />}
     </div>
   );
 }
@@ -23,6 +23,59 @@ async function request(path: string, options: RequestInit = {}) {
   return res.json();
 }
 
+// NDJSON stream from POST /agents/run/stream: LLM chunks, then the stored run
+async function streamAgentRun(data: any, onChunk: (text: string) => void) {
+  const token = typeof window !== 'undefined' ? localStorage.getItem('token') : null;
+  const res = await fetch(`${API_URL}/agents/run/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(token ? { 'Authorization': `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify(data),
+  });
+  if (!res.ok || !res.body) {
+    const body = await res.json().catch(() => ({}));
+    throw new Error(body.detail || `API error: ${res.status}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  let run = null;
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop() || '';
+    for (const line of lines) {
+      if (!line) continue;
+      const event = JSON.parse(line);
+      if (event.type === 'chunk') onChunk(event.text);
+      else if (event.type === 'run') run = event.run;
+    }
+  }
+  return run;
+}
+
+// List endpoints return a keyset page; pass next_cursor back for the next one
+export interface Page<T = any> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Query string of the set filters ('' when none); undefined values are left out
+function query(params: Record<string, string | undefined>): string {
+  const set = Object.entries(params).filter(([, v]) => v !== undefined) as [string, string][];
+  return set.length ? `?${new URLSearchParams(set)}` : '';
+}
+
+function requestPage(path: string, cursor?: string | null): Promise<Page> {
+  if (!cursor) return request(path);
+  return request(`${path}${path.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`);
+}
+
 export const api = {
   // Auth
   login: (email: string, password: string) =>
@@ -31,10 +84,11 @@ export const api = {
   // Intakes (public)
   createIntake: (data: any) =>
     request('/public/intake', { method: 'POST', body: JSON.stringify(data) }),
-  getIntakes: () => request('/intakes/'),
+  getIntakes: (cursor?: string, status?: string) => requestPage(`/intakes/${query({ status })}`, cursor),
 
   // Matters
-  getMatters: () => request('/matters/'),
+  // sort: 'urgency' for most urgent first (default newest first)
+  getMatters: (cursor?: string, sort?: 'urgency') => requestPage(`/matters/${query({ sort })}`, cursor),
   getMatter: (id: string) => request(`/matters/${id}`),
   createMatter: (data: any) =>
     request('/matters/', { method: 'POST', body: JSON.stringify(data) }),
@@ -57,17 +111,22 @@ export const api = {
   },
 
   // Tasks
-  getTasks: (matterId?: string) =>
-    request(`/tasks/${matterId ? `?matter_id=${matterId}` : ''}`),
+  getTasks: (matterId?: string, cursor?: string) =>
+    requestPage(`/tasks/${matterId ? `?matter_id=${matterId}` : ''}`, cursor),
 
   // Agent runs
   runAgent: (data: { matter_id: string; agent_name: string; input_data: any }) =>
     request('/agents/run', { method: 'POST', body: JSON.stringify(data) }),
+  runAgentStream: (
+    data: { matter_id: string; agent_name: string; input_data: any },
+    onChunk: (text: string) => void,
+  ) => streamAgentRun(data, onChunk),
   getAgentDefinitions: () => request('/agents/definitions'),
 
   // Approvals
-  getApprovals: (status?: string) =>
-    request(`/approvals/${status ? `?status=${status}` : ''}`),
+  // status '' lists every status; the API defaults to pending
+  getApprovals: (status?: string, cursor?: string, matterId?: string) =>
+    requestPage(`/approvals/${query({ status, matter_id: matterId })}`, cursor),
   approveItem: (id: string, notes?: string) =>
     request(`/approvals/${id}/approve`, { method: 'POST', body: JSON.stringify({ notes }) }),
   rejectItem: (id: string, notes?: string) =>
@@ -76,15 +135,16 @@ export const api = {
   // Messages
   createDraft: (data: { matter_id: string; channel: string; content: string }) =>
     request('/messages/draft', { method: 'POST', body: JSON.stringify(data) }),
-  getDrafts: (matterId: string) => request(`/messages/?matter_id=${matterId}`),
+  getDrafts: (matterId: string, cursor?: string) =>
+    requestPage(`/messages/?matter_id=${matterId}`, cursor),
   sendMessage: (draftId: string) =>
     request(`/messages/${draftId}/send`, { method: 'POST' }),
 
   // Interpreters
   createInterpreterRequest: (data: any) =>
     request('/interpreters/', { method: 'POST', body: JSON.stringify(data) }),
-  getInterpreterRequests: (matterId?: string) =>
-    request(`/interpreters/${matterId ? `?matter_id=${matterId}` : ''}`),
+  getInterpreterRequests: (matterId?: string, cursor?: string) =>
+    requestPage(`/interpreters/${matterId ? `?matter_id=${matterId}` : ''}`, cursor),
 
   // Analytics
   getAnalyticsOverview: (days: number = 7) =>
@@ -96,6 +156,8 @@ export const api = {
 
   // Pipeline
   getPipeline: () => request('/app/pipeline/'),
+  getPipelineStage: (stage: string, cursor: string) =>
+    request(`/app/pipeline/stages/${stage}?cursor=${encodeURIComponent(cursor)}`),
   changeIntakeStage: (intakeId: string, stage: string) =>
     request(`/app/pipeline/intake/${intakeId}/stage`, {
       method: 'PATCH', body: JSON.stringify({ stage }),
@@ -115,6 +177,6 @@ export const api = {
     request('/feedback/', { method: 'POST', body: JSON.stringify(data) }),
 
   // Leads (authenticated)
-  getLeads: (status?: string) =>
-    request(`/app/leads${status ? `?status=${status}` : ''}`),
+  getLeads: (status?: string, cursor?: string) =>
+    requestPage(`/app/leads${status ? `?status=${status}` : ''}`, cursor),
 };
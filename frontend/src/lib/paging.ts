@@ -0,0 +1,40 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import type { Page } from '@/lib/api';
+
+// One keyset-paged list: the first page on mount (and when deps change), the next on loadMore()
+export function usePagedList<T = any>(fetchPage: (cursor?: string) => Promise<Page<T>>, deps: any[] = []) {
+  const [items, setItems] = useState<T[]>([]);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(false);
+
+  const reload = async () => {
+    try {
+      setError(false);
+      const page = await fetchPage();
+      setItems(page.items);
+      setCursor(page.next_cursor);
+    } catch {
+      setError(true);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const loadMore = async () => {
+    if (!cursor) return;
+    try {
+      const page = await fetchPage(cursor);
+      setItems((prev) => [...prev, ...page.items]);
+      setCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Load more error:', err);
+    }
+  };
+
+  useEffect(() => { reload(); }, deps);
+
+  return { items, hasMore: cursor !== null, loading, error, reload, loadMore };
+}